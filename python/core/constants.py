@@ -32,6 +32,10 @@ PAGE_H_LEGAL = 1008    # Legal:  8.5 x 14
 
 # Column center X positions for 5-column layout
 COL_CENTERS = [72, 192, 306, 420, 546]
+# Names are centered on their column; keep them this far from the page edge
+# and this far apart from the next column's names
+NAME_SIDE_MARGIN = 18
+NAME_GUTTER = 4
 
 # Colors (RGB 0-1 tuples)
 RED = (1, 0, 0)
@@ -7,13 +7,19 @@ both rank 1.
 """
 from __future__ import annotations
 
+import functools
 import json
 import math
 import re
 import sqlite3
 import os
+import struct
+import tempfile
+import time
 from typing import Any
 from .models import MeetConfig
+from .db_connection import connect
+from .layout_engine import clean_name_for_shirt, flag_suspicious_name
 from .constants import EVENTS
 
 
@@ -52,22 +58,38 @@ _CLEANUP_PATTERNS = [
 ]
 
 
+# All patterns joined into one alternation: a single scan tells whether a name
+# needs cleaning at all, which is the rare case.
+_ANY_CLEANUP = re.compile('|'.join(
+    rf'(?{"i" if p.flags & re.IGNORECASE else ""}:{p.pattern})' for p in _CLEANUP_PATTERNS
+))
+
+# The same patterns as a prioritized alternation for names that do match:
+# alternative k is a lookahead that scans for pattern k anywhere in the name,
+# and the engine tries alternatives in list order, so the first pattern that
+# matches wins (as when trying them one by one). The lazy prefix group ends
+# where re.sub's leftmost match would start.
+_CLEANUP_ALTERNATION = re.compile('|'.join(
+    rf'(?=(?P<p{i}>[\s\S]*?)(?{"i" if p.flags & re.IGNORECASE else ""}:{p.pattern}))'
+    for i, p in enumerate(_CLEANUP_PATTERNS)
+))
+
+
+@functools.lru_cache(maxsize=65536)
 def clean_athlete_name(name: str) -> str:
     """Strip event code suffixes from athlete names.
 
     Canonical cleanup function — handles all known formats from every data source.
     Applied during database building so all downstream code can trust names are clean.
-    Patterns are ordered most-specific-first to minimize false positives.
+    Patterns are ordered most-specific-first to minimize false positives; only
+    the first matching pattern is applied. Memoized: names repeat across events,
+    levels and outputs.
     """
-    if not name:
+    if not name or _ANY_CLEANUP.search(name) is None:
         return name
-    result = name
-    for pattern in _CLEANUP_PATTERNS:
-        cleaned = pattern.sub('', result)
-        if cleaned != result:
-            result = cleaned.strip()
-            break  # Stop after first match to avoid over-cleaning
-    return result
+    m = _CLEANUP_ALTERNATION.match(name)
+    prefix = next(g for g in m.groups() if g is not None)
+    return prefix.strip()
 
 
 def _to_float(val: Any) -> float | None:
@@ -99,7 +121,49 @@ def _to_float(val: Any) -> float | None:
         return None
 
 
-def build_database(db_path: str, config: MeetConfig, athletes: list[dict]) -> str:
+# Rows per executemany call when loading results
+_INSERT_CHUNK = 5000
+
+_INSERT_RESULT_SQL = '''INSERT OR REPLACE INTO results
+    (state, meet_name, association, name, gym, club_num, session, level, division,
+     vault, bars, beam, floor, aa, rank, num,
+     display_name, suspicious_name, suspicious_reason)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+
+
+def _stage_result_rows(config: MeetConfig, athletes: list[dict]) -> tuple[list[tuple], int]:
+    """Clean names and coerce scores into insert-ready tuples for the results table.
+
+    Also derives each row's shirt display_name (clean_name_for_shirt) and the
+    flag_suspicious_name verdict, so outputs never re-clean names.
+    Runs outside the write transaction. Missing required fields raise KeyError
+    here, before any data is touched. SCORE_TYPE_WARNING lines are printed by
+    _to_float in athlete order, exactly as the per-row insert loop did.
+
+    Returns (rows, names_cleaned).
+    """
+    rows = []
+    names_cleaned = 0
+    state, meet_name, association = config.state, config.meet_name, config.association
+    for a in athletes:
+        raw_name = a['name']
+        cleaned_name = clean_athlete_name(raw_name)
+        if cleaned_name != raw_name:
+            names_cleaned += 1
+        display_name = clean_name_for_shirt(cleaned_name) if cleaned_name else ''
+        reason = flag_suspicious_name(display_name)
+        rows.append((state, meet_name, association,
+                     cleaned_name, a['gym'], a.get('club_num', ''),
+                     a['session'], a['level'], a['division'],
+                     _to_float(a['vault']), _to_float(a['bars']), _to_float(a['beam']),
+                     _to_float(a['floor']), _to_float(a['aa']),
+                     a.get('rank'), a.get('num'),
+                     display_name, 1 if reason else 0, reason))
+    return rows, names_cleaned
+
+
+def build_database(db_path: str, config: MeetConfig, athletes: list[dict],
+                   incremental: bool = False, in_memory: bool = False) -> str:
     """Build a SQLite database from parsed athlete data.
 
     Uses a central database model: creates tables if they don't exist,
@@ -110,145 +174,370 @@ def build_database(db_path: str, config: MeetConfig, athletes: list[dict]) -> st
         db_path: Path for the output SQLite database.
         config: MeetConfig with state, meet_name, association, source_type.
         athletes: List of athlete dicts from an adapter.
+        incremental: Diff athletes against the rows already stored for this
+            meet and apply only the inserts, updates and deletes, then
+            recompute winners only for the affected level+division groups.
+            Falls back to a full rebuild when the DB holds no data for this
+            meet (or holds other meets), or when a new division variant would
+            rename divisions already stored.
+        in_memory: Build in a :memory: database and publish it to db_path
+            only once complete (backup API into a temp file, then rename).
+            Avoids per-statement disk I/O on slow filesystems, and readers of
+            db_path never see a half-built database.
 
     Returns:
         The db_path for convenience.
     """
-    conn = sqlite3.connect(db_path)
+    if in_memory:
+        conn = connect(':memory:', 'bulk-build')
+        if incremental and os.path.exists(db_path):
+            # The diff needs the stored rows; start from a copy of the current DB
+            src = connect(db_path, 'read-mostly')
+            try:
+                src.backup(conn)
+            finally:
+                src.close()
+    else:
+        conn = connect(db_path, 'bulk-build')
     try:
         cur = conn.cursor()
 
         # --- DDL (must be outside the data transaction) ---
-        cur.execute('''CREATE TABLE IF NOT EXISTS results (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            state TEXT,
-            meet_name TEXT,
-            association TEXT,
-            name TEXT,
-            gym TEXT,
-            club_num TEXT,
-            session TEXT,
-            level TEXT,
-            division TEXT,
-            vault REAL,
-            bars REAL,
-            beam REAL,
-            floor REAL,
-            aa REAL,
-            rank TEXT,
-            num TEXT
-        )''')
-
-        try:
-            cur.execute('ALTER TABLE results ADD COLUMN club_num TEXT')
-        except Exception:
-            pass  # Column already exists
-
-        cur.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_results_unique
-            ON results(meet_name, name, gym, session, level, division)''')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_results_meet_sld ON results(meet_name, session, level, division)')
-
-        cur.execute('''CREATE TABLE IF NOT EXISTS meets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            meet_name TEXT UNIQUE,
-            source TEXT,
-            source_id TEXT,
-            source_name TEXT,
-            state TEXT,
-            association TEXT,
-            year TEXT,
-            dates TEXT,
-            created_at TEXT DEFAULT (datetime('now'))
-        )''')
+        _create_results_tables(cur)
+        _create_group_stats_table(cur)
         conn.commit()
 
+        # --- Stage rows before taking the write lock ---
+        # Name cleaning and score coercion run here, so the transaction below
+        # only holds the lock for the bulk load and winner computation.
+        rows, names_cleaned = _stage_result_rows(config, athletes)
+        if names_cleaned > 0:
+            print(f"Name cleaning: stripped event code suffixes from {names_cleaned} athlete names")
+
         # --- Data operations: explicit atomic transaction ---
         # All data changes (DELETE + INSERT + normalize + winners) commit together.
         # If any step fails, the staging DB rolls back (no partial state).
         cur.execute('BEGIN IMMEDIATE')
         try:
-            # Clean slate: delete ALL data in staging DB (single-meet by design)
-            cur.execute('DELETE FROM results')
-            for table in ('winners', 'meets'):
-                try:
-                    cur.execute(f'DELETE FROM {table}')
-                except Exception:
-                    pass  # Table doesn't exist yet
-
-            names_cleaned = 0
-            for a in athletes:
-                raw_name = a['name']
-                cleaned_name = clean_athlete_name(raw_name)
-                if cleaned_name != raw_name:
-                    names_cleaned += 1
-                cur.execute('''INSERT OR REPLACE INTO results
-                    (state, meet_name, association, name, gym, club_num, session, level, division,
-                     vault, bars, beam, floor, aa, rank, num)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                    (config.state, config.meet_name, config.association,
-                     cleaned_name, a['gym'], a.get('club_num', ''),
-                     a['session'], a['level'], a['division'],
-                     _to_float(a['vault']), _to_float(a['bars']), _to_float(a['beam']), _to_float(a['floor']), _to_float(a['aa']),
-                     a.get('rank'), a.get('num')))
-            if names_cleaned > 0:
-                print(f"Name cleaning: stripped event code suffixes from {names_cleaned} athlete names")
-
-            # Normalize division case (part of the same transaction)
-            _normalize_division_case(cur, config.meet_name)
-
-            # Always use score-based winner determination — ranks from data sources
-            # may not handle ties correctly (e.g. ScoreCat assigns sequential ranks
-            # to tied athletes instead of giving both rank 1)
-            _build_winners_score_based(conn, config)
+            affected = None
+            if incremental:
+                affected = _apply_incremental_rows(cur, config.meet_name, rows)
+                if affected is None:
+                    print("Incremental ingest: no compatible existing data, doing a full rebuild")
+
+            if affected is not None:
+                _build_group_stats(cur, config.meet_name)
+                _build_winners_score_based(conn, config, level_divisions=affected)
+                # AA/event scores behind other groups' keys may have changed too
+                _build_sort_keys(cur, config.meet_name)
+            else:
+                # Clean slate: delete ALL data in staging DB (single-meet by design)
+                cur.execute('DELETE FROM results')
+                for table in ('winners', 'meets', 'group_stats'):
+                    try:
+                        cur.execute(f'DELETE FROM {table}')
+                    except Exception:
+                        pass  # Table doesn't exist yet
+
+                for start in range(0, len(rows), _INSERT_CHUNK):
+                    cur.executemany(_INSERT_RESULT_SQL, rows[start:start + _INSERT_CHUNK])
+
+                # Normalize division case (part of the same transaction)
+                _normalize_division_case(cur, config.meet_name)
+
+                # Per-group aggregates read by winners, solo detection and the summary
+                _build_group_stats(cur, config.meet_name)
+
+                # Always use score-based winner determination — ranks from data sources
+                # may not handle ties correctly (e.g. ScoreCat assigns sequential ranks
+                # to tied athletes instead of giving both rank 1)
+                _build_winners_score_based(conn, config)
+
+                # Shirt-ordering tie-break keys for the new winners
+                _build_sort_keys(cur, config.meet_name)
 
             conn.commit()
         except Exception:
             conn.rollback()
             raise
+
+        if in_memory:
+            _publish_database(conn, db_path)
     finally:
         conn.close()
     return db_path
 
 
-def _normalize_division_case(cur, meet_name: str):
-    """Merge division variants that differ only by case (e.g., JR A / Jr A / JRA).
+def upgrade_schema(db_path: str):
+    """Bring a database built by an older version up to the current schema.
 
-    When combining data from multiple sources (MSO + ScoreCat), the same division
-    may appear with different casing. This picks a canonical form for each group
-    and updates all records to match.
+    Adds missing columns (display_name, sort_key etc.), indexes and triggers
+    in place, so outputs can be regenerated without a rebuild. Rows built
+    before the display_name column existed keep it NULL and are cleaned on
+    read; missing winner sort keys and group_stats rows are filled in.
     """
-    cur.execute('SELECT DISTINCT division FROM results WHERE meet_name = ?', (meet_name,))
-    all_divs = [r[0] for r in cur.fetchall() if r[0]]
+    if not os.path.exists(db_path):
+        return
+    conn = connect(db_path)
+    try:
+        cur = conn.cursor()
+        _create_results_tables(cur)
+        _create_winners_table(cur)
+        _create_group_stats_table(cur)
+        cur.execute('''SELECT DISTINCT meet_name FROM results
+                       WHERE meet_name NOT IN (SELECT meet_name FROM group_stats)''')
+        for (meet_name,) in cur.fetchall():
+            _build_group_stats(cur, meet_name)
+        cur.execute('SELECT DISTINCT meet_name FROM winners WHERE sort_key IS NULL')
+        for (meet_name,) in cur.fetchall():
+            _build_sort_keys(cur, meet_name)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _publish_database(conn: sqlite3.Connection, db_path: str):
+    """Atomically replace db_path with the contents of an in-memory database.
+
+    The backup is written to a temp file next to db_path and renamed over it,
+    so readers see either the previous DB or the complete new one. If the
+    rename is blocked (Windows/OneDrive file locks), the backup is written
+    straight into db_path instead, which SQLite applies as one locked
+    transaction.
+    """
+    dir_name = os.path.dirname(os.path.abspath(db_path))
+    fd, tmp_path = tempfile.mkstemp(suffix='.db', dir=dir_name)
+    os.close(fd)
+    try:
+        dst = connect(tmp_path)
+        try:
+            conn.backup(dst)
+        finally:
+            dst.close()
+        for attempt in range(2):
+            try:
+                os.replace(tmp_path, db_path)
+                return
+            except PermissionError:
+                if attempt == 0:
+                    time.sleep(2)  # wait for OneDrive sync / AV scan to release the file
+        print(f"  Warning: could not rename over {db_path} (file locked), writing in place")
+        dst = connect(db_path)
+        try:
+            conn.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# Shirt display name + suspicious-name verdict, stored on results and winners
+# (columns added in place on databases built before they existed)
+_DISPLAY_NAME_COLUMNS = (
+    ('display_name', 'TEXT'),
+    ('suspicious_name', 'INTEGER DEFAULT 0'),
+    ('suspicious_reason', 'TEXT'),
+)
+
+
+def _create_display_name_trigger(cur, table):
+    """Reset the stored display name when a name is corrected in place.
+
+    Name corrections (the app's rename tool) UPDATE the name column only;
+    readers treat a NULL display_name as "clean the name again"
+    (layout_engine.stored_display_name).
+    """
+    cur.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_rename
+        AFTER UPDATE OF name ON {table} WHEN NEW.name IS NOT OLD.name
+        BEGIN
+            UPDATE {table} SET display_name = NULL, suspicious_name = NULL,
+                suspicious_reason = NULL
+            WHERE id = NEW.id;
+        END''')
+
+
+def _create_results_tables(cur):
+    """Create the results and meets tables and the results indexes if needed."""
+    cur.execute('''CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        state TEXT,
+        meet_name TEXT,
+        association TEXT,
+        name TEXT,
+        gym TEXT,
+        club_num TEXT,
+        session TEXT,
+        level TEXT,
+        division TEXT,
+        vault REAL,
+        bars REAL,
+        beam REAL,
+        floor REAL,
+        aa REAL,
+        rank TEXT,
+        num TEXT,
+        display_name TEXT,
+        suspicious_name INTEGER DEFAULT 0,
+        suspicious_reason TEXT
+    )''')
+
+    for column, decl in (('club_num', 'TEXT'),) + _DISPLAY_NAME_COLUMNS:
+        try:
+            cur.execute(f'ALTER TABLE results ADD COLUMN {column} {decl}')
+        except Exception:
+            pass  # Column already exists
+    _create_display_name_trigger(cur, 'results')
+
+    cur.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_results_unique
+        ON results(meet_name, name, gym, session, level, division)''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_meet_sld ON results(meet_name, session, level, division)')
 
+    cur.execute('''CREATE TABLE IF NOT EXISTS meets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meet_name TEXT UNIQUE,
+        source TEXT,
+        source_id TEXT,
+        source_name TEXT,
+        state TEXT,
+        association TEXT,
+        year TEXT,
+        dates TEXT,
+        created_at TEXT DEFAULT (datetime('now'))
+    )''')
+
+
+def _division_canonical_map(divisions) -> dict[str, str]:
+    """Map each division variant that differs only by case/spacing to one canonical form.
+
+    Divisions without variants are omitted. Canonical choice: prefer the version
+    with spaces ("Jr A" over "JRA"), then mixed case over ALL CAPS.
+    """
     # Group by uppercased key with spaces stripped
     groups = {}  # UPPER_NO_SPACES -> [original forms]
-    for div in all_divs:
+    for div in divisions:
         key = div.strip().upper().replace(' ', '')
         groups.setdefault(key, []).append(div)
 
-    merged = 0
+    canonical_map = {}
     for key, variants in groups.items():
         if len(variants) <= 1:
             continue
-        # Pick canonical: prefer version with spaces ("Jr A" over "JRA"),
-        # then prefer mixed case over ALL CAPS
         canonical = sorted(variants, key=lambda v: (-len(v), v == v.upper(), v))[0]
         for variant in variants:
             if variant != canonical:
-                cur.execute('UPDATE results SET division = ? WHERE meet_name = ? AND division = ?',
-                            (canonical, meet_name, variant))
-                count = cur.rowcount
-                if count > 0:
-                    merged += count
-                    print(f"  Division merged: \"{variant}\" -> \"{canonical}\" ({count} rows)")
+                canonical_map[variant] = canonical
+    return canonical_map
 
+
+def _print_division_merges(merges: list[tuple[str, str, int]]):
+    """Report (variant, canonical, row_count) merges in the agent-readable format."""
+    merged = 0
+    for variant, canonical, count in merges:
+        if count > 0:
+            merged += count
+            print(f"  Division merged: \"{variant}\" -> \"{canonical}\" ({count} rows)")
     if merged:
         print(f"  Total division merges: {merged} rows")
         print(f"  DIVISION_MERGES: {merged} rows merged due to case/format differences. Verify division_order uses canonical names.")
 
 
-def _create_winners_table(cur, meet_name: str):
-    """Create the winners table if needed and clear data for this meet."""
+def _normalize_division_case(cur, meet_name: str):
+    """Merge division variants that differ only by case (e.g., JR A / Jr A / JRA).
+
+    When combining data from multiple sources (MSO + ScoreCat), the same division
+    may appear with different casing. This picks a canonical form for each group
+    and updates all records to match.
+    """
+    cur.execute('SELECT DISTINCT division FROM results WHERE meet_name = ?', (meet_name,))
+    all_divs = [r[0] for r in cur.fetchall() if r[0]]
+
+    merges = []
+    for variant, canonical in _division_canonical_map(all_divs).items():
+        cur.execute('UPDATE results SET division = ? WHERE meet_name = ? AND division = ?',
+                    (canonical, meet_name, variant))
+        merges.append((variant, canonical, cur.rowcount))
+    _print_division_merges(merges)
+
+
+# results columns compared by incremental ingest (everything outside the unique key)
+_RESULT_VALUE_COLS = ('state', 'association', 'club_num',
+                      'vault', 'bars', 'beam', 'floor', 'aa', 'rank', 'num',
+                      'display_name', 'suspicious_name', 'suspicious_reason')
+
+
+def _apply_incremental_rows(cur, meet_name: str, rows: list[tuple]) -> set | None:
+    """Diff staged rows against stored results on the unique key and apply the delta.
+
+    The key is (meet_name, name, gym, session, level, division). Incoming
+    divisions are canonicalized against the stored ones first, so a re-ingest
+    does not churn rows that _normalize_division_case already merged. Later
+    duplicates in rows win, as with INSERT OR REPLACE.
+
+    Returns the set of (level, division) pairs touched by any insert, update or
+    delete, or None when incremental ingest is not possible and the caller
+    must do a full rebuild.
+    """
+    cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'winners'")
+    if cur.fetchone() is None:
+        return None
+    cur.execute('SELECT COUNT(*) FROM results WHERE meet_name != ? OR meet_name IS NULL', (meet_name,))
+    if cur.fetchone()[0]:
+        return None  # staging DB is single-meet; another meet means a fresh build
+
+    cur.execute(f'''SELECT id, name, gym, session, level, division, {', '.join(_RESULT_VALUE_COLS)}
+                   FROM results WHERE meet_name = ?''', (meet_name,))
+    existing = {tuple(r[1:6]): (r[0], tuple(r[6:])) for r in cur.fetchall()}
+    if not existing:
+        return None
+
+    stored_divs = {key[4] for key in existing if key[4]}
+    incoming_divs = {row[8] for row in rows if row[8]}
+    canonical_map = _division_canonical_map(sorted(stored_divs) + sorted(incoming_divs - stored_divs))
+    if any(div in canonical_map for div in stored_divs):
+        return None  # a new variant would rename stored divisions
+
+    merge_counts = {}
+    incoming = {}  # key -> staged row (division canonicalized)
+    for row in rows:
+        canonical = canonical_map.get(row[8])
+        if canonical is not None:
+            merge_counts[row[8]] = merge_counts.get(row[8], 0) + 1
+            row = row[:8] + (canonical,) + row[9:]
+        incoming[(row[3], row[4], row[6], row[7], row[8])] = row
+    _print_division_merges([(v, canonical_map[v], n) for v, n in merge_counts.items()])
+
+    inserts, updates, deletes = [], [], []
+    affected = set()
+    for key, row in incoming.items():
+        values = (row[0], row[2], row[5]) + row[9:]
+        stored = existing.get(key)
+        if stored is None:
+            inserts.append(row)
+        elif stored[1] != values:
+            updates.append(values + (stored[0],))
+        else:
+            continue
+        affected.add((key[3], key[4]))
+    for key, (row_id, _values) in existing.items():
+        if key not in incoming:
+            deletes.append((row_id,))
+            affected.add((key[3], key[4]))
+
+    cur.executemany('DELETE FROM results WHERE id = ?', deletes)
+    cur.executemany(f'''UPDATE results SET {', '.join(f'{c} = ?' for c in _RESULT_VALUE_COLS)}
+                       WHERE id = ?''', updates)
+    for start in range(0, len(inserts), _INSERT_CHUNK):
+        cur.executemany(_INSERT_RESULT_SQL, inserts[start:start + _INSERT_CHUNK])
+
+    print(f"Incremental ingest: {len(inserts)} inserted, {len(updates)} updated, "
+          f"{len(deletes)} deleted, {len(incoming) - len(inserts) - len(updates)} unchanged; "
+          f"{len(affected)} level/division group(s) to recompute")
+    return affected
+
+
+def _create_winners_table(cur):
+    """Create the winners table and its indexes if needed."""
     cur.execute('''CREATE TABLE IF NOT EXISTS winners (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         state TEXT,
@@ -261,15 +550,125 @@ def _create_winners_table(cur, meet_name: str):
         division TEXT,
         event TEXT,
         score REAL,
-        is_tie INTEGER DEFAULT 0
+        is_tie INTEGER DEFAULT 0,
+        display_name TEXT,
+        suspicious_name INTEGER DEFAULT 0,
+        suspicious_reason TEXT,
+        sort_key BLOB
     )''')
+    for column, decl in _DISPLAY_NAME_COLUMNS + (('sort_key', 'BLOB'),):
+        try:
+            cur.execute(f'ALTER TABLE winners ADD COLUMN {column} {decl}')
+        except Exception:
+            pass  # Column already exists
+    _create_display_name_trigger(cur, 'winners')
     cur.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_winners_unique
         ON winners(meet_name, name, gym, session, level, division, event)''')
     # Covering indexes for common query patterns (output generation, gym lookups)
     cur.execute('CREATE INDEX IF NOT EXISTS idx_winners_meet_event_level ON winners(meet_name, event, level)')
     cur.execute('CREATE INDEX IF NOT EXISTS idx_winners_meet_gym ON winners(meet_name, gym)')
-    # Winners are always fully rebuilt per meet
-    cur.execute('DELETE FROM winners WHERE meet_name = ?', (meet_name,))
+
+
+# group_stats: one row per (session, level, division) of a meet, filled inside
+# the build transaction so winners, solo detection, the level cross-check and
+# the meet summary read per-group aggregates instead of re-scanning results.
+# Any change to a meet's results outside a build (the app's finalize, sync,
+# rename and delete tools) drops that meet's rows via triggers; readers then
+# aggregate on the fly until upgrade_schema or the next build refills them.
+GROUP_STATS_COLUMNS = (
+    'session', 'level', 'division',
+    'athletes',         # distinct athlete names in the group
+    'entries',          # results rows in the group
+    'is_solo',          # exactly one athlete
+    'has_competition',  # some session has 2+ athletes at this level+division
+    'is_excluded',      # solo and has_competition: out-of-session, never wins
+    'solo_name', 'solo_gym',  # the athlete of a solo group (first results row)
+) + tuple(f'max_{ev}' for ev in EVENTS)  # best score > 0 per event, else NULL
+
+_GROUP_STATS_SELECT = f'''
+    WITH g AS (
+        SELECT session, level, division,
+               COUNT(DISTINCT name) AS athletes, COUNT(*) AS entries, MIN(id) AS first_id,
+               {', '.join(f'MAX(CASE WHEN {ev} > 0 THEN {ev} END) AS max_{ev}' for ev in EVENTS)}
+        FROM results WHERE meet_name = :meet
+        GROUP BY session, level, division
+    )
+    SELECT g.session, g.level, g.division, g.athletes, g.entries,
+           g.athletes = 1,
+           MAX(g.athletes >= 2) OVER w,
+           g.athletes = 1 AND MAX(g.athletes >= 2) OVER w,
+           CASE WHEN g.athletes = 1 THEN r.name END,
+           CASE WHEN g.athletes = 1 THEN r.gym END,
+           {', '.join(f'g.max_{ev}' for ev in EVENTS)}
+    FROM g JOIN results r ON r.id = g.first_id
+    WINDOW w AS (PARTITION BY g.level, g.division)
+    ORDER BY g.session, g.level, g.division'''
+
+
+def _create_group_stats_table(cur):
+    """Create the group_stats table and its index if needed."""
+    cur.execute(f'''CREATE TABLE IF NOT EXISTS group_stats (
+        meet_name TEXT,
+        session TEXT,
+        level TEXT,
+        division TEXT,
+        athletes INTEGER,
+        entries INTEGER,
+        is_solo INTEGER,
+        has_competition INTEGER,
+        is_excluded INTEGER,
+        solo_name TEXT,
+        solo_gym TEXT,
+        {', '.join(f'max_{ev} REAL' for ev in EVENTS)}
+    )''')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_group_stats_meet_ld ON group_stats(meet_name, level, division)')
+    _create_group_stats_triggers(cur)
+
+
+def _create_group_stats_triggers(cur):
+    """Drop a meet's group_stats rows whenever its results change."""
+    columns = ', '.join(('meet_name', 'name', 'gym', 'session', 'level', 'division') + tuple(EVENTS))
+    for trigger, event, rows in (('insert', 'INSERT', ('NEW',)),
+                                 ('delete', 'DELETE', ('OLD',)),
+                                 ('update', f'UPDATE OF {columns}', ('OLD', 'NEW'))):
+        deletes = ' '.join(f'DELETE FROM group_stats WHERE meet_name = {row}.meet_name;'
+                           for row in rows)
+        cur.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_results_{trigger}_group_stats
+            AFTER {event} ON results
+            BEGIN
+                {deletes}
+            END''')
+
+
+def _build_group_stats(cur, meet_name: str):
+    """Recompute the meet's group_stats rows from results (one aggregate pass).
+
+    Always meet-wide: has_competition depends on every session of a
+    level+division, and a full pass is cheap next to winner determination.
+    """
+    cur.execute('DELETE FROM group_stats WHERE meet_name = ?', (meet_name,))
+    cur.execute(f'''INSERT INTO group_stats (meet_name, {', '.join(GROUP_STATS_COLUMNS)})
+                   SELECT :meet, * FROM ({_GROUP_STATS_SELECT})''', {'meet': meet_name})
+
+
+def read_group_stats(cur, meet_name: str) -> list[dict]:
+    """Per-group statistics for a meet, ordered by session, level, division.
+
+    Returns one dict per group keyed by GROUP_STATS_COLUMNS. Reads the
+    group_stats table; databases built before it existed, and meets whose
+    rows were dropped because their results changed, are aggregated on the
+    fly with the same query.
+    """
+    rows = []
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'group_stats'")
+    if cur.fetchone() is not None:
+        cur.execute(f'''SELECT {', '.join(GROUP_STATS_COLUMNS)} FROM group_stats
+                       WHERE meet_name = ? ORDER BY session, level, division''', (meet_name,))
+        rows = cur.fetchall()
+    if not rows:
+        cur.execute(_GROUP_STATS_SELECT, {'meet': meet_name})
+        rows = cur.fetchall()
+    return [dict(zip(GROUP_STATS_COLUMNS, row)) for row in rows]
 
 
 def _find_solo_sessions(cur, meet_name: str) -> set:
@@ -284,123 +683,239 @@ def _find_solo_sessions(cur, meet_name: str) -> set:
 
     Returns a set of (session, level, division) tuples to exclude.
     """
-    # Step 1: Find all solo groups (session+level+division with exactly 1 athlete)
-    cur.execute('''SELECT session, level, division
-                   FROM results WHERE meet_name = ?
-                   GROUP BY session, level, division
-                   HAVING COUNT(DISTINCT name) = 1''', (meet_name,))
-    solo_groups = [(row[0], row[1], row[2]) for row in cur.fetchall()]
-
+    solo_groups = [g for g in read_group_stats(cur, meet_name) if g['is_solo']]
     if not solo_groups:
         return set()
 
-    # Step 2: Find level+division combos that have real competition (2+ athletes)
-    # in at least one session
-    cur.execute('''SELECT level, division
-                   FROM results WHERE meet_name = ?
-                   GROUP BY session, level, division
-                   HAVING COUNT(DISTINCT name) >= 2''', (meet_name,))
-    has_competition = {(row[0], row[1]) for row in cur.fetchall()}
-
-    # Step 3: Only exclude solo groups whose level+division has competition elsewhere
-    excluded = set()
-    for session, level, division in solo_groups:
-        if (level, division) in has_competition:
-            excluded.add((session, level, division))
+    # Excluded = solo groups whose level+division has 2+ athletes in another session
+    excluded = {(g['session'], g['level'], g['division']) for g in solo_groups if g['is_excluded']}
 
     # Report both excluded and kept solo athletes
-    kept_solos = [(s, l, d) for s, l, d in solo_groups if (s, l, d) not in excluded]
+    kept_solos = [g for g in solo_groups if not g['is_excluded']]
     if excluded:
         print(f"  Solo sessions: {len(excluded)} out-of-session group(s) excluded")
     if kept_solos:
         print(f"  WARNING: {len(kept_solos)} athlete(s) competing alone at their level/division "
               f"(no other athletes in that division at the entire meet):")
         solo_kept_list = []
-        for s, l, d in kept_solos:
-            cur.execute('SELECT name, gym FROM results WHERE meet_name = ? AND session = ? AND level = ? AND division = ?',
-                        (meet_name, s, l, d))
-            row = cur.fetchone()
-            if row:
-                print(f"    {row[0]} ({row[1]}) -- S{s} L{l} Div {d}")
-                solo_kept_list.append({"name": row[0], "gym": row[1], "level": l, "division": d, "session": s})
+        for g in kept_solos:
+            s, l, d = g['session'], g['level'], g['division']
+            if s is not None and l is not None and d is not None:
+                print(f"    {g['solo_name']} ({g['solo_gym']}) -- S{s} L{l} Div {d}")
+                solo_kept_list.append({"name": g['solo_name'], "gym": g['solo_gym'],
+                                       "level": l, "division": d, "session": s})
         print(f"  These athletes won all events by default. Verify with user if they should be on the shirt.")
         if solo_kept_list:
             print(f"SOLO_WINNERS_JSON: {json.dumps(solo_kept_list)}")
     return excluded
 
 
-def _build_winners_score_based(conn: sqlite3.Connection, config: MeetConfig):
+# Set-based winner query: each group's max score per event (zero/NULL scores
+# never win) comes from group_stats, then a join pulls back only the rows that
+# hold at least one of those maxima. Rows with a NULL session/level/division
+# never form a winnable group, matching the old per-group equality lookups.
+_EVENT_WINNERS_SQL = f'''
+    WITH group_max AS (
+        SELECT session, level, division,
+               {', '.join(f'max_{ev} AS {ev}' for ev in EVENTS)}
+        FROM group_stats
+        WHERE meet_name = :meet
+          AND session IS NOT NULL AND level IS NOT NULL AND division IS NOT NULL
+          {{scope}}
+    )
+    SELECT r.name, r.gym, r.session, r.level, r.division,
+           r.display_name, r.suspicious_name, r.suspicious_reason,
+           {', '.join(f'g.{ev}' for ev in EVENTS)},
+           {', '.join(f'r.{ev} = g.{ev}' for ev in EVENTS)}
+    FROM group_max g
+    JOIN results r ON r.meet_name = :meet AND r.session = g.session
+                  AND r.level = g.level AND r.division = g.division
+    WHERE {' OR '.join(f'r.{ev} = g.{ev}' for ev in EVENTS)}
+    ORDER BY r.level, r.division, r.session, r.id'''
+
+# Restricts _EVENT_WINNERS_SQL to the level+division pairs in temp.winner_scope
+_WINNER_SCOPE_FILTER = 'AND (level, division) IN (SELECT level, division FROM temp.winner_scope)'
+
+
+def _select_event_winners(cur, meet_name: str, level_divisions: set | None = None) -> list[tuple]:
+    """Find every (session, level, division, event) winner in one round trip.
+
+    Returns (name, gym, session, level, division, event, score, is_tie,
+    display_name, suspicious_name, suspicious_reason) tuples in the same
+    order as the old per-group loop: level, division, session, then EVENTS
+    order, then results row order. Solo-session filtering is left to the
+    caller. When level_divisions is given, only those (level, division)
+    pairs are scanned.
+    """
+    n = len(EVENTS)
+    if level_divisions is None:
+        cur.execute(_EVENT_WINNERS_SQL.format(scope=''), {'meet': meet_name})
+    else:
+        cur.execute('CREATE TEMP TABLE IF NOT EXISTS winner_scope (level TEXT, division TEXT)')
+        cur.execute('DELETE FROM temp.winner_scope')
+        cur.executemany('INSERT INTO temp.winner_scope VALUES (?, ?)', sorted(level_divisions))
+        cur.execute(_EVENT_WINNERS_SQL.format(scope=_WINNER_SCOPE_FILTER), {'meet': meet_name})
+    groups = {}  # (session, level, division) -> per event [(name, gym, score, display), ...]
+    for row in cur.fetchall():
+        name, gym, session, level, division = row[:5]
+        display, cols = row[5:8], row[8:]
+        per_event = groups.get((session, level, division))
+        if per_event is None:
+            per_event = groups[(session, level, division)] = [[] for _ in EVENTS]
+        for i in range(n):
+            if cols[n + i]:
+                per_event[i].append((name, gym, cols[i], display))
+
+    winners = []
+    for (session, level, division), per_event in groups.items():
+        for event, tied in zip(EVENTS, per_event):
+            is_tie = 1 if len(tied) > 1 else 0
+            for name, gym, score, display in tied:
+                winners.append((name, gym, session, level, division, event, score, is_tie,
+                                *display))
+    return winners
+
+
+def _build_winners_score_based(conn: sqlite3.Connection, config: MeetConfig,
+                               level_divisions: set | None = None):
     """Determine winners by max score per session+level+division+event.
 
-    Used for MSO PDF and MSO HTML sources.
+    Used for every source. All groups are resolved by one set-based query and
+    bulk-inserted, instead of two SELECTs per group and event. Passing
+    level_divisions (incremental ingest) replaces the winners of only those
+    (level, division) pairs; solo detection still sees the whole meet.
     """
     cur = conn.cursor()
-    _create_winners_table(cur, config.meet_name)
+    _create_winners_table(cur)
+    if level_divisions is None:
+        cur.execute('DELETE FROM winners WHERE meet_name = ?', (config.meet_name,))
+    else:
+        cur.executemany('DELETE FROM winners WHERE meet_name = ? AND level = ? AND division = ?',
+                        [(config.meet_name, level, division) for level, division in level_divisions])
 
     # Find solo sessions (only 1 athlete in that session+level+division).
     # These are "out of session" competitors (e.g., Sunday religious accommodation)
     # who are NOT eligible for state champion status.
     solo_sessions = _find_solo_sessions(cur, config.meet_name)
 
-    # Use COALESCE in queries (not UPDATE) to handle NULLs without mutating source data
-    cur.execute('''SELECT DISTINCT COALESCE(session,'') as session,
-                   COALESCE(level,'') as level,
-                   COALESCE(division,'') as division
-                   FROM results WHERE meet_name = ?
-                   ORDER BY level, division, session''', (config.meet_name,))
-    combos = cur.fetchall()
+    # One set-based pass over results finds every event's max score and tie set
+    winner_rows = [row for row in _select_event_winners(cur, config.meet_name, level_divisions)
+                   if (row[2], row[3], row[4]) not in solo_sessions]
+
+    insert_sql = '''INSERT OR REPLACE INTO winners
+        (state, meet_name, association, name, gym, session, level, division,
+         event, score, is_tie, display_name, suspicious_name, suspicious_reason)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+    params = [(config.state, config.meet_name, config.association,
+               name, gym or '', session, level, division, event, score, is_tie, *display)
+              for name, gym, session, level, division, event, score, is_tie, *display in winner_rows]
 
     insert_errors = 0
-    for session, level, division in combos:
-        if (session, level, division) in solo_sessions:
-            continue
-        for event in EVENTS:
-            # Find max score (exclude NULLs and zeroes)
-            cur.execute(f'''SELECT MAX({event}) FROM results
-                           WHERE meet_name = ? AND session = ? AND level = ? AND division = ?
-                             AND {event} IS NOT NULL AND {event} > 0''',
-                        (config.meet_name, session, level, division))
-            max_score = cur.fetchone()[0]
-            if max_score is None:
-                continue
-
-            # Find all athletes with that max score
-            cur.execute(f'''SELECT name, gym FROM results
-                           WHERE meet_name = ? AND session = ? AND level = ? AND division = ?
-                             AND {event} = ?''',
-                        (config.meet_name, session, level, division, max_score))
-            winners = cur.fetchall()
-
-            is_tie = 1 if len(winners) > 1 else 0
-            for name, gym in winners:
-                try:
-                    cur.execute('''INSERT OR REPLACE INTO winners
-                        (state, meet_name, association, name, gym, session, level, division,
-                         event, score, is_tie)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                        (config.state, config.meet_name, config.association,
-                         name, gym or '', session, level, division, event, max_score, is_tie))
-                except Exception as e:
-                    insert_errors += 1
-                    if insert_errors <= 5:  # log first 5 errors to avoid flooding
-                        print(f"  Warning: Failed to insert winner: name={name!r} gym={gym!r} "
-                              f"session={session!r} level={level!r} division={division!r} "
-                              f"event={event} score={max_score}: {e}")
+    try:
+        cur.executemany(insert_sql, params)
+    except sqlite3.Error:
+        # Replay row by row (INSERT OR REPLACE is idempotent) to report which rows fail
+        for p in params:
+            try:
+                cur.execute(insert_sql, p)
+            except Exception as e:
+                insert_errors += 1
+                if insert_errors <= 5:  # log first 5 errors to avoid flooding
+                    print(f"  Warning: Failed to insert winner: name={p[3]!r} gym={p[4]!r} "
+                          f"session={p[5]!r} level={p[6]!r} division={p[7]!r} "
+                          f"event={p[8]} score={p[9]}: {e}")
 
     if insert_errors:
         print(f"  Warning: {insert_errors} winner insert(s) failed (see above)")
         print(f"WINNER_INSERT_ERRORS: {insert_errors} total insert failures")
 
     # Level cross-check: every level in results should have at least one winner
-    cur.execute('SELECT DISTINCT level FROM results WHERE meet_name = ?', (config.meet_name,))
-    levels_in_results = {row[0] for row in cur.fetchall()}
+    entries_per_level = {}
+    for g in read_group_stats(cur, config.meet_name):
+        entries_per_level[g['level']] = entries_per_level.get(g['level'], 0) + g['entries']
     cur.execute('SELECT DISTINCT level FROM winners WHERE meet_name = ?', (config.meet_name,))
     levels_in_winners = {row[0] for row in cur.fetchall()}
-    for level in sorted(levels_in_results - levels_in_winners):
-        cur.execute('SELECT COUNT(*) FROM results WHERE meet_name = ? AND level = ?',
-                    (config.meet_name, level))
-        n = cur.fetchone()[0]
+    for level in sorted(set(entries_per_level) - levels_in_winners):
+        n = entries_per_level[level]
         print(f"LEVEL_MISSING_WINNERS: Level '{level}' has {n} athletes in results but ZERO winners. "
               f"Check scores for this level.")
 
 
+# --- Shirt ordering sort key ---
+# Within an event+level, shirt names are ordered by division age (from the
+# division order chosen at generation time), then winners.sort_key, then
+# name. sort_key packs the rest of the tie-break into one BLOB whose byte
+# order (SQLite compares BLOBs with memcmp) is the tie-break order:
+#   1. session ascending (numeric sessions first, then the rest as text)
+#   2. for event ties: AA score descending (athletes without one last)
+#   3. for AA ties: highest individual event score descending, then next
+#      highest, etc.
+
+def _sortable_float(x: float) -> bytes:
+    """8 bytes whose byte order matches float order (IEEE 754 sign flip)."""
+    bits = struct.unpack('>Q', struct.pack('>d', x))[0]
+    bits ^= 0xFFFFFFFFFFFFFFFF if bits >> 63 else 1 << 63
+    return bits.to_bytes(8, 'big')
+
+
+def _sortable_int(n: int) -> bytes:
+    """Bytes whose byte order matches integer order, for any size of int.
+
+    Sign byte, then the magnitude's byte length and big-endian bytes; for
+    negatives both are inverted so larger magnitudes sort first.
+    """
+    size = (abs(n).bit_length() + 7) // 8
+    magnitude = abs(n).to_bytes(size, 'big')
+    if n >= 0:
+        return b'\x01' + size.to_bytes(2, 'big') + magnitude
+    return b'\x00' + (0xFFFF - size).to_bytes(2, 'big') + bytes(0xFF - b for b in magnitude)
+
+
+def winner_sort_key(session: str | None, aa: float | None, event_scores) -> bytes:
+    """Shirt-ordering key for one winner row.
+
+    Args:
+        aa: The athlete's best AA score at this level+session, or None.
+        event_scores: Their positive individual event scores.
+    """
+    try:
+        key = b'\x00' + _sortable_int(int(session))
+    except (ValueError, TypeError, OverflowError):
+        key = b'\x01' + (session or '').encode('utf-8') + b'\x00'
+    key += _sortable_float(-aa if aa is not None else 1.0)
+    scores = sorted(event_scores, reverse=True)[:4]
+    for s in scores + [0.0] * (4 - len(scores)):
+        key += _sortable_float(-s)
+    return key
+
+
+def compute_winner_sort_keys(cur, meet_name: str) -> dict[int, bytes]:
+    """Return {winner id: sort_key} for a meet, from its results scores.
+
+    Scores are looked up by (name, level, session), the granularity shirt
+    ties are broken at: the best AA score across matching result rows, and
+    the event scores of the last one.
+    """
+    aa_scores = {}     # (name, level, session) -> AA score
+    event_scores = {}  # (name, level, session) -> positive event scores
+    cur.execute('''SELECT name, level, session, vault, bars, beam, floor, aa FROM results
+                   WHERE meet_name = ?''', (meet_name,))
+    for name, level, session, vault, bars, beam, floor, aa in cur.fetchall():
+        key = (name, level, session)
+        if aa and aa > 0:
+            if key not in aa_scores or aa > aa_scores[key]:
+                aa_scores[key] = aa
+        event_scores[key] = [s for s in (vault, bars, beam, floor) if s and s > 0]
+
+    cur.execute('SELECT id, name, level, session FROM winners WHERE meet_name = ?',
+                (meet_name,))
+    return {wid: winner_sort_key(session, aa_scores.get((name, level, session)),
+                                 event_scores.get((name, level, session), ()))
+            for wid, name, level, session in cur.fetchall()}
+
+
+def _build_sort_keys(cur, meet_name: str):
+    """Store compute_winner_sort_keys() in winners.sort_key."""
+    keys = compute_winner_sort_keys(cur, meet_name)
+    cur.executemany('UPDATE winners SET sort_key = ? WHERE id = ?',
+                    [(key, wid) for wid, key in keys.items()])
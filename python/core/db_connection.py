@@ -0,0 +1,156 @@
+"""Central SQLite connection factory with named pragma profiles.
+
+Every module opens its database through connect() so that connection
+tuning lives in one place (and can be benchmarked by swapping a profile
+in PRAGMA_PROFILES, see scripts/bench_db_builder.py).
+
+Profiles:
+  - bulk-build:   build_database. No fsync, temp B-trees in RAM, big page
+                  cache. The rollback journal is kept in memory rather than
+                  turned OFF, so the build transaction can still roll back.
+  - read-mostly:  output generation. Read-only connection, memory-mapped
+                  I/O and a larger page cache for the repeated winner scans.
+  - archive:      the long-lived multi-meet archive. WAL so readers are not
+                  blocked while a meet is promoted.
+  - default:      plain sqlite3.connect() (e.g. publishing a finished DB,
+                  where the file must be fully synced before the rename).
+
+A MeetDataSession can be passed anywhere a db_path is expected: connect()
+then hands back the session's one shared connection instead of opening a
+new one, and functions decorated with @session_cached reuse their result
+sets for the rest of the run.
+"""
+
+import copy
+import functools
+import os
+import sqlite3
+
+# Applied in order; journal_mode first since it can affect later pragmas
+PRAGMA_PROFILES = {
+    'default': [],
+    'bulk-build': [
+        ('journal_mode', 'MEMORY'),
+        ('synchronous', 'OFF'),
+        ('temp_store', 'MEMORY'),
+        ('cache_size', -64000),       # ~64 MB
+    ],
+    'read-mostly': [
+        ('query_only', 'ON'),
+        ('temp_store', 'MEMORY'),
+        ('mmap_size', 268435456),     # 256 MB
+        ('cache_size', -32000),       # ~32 MB
+    ],
+    'archive': [
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('temp_store', 'MEMORY'),
+        ('cache_size', -64000),
+    ],
+}
+
+
+def connect(db_path, profile: str = 'default') -> sqlite3.Connection:
+    """Open db_path and apply the named pragma profile.
+
+    If db_path is a MeetDataSession, its shared connection is returned
+    instead; calling close() on it is a no-op, the session closes it.
+
+    Raises:
+        ValueError: if profile is not a key of PRAGMA_PROFILES, or differs
+            from the profile a MeetDataSession was opened with.
+    """
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}'. "
+                         f"Choose from: {', '.join(PRAGMA_PROFILES)}")
+    if isinstance(db_path, MeetDataSession):
+        if profile != db_path.profile:
+            raise ValueError(f"MeetDataSession is '{db_path.profile}', cannot open it as '{profile}'")
+        return db_path.connection()
+    return _open(db_path, profile)
+
+
+def _open(db_path: str, profile: str, **kwargs) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, **kwargs)
+    for name, value in PRAGMA_PROFILES[profile]:
+        conn.execute(f'PRAGMA {name}={value}')
+    return conn
+
+
+class _SessionConnection(sqlite3.Connection):
+    """Connection owned by a MeetDataSession; helpers' close() calls are ignored."""
+
+    def close(self):
+        pass
+
+    def close_session(self):
+        super().close()
+
+
+class MeetDataSession:
+    """One database connection and result cache for a whole generation run.
+
+    Open it once after the DB is built and pass it in place of db_path to the
+    generators (shirt, order forms, highlights, summary). Every helper then
+    shares one connection, so connection setup and schema parsing happen
+    once, and sqlite3's per-connection statement cache keeps repeated queries
+    prepared. @session_cached functions (winners by event/level, division
+    order, gym lookups) run their queries once per argument set.
+
+    The cache assumes the DB does not change while the session is open.
+    """
+
+    def __init__(self, db_path: str, profile: str = 'read-mostly'):
+        self.db_path = db_path
+        self.profile = profile
+        self._conn = None
+        self._cache = {}
+
+    def __fspath__(self):
+        return self.db_path
+
+    def __repr__(self):
+        return f'MeetDataSession({self.db_path!r})'
+
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _open(self.db_path, self.profile,
+                               factory=_SessionConnection, cached_statements=256)
+        return self._conn
+
+    def cached(self, key, compute):
+        """Return compute()'s result for key, computing it once per session.
+
+        A deep copy is returned so callers may mutate it freely.
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return copy.deepcopy(self._cache[key])
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close_session()
+            self._conn = None
+        self._cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def session_cached(func):
+    """Memoize func(db_path, ...) per MeetDataSession; plain paths run uncached."""
+    @functools.wraps(func)
+    def wrapper(db_path, *args, **kwargs):
+        if not isinstance(db_path, MeetDataSession):
+            return func(db_path, *args, **kwargs)
+        key = (func.__qualname__, repr(args), repr(sorted(kwargs.items())))
+        return db_path.cached(key, lambda: func(db_path, *args, **kwargs))
+    return wrapper
+
+
+def db_file(db_path) -> str:
+    """The file path behind a db_path argument (plain path or MeetDataSession)."""
+    return os.fspath(db_path)
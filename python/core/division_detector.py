@@ -13,9 +13,12 @@ import os
 import re
 import sqlite3
 
+from python.core.db_connection import connect, session_cached
+
 logger = logging.getLogger(__name__)
 
 
+@session_cached
 def detect_division_order(db_path: str, meet_name: str,
                           explicit_order: list = None) -> tuple[dict, list[str]]:
     """Query DB for distinct divisions and return {name: sort_position} dict.
@@ -29,7 +32,7 @@ def detect_division_order(db_path: str, meet_name: str,
         (order_dict, warnings) where order_dict maps division names to
         sort positions, and warnings lists any issues found.
     """
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
         cur.execute('SELECT DISTINCT division FROM results WHERE meet_name = ?',
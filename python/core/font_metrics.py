@@ -0,0 +1,145 @@
+"""Glyph advance widths for the PDF base-14 fonts used on shirt pages.
+
+Widths are the standard Adobe AFM metrics (1/1000 em) for Times and
+Helvetica, regular and bold, which is what fitz.get_text_length() reports
+for these fonts, including its Latin-1 encoding: characters outside
+printable Latin-1 measure as a space. That lets the layout engine measure
+every name on a shirt without PyMuPDF and without one call per name.
+
+With NumPy installed, text_widths() measures a whole batch of names in one
+vectorised pass over their concatenated code points; without it the same
+table is summed per character.
+"""
+
+import functools
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python fallback in text_widths()
+    np = None
+
+# Advance widths for ' ' .. '~' (code points 32-126), in 1/1000 em
+_AFM_ASCII = {
+    'Times-Roman': (
+        250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,
+        500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278, 564, 564, 564, 444,
+        921, 722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889, 722, 722,
+        556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611, 333, 278, 333, 469, 500,
+        333, 444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778, 500, 500,
+        500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,
+    ),
+    'Times-Bold': (
+        250, 333, 555, 500, 500, 1000, 833, 278, 333, 333, 500, 570, 250, 333, 250, 278,
+        500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 333, 333, 570, 570, 570, 500,
+        930, 722, 667, 722, 722, 667, 611, 778, 778, 389, 500, 778, 667, 944, 722, 778,
+        611, 778, 722, 556, 667, 722, 722, 1000, 722, 722, 667, 333, 278, 333, 581, 500,
+        333, 500, 556, 444, 556, 444, 333, 500, 556, 278, 333, 556, 278, 833, 556, 500,
+        556, 556, 444, 389, 333, 556, 500, 722, 500, 500, 444, 394, 220, 394, 520,
+    ),
+    'Helvetica': (
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ),
+    'Helvetica-Bold': (
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+    ),
+}
+
+# Advance widths for the Latin-1 upper half (code points 160-255): accented
+# letters, ß, æ, ø and the few symbols that turn up in names
+_AFM_LATIN1 = {
+    'Times-Roman': (
+        250, 333, 500, 500, 500, 500, 200, 500, 333, 760, 276, 500, 564, 333, 760, 333,
+        400, 564, 300, 300, 333, 500, 453, 250, 333, 300, 310, 500, 750, 750, 750, 444,
+        722, 722, 722, 722, 722, 722, 889, 667, 611, 611, 611, 611, 333, 333, 333, 333,
+        722, 722, 722, 722, 722, 722, 722, 564, 722, 722, 722, 722, 722, 722, 556, 500,
+        444, 444, 444, 444, 444, 444, 667, 444, 444, 444, 444, 444, 278, 278, 278, 278,
+        500, 500, 500, 500, 500, 500, 500, 564, 500, 500, 500, 500, 500, 500, 500, 500,
+    ),
+    'Times-Bold': (
+        250, 333, 500, 500, 500, 500, 220, 500, 333, 747, 300, 500, 570, 333, 747, 333,
+        400, 570, 300, 300, 333, 556, 540, 250, 333, 300, 330, 500, 750, 750, 750, 500,
+        722, 722, 722, 722, 722, 722, 1000, 722, 667, 667, 667, 667, 389, 389, 389, 389,
+        722, 722, 778, 778, 778, 778, 778, 570, 778, 722, 722, 722, 722, 722, 611, 556,
+        500, 500, 500, 500, 500, 500, 722, 444, 444, 444, 444, 444, 278, 278, 278, 278,
+        500, 556, 500, 500, 500, 500, 500, 570, 500, 556, 556, 556, 556, 500, 556, 500,
+    ),
+    'Helvetica': (
+        278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+        400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+        667, 667, 667, 667, 667, 667, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+        722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+        556, 556, 556, 556, 556, 556, 889, 500, 556, 556, 556, 556, 278, 278, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 584, 611, 556, 556, 556, 556, 500, 556, 500,
+    ),
+    'Helvetica-Bold': (
+        278, 333, 556, 556, 556, 556, 280, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+        400, 584, 333, 333, 333, 611, 556, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+        722, 722, 722, 722, 722, 722, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+        722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+        556, 556, 556, 556, 556, 556, 889, 556, 556, 556, 556, 556, 278, 278, 278, 278,
+        611, 611, 611, 611, 611, 611, 611, 584, 611, 611, 611, 611, 611, 556, 611, 556,
+    ),
+}
+
+# fitz short names for the same fonts
+_FONT_ALIASES = {'tiro': 'Times-Roman', 'tibo': 'Times-Bold',
+                 'helv': 'Helvetica', 'hebo': 'Helvetica-Bold'}
+
+_TABLE_SIZE = 256  # fitz encodes base-14 text as Latin-1; the last slot is 'other'
+
+
+class FontMetrics:
+    """Advance widths for one base-14 font; widths are in points at a given size."""
+
+    def __init__(self, font: str):
+        font = _FONT_ALIASES.get(font, font)
+        if font not in _AFM_ASCII:
+            raise ValueError(f"No metrics for font '{font}'. "
+                             f"Choose from: {', '.join(_AFM_ASCII)}")
+        self.font = font
+        # Like fitz, anything outside printable Latin-1 (control characters,
+        # curly quotes, dashes, Latin Extended letters) measures as a space.
+        space = _AFM_ASCII[font][0] / 1000
+        table = [space] * (_TABLE_SIZE + 1)
+        for cp, w in enumerate(_AFM_ASCII[font], start=32):
+            table[cp] = w / 1000
+        for cp, w in enumerate(_AFM_LATIN1[font], start=160):
+            table[cp] = w / 1000
+        self._table = table
+        self._np_table = np.array(table) if np is not None else None
+
+    def char_width(self, ch: str) -> float:
+        """Advance width of one character at 1pt."""
+        return self._table[min(ord(ch), _TABLE_SIZE)]
+
+    def text_width(self, text: str, size: float) -> float:
+        """Width of text at size, as fitz.get_text_length() would report it."""
+        return sum(map(self.char_width, text)) * size
+
+    def text_widths(self, texts, size: float = 1.0) -> list[float]:
+        """Widths of many strings at size, measured in one pass."""
+        texts = list(texts)
+        if np is None or not texts:
+            return [self.text_width(t, size) for t in texts]
+        codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+        advances = self._np_table[np.minimum(codes, _TABLE_SIZE)]
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        ends = np.cumsum(lengths)
+        running = np.concatenate(([0.0], np.cumsum(advances)))
+        return ((running[ends] - running[ends - lengths]) * size).tolist()
+
+
+@functools.lru_cache(maxsize=None)
+def font_metrics(font: str) -> FontMetrics:
+    """Shared FontMetrics for a font name (e.g. 'Times-Roman' or 'helv')."""
+    return FontMetrics(font)
@@ -20,7 +20,6 @@ import json
 import math
 import zipfile
 
-import fitz  # PyMuPDF — used for precise font metric measurements
 from xml.sax.saxutils import escape as xml_escape
 
 from python.core.constants import (
@@ -34,11 +33,13 @@ from python.core.constants import (
     FONT_REGULAR, FONT_BOLD,
     RED, BLACK, WHITE,
 )
+from python.core.db_connection import db_file
 from python.core.layout_engine import (
-    compute_layout, fit_font_size, space_text,
+    LayoutMetrics, compute_layout, space_text,
     precompute_shirt_data,
 )
-from python.core.rendering_utils import measure_small_caps_width
+from python.core.models import PrecomputedShirt
+from python.core.rendering_utils import measure_small_caps_width, text_width
 
 # Map PDF font names to InDesign font family / style / PostScript names
 _FONT_MAP = {
@@ -84,7 +85,7 @@ def generate_shirt_idml(db_path: str, meet_name: str, output_path: str,
                         exclude_levels: str = None,
                         page_h: int = None,
                         page_group_filter: list = None,
-                        precomputed: dict = None):
+                        precomputed: PrecomputedShirt = None):
     """Generate back-of-shirt IDML file for InDesign.
 
     Uses the same data query, level grouping, and style params as the PDF
@@ -104,28 +105,28 @@ def generate_shirt_idml(db_path: str, meet_name: str, output_path: str,
                                     page_h=_page_h)
 
     style = {
-        'page_groups': pre['page_groups'],
-        'data': pre['data'],
-        't1l': pre['t1l'], 't1s': pre['t1s'],
-        't2l': pre['t2l'], 't2s': pre['t2s'],
-        'lhr': pre['lhr'], 'lgap': pre['lgap'],
-        'mfill': pre['mfill'], 'mfs': pre['mfs'], 'mxfs': pre['mxfs'],
-        'names_start_y': pre['names_start_y'],
-        'title1_y': pre['title1_y'], 'title2_y': pre['title2_y'],
-        'oval_y': pre['oval_y'], 'headers_y': pre['headers_y'],
-        'hl': pre.get('header_large', HEADER_LARGE),
-        'hs': pre.get('header_small', HEADER_SMALL),
-        'ds': pre.get('divider_size', LEVEL_DIVIDER_SIZE),
-        'sport': pre.get('sport', DEFAULT_SPORT),
-        'prefix': pre.get('title_prefix', DEFAULT_TITLE_PREFIX),
-        'copyright': pre.get('copyright', DEFAULT_COPYRIGHT),
-        'accent': pre.get('accent_color', RED),
-        'font_bold': pre.get('font_bold', FONT_BOLD),
-        'font_regular': pre.get('font_regular', FONT_REGULAR),
+        'page_groups': pre.page_groups,
+        'data': pre.data,
+        't1l': pre.t1l, 't1s': pre.t1s,
+        't2l': pre.t2l, 't2s': pre.t2s,
+        'lhr': pre.lhr, 'lgap': pre.lgap,
+        'mfill': pre.mfill, 'mfs': pre.mfs, 'mxfs': pre.mxfs,
+        'names_start_y': pre.names_start_y,
+        'title1_y': pre.title1_y, 'title2_y': pre.title2_y,
+        'oval_y': pre.oval_y, 'headers_y': pre.headers_y,
+        'hl': pre.header_large,
+        'hs': pre.header_small,
+        'ds': pre.divider_size,
+        'sport': pre.sport,
+        'prefix': pre.title_prefix,
+        'copyright': pre.copyright,
+        'accent': pre.accent_color,
+        'font_bold': pre.font_bold,
+        'font_regular': pre.font_regular,
     }
 
     _write_idml(output_path, year, state,
-                meet_name=meet_name, db_path=db_path, page_h=_page_h,
+                meet_name=meet_name, db_path=db_file(db_path), page_h=_page_h,
                 page_group_filter=page_group_filter, **style)
 
 
@@ -193,6 +194,7 @@ def _write_idml(output_path, year, state,
         )
         spreads.append(spread_xml)
     else:
+        metrics = LayoutMetrics(data, lhr, lgap, ds, font=font_regular)
         for label, group_levels in page_groups:
             # Filter page groups when generating legal-size subset.
             # Match against both label AND actual levels, because the filter
@@ -300,11 +302,9 @@ def _write_idml(output_path, year, state,
                 ))
 
             # --- Level sections with names ---
-            font_size = fit_font_size(group_levels, data, lhr, lgap, mfill,
-                                        mfs, mxfs,
-                                        names_start_y=names_start_y,
-                                        divider_size=ds,
-                                        page_h=_ph)
+            font_size = metrics.fit_font_size(group_levels, mfill, mfs, mxfs,
+                                              names_start_y=names_start_y,
+                                              page_h=_ph)
             line_height = font_size * lhr
             y = names_start_y
 
@@ -341,7 +341,7 @@ def _write_idml(output_path, year, state,
 
                 # Flanking lines — use actual font metrics instead of approximation
                 line_y_pos = y - ds * 0.35
-                approx_tw = fitz.get_text_length(spaced, fontname=font_bold, fontsize=ds)
+                approx_tw = text_width(spaced, font_bold, ds)
                 gap = 8
                 left_margin = 40
                 right_margin = PAGE_W - 40
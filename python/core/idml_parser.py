@@ -21,6 +21,8 @@ from xml.etree import ElementTree as ET
 
 import fitz  # PyMuPDF
 
+from python.core.name_index import text_rect, write_name_index
+
 PAGE_W = 612
 PAGE_H = 792
 
@@ -516,8 +518,11 @@ def _align_circles_to_text(page, deferred_circles):
 # ---------------------------------------------------------------------------
 
 def _render_spread(doc, spread_xml, stories, colors, zf, para_styles=None,
-                   obj_styles=None):
-    """Parse a Spread XML and render all elements to a new PDF page."""
+                   obj_styles=None, line_rects=None):
+    """Parse a Spread XML and render all elements to a new PDF page.
+
+    line_rects: optional dict, filled as in _draw_text_frame().
+    """
     root = ET.fromstring(spread_xml)
 
     # Find the Spread element
@@ -599,7 +604,7 @@ def _render_spread(doc, spread_xml, stories, colors, zf, para_styles=None,
                     deferred_circles.append((bounds, stroke, stroke_w))
                     continue
             _draw_text_frame(page, child, stories, colors, page_offset,
-                            para_styles, obj_styles)
+                            para_styles, obj_styles, line_rects=line_rects)
 
     # Post-render: center deferred circles on actual Bookman J positions
     _align_circles_to_text(page, deferred_circles)
@@ -860,8 +865,13 @@ def _draw_text_frame_border(page, element, colors, page_offset,
 
 
 def _draw_text_frame(page, element, stories, colors, page_offset,
-                     para_styles=None, obj_styles=None):
-    """Draw a text frame's content, handling rotation and frame styling."""
+                     para_styles=None, obj_styles=None, line_rects=None):
+    """Draw a text frame's content, handling rotation and frame styling.
+
+    line_rects: optional dict; the Rect of each upright, single-run line is
+    appended under its stripped text as {text: [(page_idx, [Rect, ...])]}
+    (the name index format, see name_index.py).
+    """
     story_id = element.get('ParentStory', '')
     story = stories.get(story_id)
     if story is None:
@@ -1038,6 +1048,9 @@ def _draw_text_frame(page, element, stories, colors, page_offset,
                     _insert_text(page, fitz.Point(px, py), seg['text'],
                                  seg['font'], seg['font_file'], seg['size'],
                                  color=color, morph=morph_arg)
+                    if (line_rects is not None and morph_arg is None
+                            and len(para['segments']) == 1):
+                        _record_line_rect(line_rects, page, seg, px, py)
 
                 # Draw underline if flagged
                 if seg.get('underline'):
@@ -1050,6 +1063,23 @@ def _draw_text_frame(page, element, stories, colors, page_offset,
             draw_x += seg_w
 
 
+def _record_line_rect(line_rects, page, seg, px, py):
+    """Add one drawn line to line_rects (see _draw_text_frame())."""
+    text = seg['text']
+    name = text.strip()
+    if not name or '\xad' in name:
+        return  # soft-hyphenated text is left to text search
+    font = _get_font_obj(seg['font'], seg['font_file'])
+    lead = text[:len(text) - len(text.lstrip())]
+    x = px + font.text_length(lead, fontsize=seg['size'])
+    rect = text_rect(name, x, py, font, seg['size'])
+    hits = line_rects.setdefault(name, [])
+    if hits and hits[-1][0] == page.number:
+        hits[-1][1].append(rect)
+    else:
+        hits.append((page.number, [rect]))
+
+
 # ---------------------------------------------------------------------------
 # Text wrapping
 # ---------------------------------------------------------------------------
@@ -1488,9 +1518,13 @@ def _parse_story(story_el, colors, para_styles=None):
 # Public API
 # ---------------------------------------------------------------------------
 
-def idml_to_pdf(idml_path: str, output_pdf_path: str) -> dict:
+def idml_to_pdf(idml_path: str, output_pdf_path: str, name_index: bool = True) -> dict:
     """Convert an IDML file to a PDF.
 
+    With name_index, also writes the PDF's name-position sidecar index (see
+    name_index.py) listing where each upright single-run line of text was
+    drawn, so overlays on the PDF can look names up instead of searching.
+
     Returns dict with metadata if embedded, otherwise empty dict.
     """
     with zipfile.ZipFile(idml_path, 'r') as zf:
@@ -1502,11 +1536,12 @@ def idml_to_pdf(idml_path: str, output_pdf_path: str) -> dict:
         obj_styles = _load_object_styles(zf)
 
         doc = fitz.open()
+        line_rects = {} if name_index else None
         try:
             for spread_file in spread_files:
                 spread_xml = zf.read(spread_file).decode('utf-8')
                 _render_spread(doc, spread_xml, stories, colors, zf, para_styles,
-                               obj_styles)
+                               obj_styles, line_rects=line_rects)
 
             # Capture page dimensions from the first rendered page
             if len(doc) > 0:
@@ -1516,5 +1551,7 @@ def idml_to_pdf(idml_path: str, output_pdf_path: str) -> dict:
             doc.save(output_pdf_path)
         finally:
             doc.close()
+        if name_index:
+            write_name_index(output_pdf_path, line_rects)
 
     return metadata
@@ -4,13 +4,20 @@ Handles all data queries, name cleaning, level grouping, bin-packing,
 and font sizing. Does NOT handle any rendering (no fitz/PyMuPDF imports).
 """
 
+import dataclasses
+import functools
+import hashlib
+import itertools
+import json
 import logging
+import math
+import os
 import re
-import sqlite3
+import tempfile
 
 from python.core.constants import (
     EVENTS as EVENT_KEYS,
-    PAGE_H,
+    PAGE_W, PAGE_H, COL_CENTERS, NAME_SIDE_MARGIN, NAME_GUTTER,
     RED,
     DEFAULT_SPORT, DEFAULT_TITLE_PREFIX, DEFAULT_COPYRIGHT,
     FONT_REGULAR, FONT_BOLD,
@@ -19,6 +26,9 @@ from python.core.constants import (
     LINE_HEIGHT_RATIO, LEVEL_GAP, MAX_PAGE_FILL,
     XCEL_MAP, XCEL_PRESTIGE_ORDER as XCEL_ORDER,
 )
+from python.core.db_connection import connect, db_file, session_cached
+from python.core.font_metrics import font_metrics
+from python.core.models import LayoutParams, PrecomputedShirt
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +58,8 @@ def precompute_shirt_data(db_path: str, meet_name: str, name_sort: str = None,
                           layout=None,
                           level_groups=None, exclude_levels=None,
                           page_h: int = None,
-                          division_order: list[str] | None = None) -> dict:
+                          division_order: list[str] | None = None,
+                          use_cache: bool = True) -> PrecomputedShirt:
     """Pre-compute shirt layout data for reuse across multiple renders.
 
     Args:
@@ -58,8 +69,51 @@ def precompute_shirt_data(db_path: str, meet_name: str, name_sort: str = None,
         exclude_levels: Comma-separated levels to intentionally exclude
             (e.g. "3,4" to drop levels with no real data). Run-time override.
         page_h: Page height override (e.g. legal size). Run-time override.
+        use_cache: Reuse a result stored next to the DB by an earlier call
+            (possibly an earlier process) with the same DB contents and
+            arguments. See precompute_cache_path().
 
-    Returns a dict with levels, data, page_groups, and resolved layout params.
+    Returns a PrecomputedShirt with levels, data, page_groups, and resolved
+    layout params.
+    """
+    args = (db_path, meet_name, name_sort, layout, level_groups, exclude_levels,
+            page_h, division_order)
+    cache_path = precompute_cache_path(db_path) if use_cache else None
+    if cache_path is None:
+        return _compute_shirt_data(*args)
+
+    if name_sort is None and layout:
+        name_sort = layout.name_sort
+    fingerprint = _db_fingerprint(db_path)
+    key = hashlib.sha256(json.dumps({
+        'version': PRECOMPUTE_CACHE_VERSION,
+        'meet_name': meet_name,
+        'name_sort': name_sort or 'age',
+        'layout': layout.to_sticky_dict() if layout else None,
+        'level_groups': level_groups,
+        'exclude_levels': exclude_levels,
+        'page_h': page_h,
+        'division_order': division_order,
+    }, sort_keys=True, default=sorted).encode('utf-8')).hexdigest()
+
+    entries = _read_precompute_cache(cache_path, fingerprint)
+    if key in entries:
+        logger.info("SHIRT_CACHE: reusing precomputed layout from %s", cache_path)
+        return PrecomputedShirt.from_dict(json.loads(entries[key]))
+
+    pre = _compute_shirt_data(*args)
+    entries[key] = json.dumps(pre.to_dict(), separators=(',', ':'))
+    _write_precompute_cache(cache_path, fingerprint, entries)
+    return pre
+
+
+def _compute_shirt_data(db_path, meet_name, name_sort, layout, level_groups,
+                        exclude_levels, page_h, division_order,
+                        winners=None) -> PrecomputedShirt:
+    """precompute_shirt_data() without the on-disk cache.
+
+    winners: an already fetched get_winners_by_event_and_level() result for
+        this name_sort, reused instead of querying (see evaluate_layouts()).
     """
     # Extract values from layout object when provided, else use defaults
     if layout:
@@ -129,9 +183,14 @@ def precompute_shirt_data(db_path: str, meet_name: str, name_sort: str = None,
     # Compute Y positions from title sizes
     title1_y, title2_y, oval_y, headers_y, names_start = compute_layout(t1l, t2l)
 
-    levels, data, _flagged, _modified = get_winners_by_event_and_level(
-        db_path, meet_name, name_sort=name_sort,
-        explicit_division_order=division_order)
+    if winners is None:
+        levels, data, _flagged, _modified = get_winners_by_event_and_level(
+            db_path, meet_name, name_sort=name_sort,
+            explicit_division_order=division_order)
+    else:
+        levels, data, _flagged, _modified = winners
+        levels = list(levels)
+        data = {event: dict(by_level) for event, by_level in data.items()}
 
     # Diagnostic: log all levels found and their athlete counts
     _diag_counts = {}
@@ -162,21 +221,19 @@ def precompute_shirt_data(db_path: str, meet_name: str, name_sort: str = None,
     _page_h = page_h or PAGE_H
     _names_bottom = _page_h - 18
 
-    empty_result = {
-        'levels': [], 'data': {}, 'page_groups': [],
+    params = {
         'lhr': lhr, 'lgap': lgap, 'mfill': mfill, 'mfs': mfs, 'mxfs': mxfs,
         't1l': t1l, 't1s': t1s, 't2l': t2l, 't2s': t2s,
         'title1_y': title1_y, 'title2_y': title2_y,
         'oval_y': oval_y, 'headers_y': headers_y,
         'names_start_y': names_start,
         'page_h': _page_h,
-        'flagged_names': [], 'modified_names': [],
         'division_order': division_order,
         **style,
     }
 
     if not levels:
-        return empty_result
+        return PrecomputedShirt(levels=(), data={}, page_groups=(), **params)
 
     # Classify levels into Xcel and numbered
     xcel_levels = []
@@ -200,71 +257,263 @@ def precompute_shirt_data(db_path: str, meet_name: str, name_sort: str = None,
         level_set = set(levels)
         logger.debug("SHIRT_DIAG: using custom level_groups=%r, level_set=%s", level_groups, level_set)
         page_groups = parse_level_groups(level_groups, level_set)
+        page_frontier = []
         logger.debug("SHIRT_DIAG: parsed page_groups: %s", [(label, lvs) for label, lvs in page_groups])
     else:
-        # Auto bin-packing
+        # Auto bin-packing; a level with a name too wide for its column at
+        # the max size is packed at the size it will actually be drawn at
+        width_metrics = LayoutMetrics(data, lhr, lgap, ds, font=f_reg)
+        caps = {lv: width_metrics.size_cap([lv]) for lv in levels}
         page_groups = []
         if xcel_levels:
             xcel_groups = bin_pack_levels(xcel_levels, data, available,
-                                          lhr, lgap, mxfs, divider_size=ds)
+                                          lhr, lgap, mxfs, divider_size=ds,
+                                          size_caps=caps)
             for group in xcel_groups:
                 page_groups.append(('XCEL', group))
 
         if numbered_levels:
             groups = bin_pack_levels(numbered_levels, data, available,
-                                     lhr, lgap, mxfs, divider_size=ds)
+                                     lhr, lgap, mxfs, divider_size=ds,
+                                     size_caps=caps)
             for group in groups:
                 page_groups.append(label_numbered_group(group))
 
-        # If max_shirt_pages is set and we have too many pages, try shrinking
-        # the bin-pack font estimate to merge groups. Uses multi-resolution
-        # search (1.0 -> 0.5 -> 0.2 -> 0.1) for efficiency.
+        # Largest name size at which the levels fit on each page count (on
+        # the 0.1pt grid between min and max size), so a page budget is met
+        # with one packing instead of a size sweep. The grid size is kept
+        # strictly below the frontier (by 1e-9) so float rounding in the
+        # packer's height sums can never put it over a page.
+        def _grid_size(size):
+            top = min(size - 1e-9, mxfs)
+            steps = math.floor((top - mfs) / 0.1 + 1e-6)
+            if round(mfs + steps * 0.1, 1) > top:
+                steps -= 1
+            return round(mfs + steps * 0.1, 1) if steps >= 0 else None
+
+        max_sizes = shirt_page_frontier(
+            [xcel_levels, numbered_levels], data, available, lhr, lgap,
+            divider_size=ds, max_pages=len(page_groups))
+        page_frontier = [(p, _grid_size(size) if size else None)
+                         for p, size in enumerate(max_sizes, start=1)]
+
         if max_shirt_pages and len(page_groups) > max_shirt_pages:
             def _groups_at_size(try_size):
                 new_groups = []
                 if xcel_levels:
                     for g in bin_pack_levels(xcel_levels, data, available,
                                              lhr, lgap, try_size,
-                                             divider_size=ds):
+                                             divider_size=ds, size_caps=caps):
                         new_groups.append(('XCEL', g))
                 if numbered_levels:
                     for g in bin_pack_levels(numbered_levels, data, available,
                                              lhr, lgap, try_size,
-                                             divider_size=ds):
+                                             divider_size=ds, size_caps=caps):
                         new_groups.append(label_numbered_group(g))
                 return new_groups
 
-            best_size = mfs
-            best_groups = _groups_at_size(mfs)
+            # Below the minimum size the budget can't be met; use the minimum
+            page_groups = _groups_at_size(page_frontier[max_shirt_pages - 1][1] or mfs)
+    logger.info("SHIRT_DIAG: final page_groups (%d pages): %s",
+                len(page_groups), [(label, len(lvs)) for label, lvs in page_groups])
 
-            for step in [1.0, 0.5, 0.2, 0.1]:
-                candidate = best_size + step
-                while candidate <= mxfs + 0.001:
-                    candidate_groups = _groups_at_size(candidate)
-                    if len(candidate_groups) <= max_shirt_pages:
-                        best_size = candidate
-                        best_groups = candidate_groups
-                        candidate += step
-                    else:
-                        break
+    return PrecomputedShirt(levels=levels, data=data, page_groups=page_groups,
+                            flagged_names=_flagged, modified_names=_modified,
+                            page_frontier=page_frontier, **params)
 
-            page_groups = best_groups
 
-    logger.info("SHIRT_DIAG: final page_groups (%d pages): %s",
-                len(page_groups), [(label, len(lvs)) for label, lvs in page_groups])
+# --- Layout what-if evaluation ---
+# Scores candidate layouts from one winners fetch, without rendering, so the
+# agent can compare spacing / font / grouping choices before regenerating.
+
+_CANDIDATE_RUN_ARGS = ('level_groups', 'exclude_levels')
 
-    return {'levels': levels, 'data': data, 'page_groups': page_groups,
-            'lhr': lhr, 'lgap': lgap, 'mfill': mfill,
-            'mfs': mfs, 'mxfs': mxfs,
-            't1l': t1l, 't1s': t1s, 't2l': t2l, 't2s': t2s,
-            'title1_y': title1_y, 'title2_y': title2_y,
-            'oval_y': oval_y, 'headers_y': headers_y,
-            'names_start_y': names_start,
-            'page_h': _page_h,
-            'flagged_names': _flagged,
-            'modified_names': _modified,
-            'division_order': division_order,
-            **style}
+
+def expand_layout_grid(grid: dict) -> list[dict]:
+    """Expand {field: [values...]} into one candidate per combination.
+
+    Scalar values are held fixed. E.g. {"line_spacing": [1.1, 1.2],
+    "max_fill": [0.85, 0.9]} gives four candidates.
+    """
+    fields = list(grid)
+    choices = [v if isinstance(v, list) else [v] for v in grid.values()]
+    return [dict(zip(fields, combo)) for combo in itertools.product(*choices)]
+
+
+def layout_report(pre: PrecomputedShirt) -> dict:
+    """Page count, per-page name size and fill, and overflow warnings for a
+    precompute_shirt_data() result.
+
+    fill is the share of the name area (below the column headers) the page
+    uses at its name size; pages are fitted up to mfill of it. width_cap is
+    the largest size at which the page's longest names fit their columns
+    (None when any size does).
+    """
+    metrics = LayoutMetrics(pre.data, pre.lhr, pre.lgap, pre.divider_size,
+                            font=pre.font_regular)
+    area = pre.page_h - 18 - pre.names_start_y
+    available = area * pre.mfill
+    pages, warnings = [], []
+    for label, group_levels in pre.page_groups:
+        size = metrics.fit_font_size(group_levels, pre.mfill, pre.mfs, pre.mxfs,
+                                     names_start_y=pre.names_start_y, page_h=pre.page_h)
+        fixed, rows = metrics.group_metrics(group_levels)
+        height = fixed + rows * size * pre.lhr
+        cap = metrics.size_cap(group_levels)
+        pages.append({'label': label, 'levels': list(group_levels),
+                      'name_size': size, 'fill': round(height / area, 3),
+                      'width_cap': round(cap, 2) if cap != math.inf else None})
+        if height > available + 1e-6:
+            warnings.append(f"OVERFLOW: {label} needs {height:.0f}pt at the minimum "
+                            f"name size {size}pt, only {available:.0f}pt available")
+        for name, event, lv, width, limit in metrics.overflowing_names(group_levels, size):
+            warnings.append(f'NAME_TOO_WIDE: L{lv} {event}: "{name}" is {width}pt at '
+                            f'{size}pt, column holds {limit:.0f}pt')
+    if pre.levels and not pages:
+        warnings.append("NO_PAGES: level_groups matched none of the meet's levels")
+    return {'pages': len(pages),
+            'smallest_name_size': min((p['name_size'] for p in pages), default=None),
+            'page_list': pages,
+            'warnings': warnings}
+
+
+def wide_names(pre: PrecomputedShirt) -> list[tuple[str, str, str, float, float]]:
+    """Names still wider than their column at their page's fitted size
+    (only possible at the minimum size), as LayoutMetrics.overflowing_names().
+    """
+    metrics = LayoutMetrics(pre.data, pre.lhr, pre.lgap, pre.divider_size,
+                            font=pre.font_regular)
+    found = []
+    for _label, group_levels in pre.page_groups:
+        size = metrics.fit_font_size(group_levels, pre.mfill, pre.mfs, pre.mxfs,
+                                     names_start_y=pre.names_start_y, page_h=pre.page_h)
+        found.extend(metrics.overflowing_names(group_levels, size))
+    return found
+
+
+def evaluate_layouts(db_path: str, meet_name: str, candidates: list,
+                     base_layout: LayoutParams = None,
+                     level_groups=None, exclude_levels=None,
+                     page_h: int = None,
+                     division_order: list[str] | None = None) -> list[dict]:
+    """Score many candidate layouts without rendering any PDF.
+
+    Winners are fetched once (per name_sort) and every candidate is laid out
+    from them exactly as precompute_shirt_data() would lay it out.
+
+    Args:
+        candidates: LayoutParams objects, or dicts of LayoutParams sticky
+            fields plus optional 'level_groups' / 'exclude_levels'. Dict
+            fields override base_layout, level_groups and exclude_levels.
+
+    Returns one layout_report() dict per candidate, in order, with the
+    candidate echoed under 'candidate'.
+
+    Raises:
+        ValueError: if a candidate dict has a field that is neither a sticky
+            layout field nor a run argument.
+    """
+    winners = {}  # name_sort -> get_winners_by_event_and_level() result
+    reports = []
+    for cand in candidates:
+        run = {'level_groups': level_groups, 'exclude_levels': exclude_levels}
+        if isinstance(cand, LayoutParams):
+            layout = cand
+            echo = cand.to_sticky_dict()
+        else:
+            unknown = set(cand) - LayoutParams.STICKY_FIELDS - set(_CANDIDATE_RUN_ARGS)
+            if unknown:
+                raise ValueError(f"Unknown layout candidate field(s): {', '.join(sorted(unknown))}")
+            layout = dataclasses.replace(
+                base_layout or LayoutParams(),
+                **{k: v for k, v in cand.items() if k in LayoutParams.STICKY_FIELDS})
+            run.update({k: cand[k] for k in _CANDIDATE_RUN_ARGS if k in cand})
+            echo = dict(cand)
+
+        name_sort = layout.name_sort or 'age'
+        if name_sort not in winners:
+            winners[name_sort] = get_winners_by_event_and_level(
+                db_path, meet_name, name_sort=name_sort,
+                explicit_division_order=division_order)
+        pre = _compute_shirt_data(db_path, meet_name, name_sort, layout,
+                                  run['level_groups'], run['exclude_levels'],
+                                  page_h, division_order, winners=winners[name_sort])
+
+        report = {'candidate': echo, **layout_report(pre)}
+        budget = layout.max_shirt_pages
+        if budget and report['pages'] > budget and not run['level_groups']:
+            report['warnings'].append(
+                f"MAX_PAGES: needs {report['pages']} pages even at the minimum "
+                f"name size, max_shirt_pages is {budget}")
+        reports.append(report)
+    return reports
+
+
+# --- Cross-process precompute cache ---
+# process_meet.py --regenerate starts a fresh interpreter every time the
+# agent tweaks a setting (often just a date). precompute_shirt_data() results
+# are kept in a JSON file next to the DB, keyed by every argument that shapes
+# the layout and tagged with a fingerprint of the DB file, so repeat runs
+# skip the winner query, sorting and bin-packing. Any write to the DB changes
+# the fingerprint and drops every stored entry.
+
+PRECOMPUTE_CACHE_VERSION = 5   # bump whenever precompute output changes
+PRECOMPUTE_CACHE_ENTRIES = 16  # argument combinations kept per DB
+
+
+def precompute_cache_path(db_path) -> str | None:
+    """Cache file for db_path, or None when db_path is not a file on disk."""
+    path = db_file(db_path)
+    if path == ':memory:' or not os.path.isfile(path):
+        return None
+    return path + '.precompute.json'
+
+
+@session_cached
+def _db_fingerprint(db_path) -> str:
+    """Identify the DB file's current contents without reading all of it.
+
+    Combines the file's size and mtime with its 100-byte SQLite header, whose
+    file change counter SQLite bumps on every committed write, plus the same
+    stat of the -wal file (WAL-mode commits go there, not the main file).
+    """
+    path = db_file(db_path)
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (path, path + '-wal'):
+        if os.path.exists(part):
+            st = os.stat(part)
+            digest.update(f'{part}:{st.st_size}:{st.st_mtime_ns};'.encode('utf-8'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(100))
+    return digest.hexdigest()
+
+
+def _read_precompute_cache(cache_path: str, fingerprint: str) -> dict:
+    """Entries {key: JSON} stored for this DB fingerprint ({} if none/unreadable)."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if stored.get('fingerprint') != fingerprint:
+        return {}
+    return stored.get('entries', {})
+
+
+def _write_precompute_cache(cache_path: str, fingerprint: str, entries: dict):
+    """Atomically replace the cache file; failures only cost a cache miss."""
+    entries = dict(list(entries.items())[-PRECOMPUTE_CACHE_ENTRIES:])
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix='.json', dir=os.path.dirname(cache_path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'entries': entries}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("SHIRT_CACHE: could not write %s: %s", cache_path, e)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def label_numbered_group(group: list) -> tuple[str, list]:
@@ -383,23 +632,45 @@ _DASH_EVENT_PATTERN = re.compile(
     rf'\s*-\s*{_EVENT_CODES}(?:[,\s]+{_EVENT_CODES})*\s*$', re.IGNORECASE)
 
 
+_PARENTHETICAL_RE = re.compile(r'\s*\([^)]*\)\s*')
+_CURLY_QUOTE_RE = re.compile(r'\s*[\u201c][^\u201d]*[\u201d]')
+
+
+@functools.lru_cache(maxsize=65536)
 def clean_name_for_shirt(name: str) -> str:
     """Clean a name for display on the championship shirt.
 
     Event code stripping is already handled by clean_athlete_name() in db_builder
     at data entry time. This function handles remaining display concerns:
     parenthetical annotations, pronunciation guides, and curly quotes.
+    Memoized, since the same winner is cleaned once per event and per output.
     """
     from .db_builder import clean_athlete_name
     # First pass: strip any event codes that survived (defense-in-depth)
     cleaned = clean_athlete_name(name)
     # Remove any remaining parenthetical content: "Name (Ah-nee-uh)" -> "Name"
-    cleaned = re.sub(r'\s*\([^)]*\)\s*', '', cleaned)
+    if '(' in cleaned:
+        cleaned = _PARENTHETICAL_RE.sub('', cleaned)
     # Remove curly-quote pronunciation: "Name\u201cpronunciation\u201d" -> "Name"
-    cleaned = re.sub(r'\s*[\u201c][^\u201d]*[\u201d]', '', cleaned)
+    if '\u201c' in cleaned:
+        cleaned = _CURLY_QUOTE_RE.sub('', cleaned)
     return cleaned.strip()
 
 
+def stored_display_name(name: str, display_name: str | None) -> str:
+    """Shirt name for a row: its display_name column, computed at build time.
+
+    display_name is NULL on rows whose name was edited after the build (a
+    trigger resets it) or on databases upgraded in place; those are cleaned
+    here instead.
+    """
+    return display_name if display_name is not None else clean_name_for_shirt(name)
+
+
+_DIGIT_RE = re.compile(r'\d')
+_EVENT_KEYWORD_RE = re.compile(r'\b(?:IES|spec|vault|bars|beam|floor)\b', re.IGNORECASE)
+
+
 def flag_suspicious_name(name: str) -> str:
     """Check if a cleaned name still looks suspicious. Returns a reason
     string if suspicious, or empty string if it looks normal.
@@ -410,7 +681,7 @@ def flag_suspicious_name(name: str) -> str:
     if ' ' not in name.strip():
         return 'single word (missing first or last name?)'
     # Contains digits (might have scores or numbers appended)
-    if re.search(r'\d', name):
+    if _DIGIT_RE.search(name):
         return 'contains digits (score or number in name?)'
     # Very long name (>35 chars might have extra data)
     if len(name) > 40:
@@ -420,11 +691,12 @@ def flag_suspicious_name(name: str) -> str:
     if len(last_word) <= 3 and last_word.isupper() and last_word not in ('II', 'III', 'IV', 'Jr', 'JR', 'SR'):
         return f'ends with "{last_word}" (event code?)'
     # Contains common event/score patterns we might have missed
-    if re.search(r'\b(?:IES|spec|vault|bars|beam|floor)\b', name, re.IGNORECASE):
+    if _EVENT_KEYWORD_RE.search(name):
         return 'contains event keyword'
     return ''
 
 
+@session_cached
 def get_winners_by_event_and_level(db_path: str, meet_name: str,
                                    name_sort: str = 'age',
                                    explicit_division_order: list[str] | None = None) -> tuple[list, dict, list, list]:
@@ -440,12 +712,14 @@ def get_winners_by_event_and_level(db_path: str, meet_name: str,
     """
     from python.core.division_detector import detect_division_order
 
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
         flagged = []   # (cleaned_name, raw_name, event, level, reason)
         modified = []  # (raw_name, cleaned_name, event, level)
 
+        # Levels in the order SQLite lists them (the order shirt pages fall
+        # back to for levels that are neither numeric nor Xcel)
         cur.execute('''SELECT DISTINCT level FROM winners
                        WHERE meet_name = ?''', (meet_name,))
         levels = [row[0] for row in cur.fetchall()]
@@ -473,46 +747,48 @@ def get_winners_by_event_and_level(db_path: str, meet_name: str,
                     f"All divisions in the data must be included in division_order."
                 )
 
-        # Build score lookups keyed by (name, level, session) for tie-breaking.
-        # Tie-breaking only applies within the same division+session.
-        aa_scores = {}          # (name, level, session) -> AA score
-        event_scores = {}       # (name, level, session) -> sorted [highest, next, ...] event scores
-        try:
-            cur.execute('''SELECT name, level, session, vault, bars, beam, floor, aa FROM results
-                           WHERE meet_name = ?''',
-                        (meet_name,))
-            for name, level, session, vault, bars, beam, floor, aa in cur.fetchall():
-                key = (name, level, session)
-                # AA score for event tie-breaking
-                if aa and aa > 0:
-                    if key not in aa_scores or aa > aa_scores[key]:
-                        aa_scores[key] = aa
-                # Individual event scores sorted descending for AA tie-breaking
-                # Rule: AA ties broken by highest single event score, then next highest, etc.
-                scores = sorted(
-                    [s for s in (vault, bars, beam, floor) if s and s > 0],
-                    reverse=True
-                )
-                event_scores[key] = scores
-        except Exception:
-            pass  # results table may not exist or have different schema
-
-        # Helper to parse session as int for sorting (fall back to string)
-        def _session_sort_key(s):
-            try:
-                return (0, int(s))
-            except (ValueError, TypeError):
-                return (1, s or '')
+        # Every winner of the meet in one round trip, grouped by event+level
+        # and already in shirt order: 'alpha' by name; 'age' by division age
+        # (div_order, passed in as a CASE), then the session/AA/event-score
+        # tie-break build_database stores in winners.sort_key, then name.
+        # Duplicate rows (same athlete under two gyms) keep the first seen.
+        if name_sort == 'alpha':
+            order_sql, order_params = 'name, id', []
+        else:
+            rank_sql = ' '.join('WHEN ? THEN ?' for _ in div_order)
+            rank_sql = f'CASE division {rank_sql} ELSE 99 END' if div_order else '99'
+            order_sql = f'{rank_sql}, sort_key, name, id'
+            order_params = [v for item in div_order.items() for v in item]
+        cur.execute(f'''SELECT event, level, name, division, session, display_name,
+                               suspicious_reason, sort_key, id
+                        FROM winners WHERE meet_name = ?
+                        ORDER BY event, level, {order_sql}''', [meet_name] + order_params)
+        groups = {}  # (event, level) -> {(name, division, session): id}
+        stored = {}  # name -> (display_name, reason) from a row that has them
+        missing_keys = False
+        for (event, level, name, division, session,
+             display_name, reason, sort_key, wid) in cur.fetchall():
+            missing_keys = missing_keys or sort_key is None
+            if level is not None:  # a NULL level never matched "level = ?"
+                groups.setdefault((event, level), {}).setdefault((name, division, session), wid)
+            if display_name is not None:
+                stored.setdefault(name, (display_name, reason))
+
+        sort_keys = None
+        if missing_keys and name_sort != 'alpha':
+            # Built before winners.sort_key existed (see db_builder.upgrade_schema)
+            from python.core.db_builder import compute_winner_sort_keys
+            logger.warning("SORT_KEY_MISSING: winners for %r have no stored sort_key; "
+                           "computing shirt order in memory", meet_name)
+            sort_keys = compute_winner_sort_keys(cur, meet_name)
 
         data = {}
         for event in EVENT_KEYS:
             data[event] = {}
             for level in levels:
-                # Get names with their division AND session for sorting
-                cur.execute('''SELECT DISTINCT name, division, session FROM winners
-                              WHERE meet_name = ? AND event = ? AND level = ?''',
-                            (meet_name, event, level))
-                rows = cur.fetchall()
+                # Names with their division AND session, in shirt order
+                group = groups.get((event, level), {})
+                rows = list(group)
                 if rows:
                     # Safety net: log divisions not found in div_order
                     _row_divs = {r[1] for r in rows if r[1]}
@@ -522,9 +798,7 @@ def get_winners_by_event_and_level(db_path: str, meet_name: str,
                                      "not in div_order: %s",
                                      level, event, len(_unmatched), _unmatched)
 
-                    if name_sort == 'alpha':
-                        rows.sort(key=lambda r: r[0])
-                    else:
+                    if name_sort != 'alpha':
                         # Warn if any athletes in this batch have no division assigned
                         _null_div_rows = [r for r in rows if r[1] is None]
                         if _null_div_rows:
@@ -534,27 +808,9 @@ def get_winners_by_event_and_level(db_path: str, meet_name: str,
                                 "They will be sorted to the end.",
                                 level, event, len(_null_div_rows)
                             )
-                        # Sort by: 1) division age (youngest first),
-                        #          2) session ascending,
-                        #          3) for event ties: AA score descending,
-                        #          4) for AA ties: highest individual event score descending,
-                        #             then next highest, etc.
-                        #          5) name alphabetically
-                        def _tiebreak_key(r):
-                            key = (r[0], level, r[2])
-                            aa = aa_scores.get(key, -1)
-                            # Negate individual event scores for descending sort
-                            # Pad to 4 elements so tuples are always comparable
-                            scores = event_scores.get(key, [])
-                            neg_scores = tuple(-s for s in scores) + (0, 0, 0, 0)
-                            return (
-                                div_order.get(r[1], 99),
-                                _session_sort_key(r[2]),
-                                -aa,
-                                neg_scores[:4],
-                                r[0]
-                            )
-                        rows.sort(key=_tiebreak_key)
+                        if sort_keys is not None:
+                            rows.sort(key=lambda r: (div_order.get(r[1], 99),
+                                                     sort_keys[group[r]], r[0], group[r]))
                     # Clean names for shirt display (strip parenthetical annotations).
                     # When two different raw names clean to the same string, keep
                     # both by appending a counter: first collision gets (2), next (3), etc.
@@ -562,13 +818,14 @@ def get_winners_by_event_and_level(db_path: str, meet_name: str,
                     clean_names = []
                     for r in rows:
                         raw = r[0]
-                        cleaned = clean_name_for_shirt(raw)
+                        display_name, stored_reason = stored.get(raw, (None, None))
+                        cleaned = stored_display_name(raw, display_name)
                         if not cleaned:
                             continue
                         if cleaned not in seen:
                             seen[cleaned] = 1
                             clean_names.append(cleaned)
-                            reason = flag_suspicious_name(cleaned)
+                            reason = stored_reason if display_name is not None else flag_suspicious_name(cleaned)
                             if reason:
                                 flagged.append((cleaned, raw, event, level, reason))
                             elif cleaned != raw.strip():
@@ -608,88 +865,284 @@ def bin_pack_levels(levels: list, data: dict, available_height: float,
                     line_height_ratio: float = LINE_HEIGHT_RATIO,
                     level_gap: float = LEVEL_GAP,
                     max_font_size: float = DEFAULT_NAME_SIZE,
-                    divider_size: float = None) -> list:
-    """Bin-pack levels into page-sized groups with balanced distribution.
-
-    Two-pass approach:
-    1. Greedy pack to find the actual minimum page count (accounts for
-       large levels that can't combine with others).
-    2. Balanced redistribution targeting equal height per page, so the
-       last page isn't nearly empty.
+                    divider_size: float = None,
+                    size_caps: dict = None) -> list:
+    """Split levels into page-sized groups, keeping their order.
+
+    Since level order is fixed this is a linear partition, solved exactly
+    by partition_heights() on the per-level heights at max_font_size:
+    fewest pages first, then the shortest possible tallest page, then the
+    most even split.
+
+    size_caps: optional {level: largest size its names fit their columns at}
+        (LayoutMetrics.size_cap). A level is measured at its cap when that is
+        below max_font_size, since its page can't be drawn any larger.
     """
-    line_height = max_font_size * line_height_ratio
+    caps = size_caps or {}
+    sizes = [min(max_font_size, caps.get(lv, max_font_size)) for lv in levels]
+    heights = [level_height(lv, data, size * line_height_ratio, level_gap, divider_size=divider_size)
+               for lv, size in zip(levels, sizes)]
+    if sum(heights) <= available_height:
+        return [levels]
+    return [levels[start:end] for start, end in partition_heights(heights, available_height)]
 
-    # Calculate height for each level
-    heights = []
-    for lv in levels:
-        h = level_height(lv, data, line_height, level_gap, divider_size=divider_size)
-        heights.append(h)
 
-    total = sum(heights)
-    if total <= available_height:
-        return [levels]
+def partition_heights(heights: list[float], capacity: float) -> list[tuple[int, int]]:
+    """Optimal contiguous split of heights into pages, as (start, end) slices.
 
-    # Pass 1: greedy pack to find actual page count
-    greedy_pages = []
-    current = []
-    current_h = 0
-    for i, lv in enumerate(levels):
-        h = heights[i]
-        if current and current_h + h > available_height:
-            greedy_pages.append(current)
-            current = [lv]
-            current_h = h
-        else:
-            current.append(lv)
-            current_h += h
-    if current:
-        greedy_pages.append(current)
-
-    num_pages = len(greedy_pages)
-    if num_pages <= 1:
-        return greedy_pages
-
-    # Pass 2: balanced redistribution
-    target = total / num_pages
-
-    balanced_pages = []
-    current = []
-    current_h = 0
-    remaining_pages = num_pages
-
-    for i, lv in enumerate(levels):
-        h = heights[i]
-        remaining_levels = len(levels) - i
-
-        if current and remaining_pages > 1:
-            over_target = current_h >= target * 0.85
-            would_overflow = current_h + h > available_height
-            enough_left = remaining_levels >= remaining_pages
-            if (over_target and enough_left) or would_overflow:
-                balanced_pages.append(current)
-                current = []
-                current_h = 0
-                remaining_pages -= 1
-
-        current.append(lv)
-        current_h += h
-
-    if current:
-        balanced_pages.append(current)
-
-    # Safety check: balanced pass must produce exactly num_pages groups.
-    # If it produces fewer (e.g. due to edge cases in remaining_pages logic),
-    # the data is still all present but pages are under-utilized. Fall back to
-    # the greedy result which is always correct.
-    if len(balanced_pages) != num_pages:
-        logger.warning(
-            "BIN_PACK: balanced redistribution produced %d groups (expected %d). "
-            "Falling back to greedy packing.",
-            len(balanced_pages), num_pages
-        )
-        return greedy_pages
-
-    return balanced_pages
+    A page fits when its total height is at most capacity; a single item
+    taller than capacity gets a page of its own. Among all splits this
+    returns, in order of priority:
+      1. the fewest pages (found greedily, which is optimal for this);
+      2. the smallest tallest page, i.e. the largest font the tightest page
+         can use;
+      3. the most even pages (least sum of squared page heights).
+    Steps 2 and 3 are dynamic programs over prefix sums, O(n^2 * pages).
+    """
+    n = len(heights)
+    if n == 0:
+        return []
+    prefix = [0.0]
+    for h in heights:
+        prefix.append(prefix[-1] + h)
+
+    def fits(j, i):
+        return i - j == 1 or prefix[i] - prefix[j] <= capacity
+
+    # 1. Fewest pages: close a page only when the next level would not fit
+    num_pages, start = 1, 0
+    for i in range(1, n):
+        if not fits(start, i + 1):
+            num_pages += 1
+            start = i
+
+    inf = float('inf')
+
+    def solve(cost, combine, allowed):
+        """best[p][i]: cost of levels[:i] on p pages; returns the split."""
+        best = [[inf] * (n + 1) for _ in range(num_pages + 1)]
+        cut = [[0] * (n + 1) for _ in range(num_pages + 1)]
+        best[0][0] = 0.0
+        for p in range(1, num_pages + 1):
+            for i in range(p, n - num_pages + p + 1):
+                for j in range(p - 1, i):
+                    if best[p - 1][j] == inf or not allowed(j, i):
+                        continue
+                    c = combine(best[p - 1][j], cost(j, i))
+                    if c < best[p][i]:
+                        best[p][i], cut[p][i] = c, j
+        pages, i = [], n
+        for p in range(num_pages, 0, -1):
+            pages.append((cut[p][i], i))
+            i = cut[p][i]
+        return best[num_pages][n], pages[::-1]
+
+    def page_h(j, i):
+        return prefix[i] - prefix[j]
+
+    # 2. Smallest tallest page
+    tallest, pages = solve(page_h, max, fits)
+    # 3. Most even split that keeps every page within that height
+    _, pages = solve(lambda j, i: page_h(j, i) ** 2, lambda a, b: a + b,
+                     lambda j, i: fits(j, i) and page_h(j, i) <= tallest + 1e-9)
+    return pages
+
+
+def shirt_page_frontier(level_lists: list[list], data: dict, available_height: float,
+                        line_height_ratio: float = LINE_HEIGHT_RATIO,
+                        level_gap: float = LEVEL_GAP,
+                        divider_size: float = None,
+                        max_pages: int = 1) -> list[float | None]:
+    """Largest name size at which the shirt fits on 1..max_pages pages.
+
+    level_lists are packed separately (Xcel and numbered levels never share
+    a page) at one common size, as precompute_shirt_data does. Each level's
+    height is linear in the name size s (fixed part + names * s * ratio), so
+    a page of levels j..i fits for s <= (available - fixed) / slope, and the
+    largest size that fits on p pages is a max-min linear partition solved
+    by dynamic programming, O(L^2 * P) per list.
+
+    Returns the sizes for p = 1..max_pages (index p - 1): None when no
+    size fits on p pages, inf when any size does.
+    """
+    inf = float('inf')
+    ratio = line_height_ratio
+
+    def list_frontier(levels):
+        # best[p]: largest size at which levels fit on at most p pages
+        fixed = [level_height(lv, data, 0.0, level_gap, divider_size=divider_size)
+                 for lv in levels]
+        slope = [level_height(lv, data, ratio, level_gap, divider_size=divider_size) - f
+                 for lv, f in zip(levels, fixed)]
+        n = len(levels)
+        fp, sp = [0.0], [0.0]
+        for f, sl in zip(fixed, slope):
+            fp.append(fp[-1] + f)
+            sp.append(sp[-1] + sl)
+
+        def limit(j, i):
+            if i - j == 1:
+                return inf  # a lone level always gets its own page
+            room = available_height - (fp[i] - fp[j])
+            if sp[i] - sp[j] <= 0:
+                return inf if room >= 0 else -inf
+            return room / (sp[i] - sp[j])
+
+        best = [[-inf] * (n + 1) for _ in range(max_pages + 1)]
+        best[0][0] = inf
+        for p in range(1, max_pages + 1):
+            for i in range(1, n + 1):
+                best[p][i] = max(best[p - 1][i],
+                                 max(min(best[p - 1][j], limit(j, i)) for j in range(i)))
+        return [best[p][n] for p in range(max_pages + 1)]
+
+    frontiers = [list_frontier(levels) for levels in level_lists if levels]
+    # Combine lists: spend the page budget where it raises the common size most
+    combined = [inf] + [-inf] * max_pages
+    for fr in frontiers:
+        combined = [max((min(combined[p - k], fr[k]) for k in range(1, p + 1)), default=-inf)
+                    for p in range(max_pages + 1)]
+    return [size if size > 0 else None for size in combined[1:]]
+
+
+def column_width_limits(col_centers=COL_CENTERS, page_w: float = PAGE_W) -> list[float]:
+    """Widest name (pt) each column holds, centered on its column.
+
+    A name may reach halfway to the neighbouring column (less NAME_GUTTER),
+    and the outer columns stop NAME_SIDE_MARGIN from the page edge.
+    """
+    limits = []
+    for i, cx in enumerate(col_centers):
+        left = (cx - col_centers[i - 1]) / 2 if i > 0 else cx - NAME_SIDE_MARGIN
+        right = ((col_centers[i + 1] - cx) / 2 if i + 1 < len(col_centers)
+                 else page_w - NAME_SIDE_MARGIN - cx)
+        limits.append(float(2 * min(left, right) - NAME_GUTTER))
+    return limits
+
+
+class LayoutMetrics:
+    """Row counts and height constants for fitting names from one data dict.
+
+    A page's name area height is linear in the name size:
+    fixed (gap + divider + 1pt per level) + rows * size * line_height_ratio,
+    where rows sums each level's longest event column. Both parts are cached
+    per page group, so the largest size that fits is solved directly and
+    memoized; renderers that draw the same page group many times (gym
+    highlights draw it once per gym) share one instance.
+
+    With a font, the size is also capped so every name fits its column
+    width (column_width_limits()). All names are measured once, in one
+    font_metrics() batch, the first time a cap is needed.
+    """
+
+    def __init__(self, data: dict,
+                 line_height_ratio: float = LINE_HEIGHT_RATIO,
+                 level_gap: float = LEVEL_GAP,
+                 divider_size: float = None,
+                 font: str = None):
+        self.data = data
+        self.line_height_ratio = line_height_ratio
+        self.level_gap = level_gap
+        self.divider_size = divider_size if divider_size is not None else LEVEL_DIVIDER_SIZE
+        self.font = font
+        self._groups = {}
+        self._fits = {}
+        self._widths = None
+        self._caps = {}
+
+    def group_metrics(self, levels) -> tuple[float, int]:
+        """(fixed height, name rows) for a page of levels."""
+        key = tuple(levels)
+        if key not in self._groups:
+            fixed = len(key) * (self.level_gap + self.divider_size * 1.3 + 1)
+            rows = sum(max(len(self.data[event].get(lv, [])) for event in EVENT_KEYS)
+                       for lv in key)
+            self._groups[key] = (fixed, rows)
+        return self._groups[key]
+
+    def name_widths(self) -> dict[str, float]:
+        """Width at 1pt of every name in data, in the metrics' font."""
+        if self._widths is None:
+            names = list({name for by_level in self.data.values()
+                          for names in by_level.values() for name in names})
+            self._widths = dict(zip(names, font_metrics(self.font).text_widths(names)))
+        return self._widths
+
+    def size_cap(self, levels) -> float:
+        """Largest name size at which every name of levels fits its column.
+
+        inf without a font, or when levels have no names.
+        """
+        if self.font is None:
+            return math.inf
+        for lv in levels:
+            if lv not in self._caps:
+                widths = self.name_widths()
+                cap = math.inf
+                for limit, event in zip(column_width_limits(), EVENT_KEYS):
+                    widest = max((widths[n] for n in self.data[event].get(lv, [])), default=0)
+                    if widest > 0:
+                        cap = min(cap, limit / widest)
+                self._caps[lv] = cap
+        return min((self._caps[lv] for lv in levels), default=math.inf)
+
+    def overflowing_names(self, levels, size: float) -> list[tuple[str, str, str, float, float]]:
+        """(name, event, level, width, column limit) for each name of levels
+        wider than its column at size; widths in points.
+        """
+        if self.size_cap(levels) >= size - 1e-9:
+            return []
+        widths = self.name_widths()
+        found = []
+        for limit, event in zip(column_width_limits(), EVENT_KEYS):
+            for lv in levels:
+                for name in self.data[event].get(lv, []):
+                    width = widths[name] * size
+                    if width > limit + 1e-6:
+                        found.append((name, event, lv, round(width, 1), limit))
+        return found
+
+    def fit_font_size(self, levels: list,
+                      max_page_fill: float = MAX_PAGE_FILL,
+                      min_name_size: float = MIN_NAME_SIZE,
+                      max_font_size: float = DEFAULT_NAME_SIZE,
+                      names_start_y: float = None,
+                      page_h: int = None) -> float:
+        """Largest name size (0.1pt steps up from min) that fits levels on a page."""
+        key = (tuple(levels), max_page_fill, min_name_size, max_font_size,
+               names_start_y, page_h)
+        if key not in self._fits:
+            self._fits[key] = self._solve(levels, *key[1:])
+        return self._fits[key]
+
+    def _solve(self, levels, max_page_fill, min_name_size, max_font_size,
+               names_start_y, page_h):
+        if names_start_y is None:
+            names_start_y = 121  # default from compute_layout()
+        _names_bottom = (page_h or PAGE_H) - 18
+        available = (_names_bottom - names_start_y) * max_page_fill
+        fixed, rows = self.group_metrics(levels)
+        per_pt = rows * self.line_height_ratio
+        cap = self.size_cap(levels)
+
+        def fits(size):
+            return fixed + per_pt * size <= available and size <= cap + 1e-9
+
+        # If max fits, use it; if min doesn't fit, use min anyway
+        if fits(max_font_size):
+            return max_font_size
+        if not fits(min_name_size):
+            return min_name_size
+
+        # Largest size on the 0.1pt grid at or below the exact solution;
+        # the nudges absorb float error when it lands on a grid point
+        exact = min((available - fixed) / per_pt if per_pt else math.inf, cap)
+        steps = math.floor((exact - min_name_size) / 0.1)
+        while fits(min_name_size + (steps + 1) * 0.1):
+            steps += 1
+        while steps > 0 and not fits(min_name_size + steps * 0.1):
+            steps -= 1
+        return round(min_name_size + steps * 0.1, 1)
 
 
 def fit_font_size(levels: list, data: dict,
@@ -700,48 +1153,17 @@ def fit_font_size(levels: list, data: dict,
                   max_font_size: float = DEFAULT_NAME_SIZE,
                   names_start_y: float = None,
                   divider_size: float = None,
-                  page_h: int = None) -> float:
+                  page_h: int = None,
+                  font: str = None) -> float:
     """Find the largest font size that fits all levels on page.
 
-    Uses multi-resolution search (like a B-tree index): tests at
-    progressively finer steps (1.0 -> 0.5 -> 0.2 -> 0.1) instead
-    of scanning every 0.1 increment linearly. Precise to 0.1pt.
+    Precise to 0.1pt. With a font, names must also fit their columns'
+    widths. One-off form of LayoutMetrics.fit_font_size(); use a
+    LayoutMetrics directly when fitting many pages from the same data.
     """
-    if names_start_y is None:
-        names_start_y = 121  # default from compute_layout()
-    ds = divider_size if divider_size is not None else LEVEL_DIVIDER_SIZE
-    _names_bottom = (page_h or PAGE_H) - 18
-    available = (_names_bottom - names_start_y) * max_page_fill
-
-    def _total_height(size):
-        lh = size * line_height_ratio
-        return sum(
-            level_gap + ds * 1.3 +
-            max(len(data[event].get(lv, [])) for event in EVENT_KEYS) * lh + 1
-            for lv in levels
-        )
-
-    # Quick check: if max fits, use it
-    if _total_height(max_font_size) <= available:
-        return max_font_size
-
-    # Quick check: if min doesn't fit, use min anyway
-    if _total_height(min_name_size) > available:
-        return min_name_size
-
-    # Multi-resolution search: start at min (definitely fits) and
-    # step upward at progressively finer increments
-    best = min_name_size
-    for step in [1.0, 0.5, 0.2, 0.1]:
-        candidate = best + step
-        while candidate <= max_font_size + 0.001:
-            if _total_height(candidate) <= available:
-                best = candidate
-                candidate += step
-            else:
-                break
-
-    return round(best, 1)
+    metrics = LayoutMetrics(data, line_height_ratio, level_gap, divider_size, font=font)
+    return metrics.fit_font_size(levels, max_page_fill, min_name_size, max_font_size,
+                                 names_start_y=names_start_y, page_h=page_h)
 
 
 def space_text(text: str) -> str:
@@ -751,16 +1173,17 @@ def space_text(text: str) -> str:
     return '  '.join(spaced_words)
 
 
+@session_cached
 def get_winners_with_gym(db_path: str, meet_name: str) -> dict:
     """Get a mapping of winner name -> gym (with cleaned names)."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
-        cur.execute('SELECT DISTINCT name, gym FROM winners WHERE meet_name = ?',
+        cur.execute('SELECT DISTINCT name, gym, display_name FROM winners WHERE meet_name = ?',
                     (meet_name,))
         result = {}
         for row in cur.fetchall():
-            cleaned = clean_name_for_shirt(row[0])
+            cleaned = stored_display_name(row[0], row[2])
             if cleaned:
                 if cleaned in result and result[cleaned] != row[1]:
                     # Name collision: same cleaned name at different gyms.
@@ -773,9 +1196,10 @@ def get_winners_with_gym(db_path: str, meet_name: str) -> dict:
     return result
 
 
+@session_cached
 def get_all_winner_gyms(db_path: str, meet_name: str) -> list:
     """Get sorted list of all gyms that have winners."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
         cur.execute('SELECT DISTINCT gym FROM winners WHERE meet_name = ? ORDER BY gym',
@@ -0,0 +1,145 @@
+"""Persistent multi-meet archive database.
+
+build_database keeps one meet per staging DB (it wipes results/winners on
+every build). Finished meets are promoted here with archive_meet(), which
+replaces that meet's rows in a long-lived archive DB. The archive uses the
+same results/winners/meets schema, partitioned by meet_name, plus composite
+indexes for season-wide lookups (all winners for a gym, an athlete's history)
+so those are single indexed queries instead of opening one file per meet.
+
+The archive runs in WAL mode so readers are never blocked by a promotion,
+and statistics are refreshed with ANALYZE every few promotions.
+"""
+
+import sqlite3
+
+from .models import MeetConfig
+from .db_connection import connect
+from .db_builder import _create_results_tables, _create_winners_table, upgrade_schema
+
+# Full ANALYZE after this many promotions; PRAGMA optimize in between
+ANALYZE_EVERY = 5
+
+_RESULT_COLS = ('state', 'meet_name', 'association', 'name', 'gym', 'club_num',
+                'session', 'level', 'division', 'vault', 'bars', 'beam', 'floor',
+                'aa', 'rank', 'num', 'display_name', 'suspicious_name',
+                'suspicious_reason')
+_WINNER_COLS = ('state', 'meet_name', 'association', 'name', 'gym', 'session',
+                'level', 'division', 'event', 'score', 'is_tie', 'display_name',
+                'suspicious_name', 'suspicious_reason', 'sort_key')
+
+
+def _create_archive_schema(cur):
+    """Staging schema plus the cross-meet indexes and bookkeeping table."""
+    _create_results_tables(cur)
+    _create_winners_table(cur)
+    # Season-wide lookups lead with the gym / athlete, not the meet
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_gym_meet ON results(gym, meet_name)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_name_meet ON results(name, meet_name)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_winners_gym_meet ON winners(gym, meet_name, event)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_winners_name_meet ON winners(name, meet_name)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_meets_state_year ON meets(state, year)')
+    cur.execute('''CREATE TABLE IF NOT EXISTS archive_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )''')
+
+
+def open_archive(archive_path: str) -> sqlite3.Connection:
+    """Open (creating if needed) the archive DB in WAL mode."""
+    conn = connect(archive_path, 'archive')
+    _create_archive_schema(conn.cursor())
+    conn.commit()
+    return conn
+
+
+def _maybe_analyze(conn: sqlite3.Connection):
+    """Run ANALYZE every ANALYZE_EVERY promotions (or when no stats exist yet)."""
+    cur = conn.cursor()
+    cur.execute("SELECT value FROM archive_meta WHERE key = 'promotions_since_analyze'")
+    row = cur.fetchone()
+    pending = int(row[0]) + 1 if row else 1
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+    if pending >= ANALYZE_EVERY or cur.fetchone() is None:
+        cur.execute('ANALYZE')
+        pending = 0
+    else:
+        cur.execute('PRAGMA optimize')
+    cur.execute("INSERT OR REPLACE INTO archive_meta (key, value) VALUES ('promotions_since_analyze', ?)",
+                (str(pending),))
+    conn.commit()
+
+
+def archive_meet(archive_path: str, staging_db_path: str, config: MeetConfig) -> dict:
+    """Promote a finished staging DB's meet into the archive.
+
+    Replaces any rows the archive already holds for config.meet_name, so a
+    re-processed meet can be promoted again. The copy is one transaction:
+    readers see either the old meet or the new one.
+
+    Returns:
+        Dict with 'results' and 'winners' row counts copied.
+    """
+    upgrade_schema(staging_db_path)
+    conn = open_archive(archive_path)
+    try:
+        cur = conn.cursor()
+        cur.execute('ATTACH DATABASE ? AS staging', (staging_db_path,))
+        cur.execute('BEGIN IMMEDIATE')
+        try:
+            for table in ('results', 'winners'):
+                cur.execute(f'DELETE FROM main.{table} WHERE meet_name = ?', (config.meet_name,))
+
+            cols = ', '.join(_RESULT_COLS)
+            cur.execute(f'''INSERT INTO main.results ({cols})
+                SELECT {cols} FROM staging.results WHERE meet_name = ? ORDER BY id''',
+                        (config.meet_name,))
+            n_results = cur.rowcount
+            cols = ', '.join(_WINNER_COLS)
+            cur.execute(f'''INSERT INTO main.winners ({cols})
+                SELECT {cols} FROM staging.winners WHERE meet_name = ? ORDER BY id''',
+                        (config.meet_name,))
+            n_winners = cur.rowcount
+
+            cur.execute('''INSERT INTO main.meets (meet_name, source, state, association, year)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(meet_name) DO UPDATE SET
+                    source = excluded.source, state = excluded.state,
+                    association = excluded.association, year = excluded.year''',
+                        (config.meet_name, config.source_type, config.state,
+                         config.association, config.year))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        cur.execute('DETACH DATABASE staging')
+
+        if n_results == 0:
+            print(f"ARCHIVE_EMPTY: No results for '{config.meet_name}' in {staging_db_path}")
+        print(f"Archived {config.meet_name}: {n_results} results, {n_winners} winners -> {archive_path}")
+        _maybe_analyze(conn)
+        return {'results': n_results, 'winners': n_winners}
+    finally:
+        conn.close()
+
+
+def query_gym_winners(archive_path: str, gym: str, year: str = None) -> list[tuple]:
+    """All winner rows for a gym across archived meets, optionally for one year.
+
+    Returns (meet_name, name, level, division, event, score, is_tie) tuples,
+    ordered by meet then level/division/event.
+    """
+    conn = open_archive(archive_path)
+    try:
+        cur = conn.cursor()
+        sql = '''SELECT w.meet_name, w.name, w.level, w.division, w.event, w.score, w.is_tie
+                 FROM winners w'''
+        params = [gym]
+        if year is not None:
+            sql += ' JOIN meets m ON m.meet_name = w.meet_name AND m.year = ?'
+            params.insert(0, year)
+        sql += ' WHERE w.gym = ? ORDER BY w.meet_name, w.level, w.division, w.event, w.name'
+        cur.execute(sql, params)
+        return cur.fetchall()
+    finally:
+        conn.close()
@@ -8,26 +8,27 @@ Produces a readable text file with key facts about a processed meet:
 - Solo-session exclusions
 """
 
-import sqlite3
-
 from python.core.constants import (
     XCEL_MAP, XCEL_PRESTIGE_ORDER as XCEL_ORDER,
     EVENTS as EVENT_KEYS,
     LINE_HEIGHT_RATIO, LEVEL_GAP, DEFAULT_NAME_SIZE, MAX_PAGE_FILL,
     MIN_NAME_SIZE, NAMES_BOTTOM_Y, NAMES_START_Y,
 )
+from python.core.db_builder import read_group_stats
+from python.core.db_connection import connect
 from python.core.layout_engine import (
     get_winners_by_event_and_level, bin_pack_levels,
     precompute_shirt_data,
 )
+from python.core.models import PrecomputedShirt
 
 
 def generate_meet_summary(db_path: str, meet_name: str, output_path: str,
                           layout=None,
                           level_groups: str = None, exclude_levels: str = None,
-                          precomputed: dict = None):
+                          precomputed: PrecomputedShirt = None):
     """Generate a meet summary text file."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
 
@@ -80,39 +81,24 @@ def generate_meet_summary(db_path: str, meet_name: str, output_path: str,
         lines.append(f'Sessions:  {len(sessions)}  ({", ".join(sessions)})')
 
         # Solo sessions — distinguish excluded (out-of-session) from kept (sole competitor)
-        cur.execute('''SELECT session, level, division, COUNT(DISTINCT name) as cnt
-                       FROM results WHERE meet_name = ?
-                       GROUP BY session, level, division HAVING cnt = 1''',
-                    (meet_name,))
-        solos = cur.fetchall()
-
-        # Find which level+division combos have real competition elsewhere
-        cur.execute('''SELECT level, division
-                       FROM results WHERE meet_name = ?
-                       GROUP BY session, level, division
-                       HAVING COUNT(DISTINCT name) >= 2''',
-                    (meet_name,))
-        has_competition = {(r[0], r[1]) for r in cur.fetchall()}
-
-        excluded_solos = [(s, l, d) for s, l, d, _ in solos if (l, d) in has_competition]
-        kept_solos = [(s, l, d) for s, l, d, _ in solos if (l, d) not in has_competition]
+        solos = [g for g in read_group_stats(cur, meet_name) if g['is_solo']]
+        excluded_solos = [g for g in solos if g['is_excluded']]
+        kept_solos = [g for g in solos if not g['is_excluded']]
 
         if excluded_solos:
             lines.append(f'Solo-session groups (excluded from winners):  {len(excluded_solos)}')
-            for sess, lvl, div in excluded_solos:
-                lines.append(f'  Session {sess}, Level {lvl}, Division {div}')
+            for g in excluded_solos:
+                lines.append(f"  Session {g['session']}, Level {g['level']}, Division {g['division']}")
 
         if kept_solos:
             lines.append(f'WARNING: Sole-competitor edge cases (included as winners):  {len(kept_solos)}')
-            for sess, lvl, div in kept_solos:
-                cur.execute('''SELECT name, gym FROM results
-                              WHERE meet_name = ? AND session = ? AND level = ? AND division = ?''',
-                            (meet_name, sess, lvl, div))
-                row = cur.fetchone()
-                if row:
-                    lines.append(f'  {row[0]} ({row[1]}) -- Session {sess}, Level {lvl}, Division {div}')
-                    lines.append(f'    Only athlete at this level/division. Won all events by default.')
-                    lines.append(f'    Verify with meet director if they should be on the championship shirt.')
+            for g in kept_solos:
+                if g['session'] is None or g['level'] is None or g['division'] is None:
+                    continue
+                lines.append(f"  {g['solo_name']} ({g['solo_gym']}) -- Session {g['session']}, "
+                             f"Level {g['level']}, Division {g['division']}")
+                lines.append(f'    Only athlete at this level/division. Won all events by default.')
+                lines.append(f'    Verify with meet director if they should be on the championship shirt.')
 
         if not excluded_solos and not kept_solos:
             lines.append('Solo-session groups:  None')
@@ -197,8 +183,8 @@ def generate_meet_summary(db_path: str, meet_name: str, output_path: str,
                                     layout=layout,
                                     level_groups=level_groups,
                                     exclude_levels=exclude_levels)
-    page_groups = pre['page_groups']
-    data = pre['data']
+    page_groups = pre.page_groups
+    data = pre.data
 
     if page_groups:
         lines.append('SHIRT BACK PAGES')
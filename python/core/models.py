@@ -1,6 +1,7 @@
 """Data models for the gymnastics meet scoring system."""
 
-from dataclasses import dataclass, field, asdict
+import sys
+from dataclasses import dataclass, field, asdict, fields, replace
 from typing import ClassVar
 
 
@@ -64,3 +65,126 @@ class MeetConfig:
     title_lines: tuple = ()   # ("2025 Gymnastics", "State Champions of Iowa", "Levels 2-10")
     division_order: dict = field(default_factory=dict)  # Division age ordering for CSV sort
     year: str = ''            # Championship year (e.g. "2026") for PDF titles
+
+
+def _names(names) -> tuple:
+    """Interned name tuple (repeat names share one string object)."""
+    if isinstance(names, tuple):
+        return names
+    return tuple(sys.intern(n) for n in names)
+
+
+@dataclass(frozen=True, slots=True)
+class PrecomputedShirt:
+    """Shirt layout computed once by precompute_shirt_data() and shared by
+    every renderer (shirt PDF, gym highlights, order-form backs, IDML,
+    summary).
+
+    Read-only: data maps event -> level -> tuple of interned display names,
+    page_groups is a tuple of (oval label, levels) pages. Copies and
+    level-filtered views (with_levels) share the name tuples instead of
+    copying them, and a view's data may hold levels it no longer lists.
+
+    page_index (level -> page) and name_pages (name -> pages it appears on)
+    are derived from page_groups and data.
+    """
+    levels: tuple
+    data: dict
+    page_groups: tuple
+    # Resolved layout params
+    lhr: float
+    lgap: float
+    mfill: float
+    mfs: float
+    mxfs: float
+    t1l: float
+    t1s: int
+    t2l: float
+    t2s: int
+    title1_y: float
+    title2_y: float
+    oval_y: float
+    headers_y: float
+    names_start_y: float
+    page_h: int
+    # Style params
+    copyright: str
+    sport: str
+    title_prefix: str
+    header_large: float
+    header_small: int
+    divider_size: float
+    accent_color: tuple
+    font_regular: str
+    font_bold: str
+    # Diagnostics
+    flagged_names: tuple = ()    # (cleaned, raw, event, level, reason)
+    modified_names: tuple = ()   # (raw, cleaned, event, level)
+    division_order: tuple | None = None
+    page_frontier: tuple = ()    # (pages, largest name size or None)
+    page_index: dict = field(init=False, repr=False, compare=False)
+    name_pages: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        setattr_ = object.__setattr__
+        setattr_(self, 'levels', tuple(self.levels))
+        setattr_(self, 'data', {event: {lv: _names(names) for lv, names in by_level.items()}
+                                for event, by_level in self.data.items()})
+        setattr_(self, 'page_groups', tuple((label, tuple(lvs)) for label, lvs in self.page_groups))
+        setattr_(self, 'accent_color', tuple(self.accent_color))
+        setattr_(self, 'flagged_names', tuple(tuple(r) for r in self.flagged_names))
+        setattr_(self, 'modified_names', tuple(tuple(r) for r in self.modified_names))
+        if self.division_order is not None:
+            setattr_(self, 'division_order', tuple(self.division_order))
+        setattr_(self, 'page_frontier', tuple(tuple(f) for f in self.page_frontier))
+
+        page_index, name_pages = {}, {}
+        for i, (_label, lvs) in enumerate(self.page_groups):
+            for lv in lvs:
+                page_index[lv] = i
+                for by_level in self.data.values():
+                    for name in by_level.get(lv, ()):
+                        pages = name_pages.setdefault(name, [])
+                        if not pages or pages[-1] != i:
+                            pages.append(i)
+        setattr_(self, 'page_index', page_index)
+        setattr_(self, 'name_pages', {name: tuple(p) for name, p in name_pages.items()})
+
+    def with_levels(self, include) -> 'PrecomputedShirt':
+        """View restricted to the levels in include; pages left empty are dropped."""
+        incl = set(include)
+        return replace(
+            self,
+            levels=[lv for lv in self.levels if lv in incl],
+            page_groups=[(label, [lv for lv in lvs if lv in incl])
+                         for label, lvs in self.page_groups
+                         if any(lv in incl for lv in lvs)])
+
+    def to_dict(self) -> dict:
+        """JSON-ready form; each distinct name is stored once and data holds
+        indexes into that table."""
+        table, index = [], {}
+        data = {}
+        for event, by_level in self.data.items():
+            data[event] = {}
+            for lv, names in by_level.items():
+                ids = []
+                for name in names:
+                    if name not in index:
+                        index[name] = len(table)
+                        table.append(name)
+                    ids.append(index[name])
+                data[event][lv] = ids
+        d = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        d['data'] = data
+        d['names'] = table
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'PrecomputedShirt':
+        """Inverse of to_dict()."""
+        d = dict(d)
+        table = [sys.intern(n) for n in d.pop('names')]
+        d['data'] = {event: {lv: tuple(table[i] for i in ids) for lv, ids in by_level.items()}
+                     for event, by_level in d['data'].items()}
+        return cls(**d)
@@ -0,0 +1,339 @@
+"""Name-position sidecar index for rendered shirt PDFs.
+
+The shirt renderers know exactly where they draw every name. They save it
+next to the PDF as <pdf>.names.json, mapping each name to
+[(page_idx, [Rect, ...]), ...] in page order, with each Rect matching what
+page.search_for(name) reports. Gym highlights and order forms overlay
+stars and highlights on that PDF. They load the index instead of searching
+every page for every name.
+
+The index records the SHA-256 of the PDF it was written for. A PDF that was
+regenerated, edited, merged or exported by a designer no longer matches, so
+load_name_index() returns None and callers fall back to locate_names().
+Digests and parsed indexes are cached per file path, mtime and size, so
+loading the index once per athlete or gym reads the PDF once.
+
+locate_names() finds names in any PDF from one word extraction per page,
+matching every name at once against a token trie. It matches names split
+across lines, including at a hyphen or soft hyphen. The extraction is kept
+per PDF hash, so gym highlights and order forms on the same PDF share one
+scan.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+NAME_INDEX_VERSION = 1
+
+
+def name_index_path(pdf_path: str) -> str:
+    """Sidecar index file for pdf_path."""
+    return pdf_path + '.names.json'
+
+
+@functools.lru_cache(maxsize=None)
+def _base14_font(fontname: str) -> fitz.Font:
+    return fitz.Font(fontname)
+
+
+def text_rect(text: str, x: float, baseline_y: float, font, fontsize: float) -> fitz.Rect:
+    """Rect of text drawn with insert_text at (x, baseline_y) in font (a
+    fitz.Font or a base-14 font name).
+
+    Matches page.search_for(text): the width is the text's advance, and the
+    height runs from the font's ascender to its descender.
+    """
+    if not isinstance(font, fitz.Font):
+        font = _base14_font(font)
+    return fitz.Rect(x, baseline_y - font.ascender * fontsize,
+                     x + font.text_length(text, fontsize=fontsize),
+                     baseline_y - font.descender * fontsize)
+
+
+def _pdf_digest(pdf_path: str) -> str:
+    """SHA-256 of the file, hashed once per version of it on disk."""
+    st = os.stat(pdf_path)
+    return _file_digest(os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size are part of the cache key: a rewritten file rehashes
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write_name_index(pdf_path: str, name_rects: dict):
+    """Save name_rects ({name: [(page_idx, [Rect, ...]), ...]}) for the PDF
+    just saved at pdf_path. Failures are logged; callers then search instead.
+    """
+    index_path = name_index_path(pdf_path)
+    tmp_path = None
+    try:
+        stored = {
+            'version': NAME_INDEX_VERSION,
+            'sha256': _pdf_digest(pdf_path),
+            'names': {name: [[pi, [[r.x0, r.y0, r.x1, r.y1] for r in rects]]
+                             for pi, rects in hits]
+                      for name, hits in name_rects.items()},
+        }
+        fd, tmp_path = tempfile.mkstemp(suffix='.json',
+                                        dir=os.path.dirname(index_path) or '.')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, separators=(',', ':'))
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.debug("NAME_INDEX: could not write %s: %s", index_path, e)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_name_index(pdf_path: str) -> dict | None:
+    """{name: [(page_idx, [Rect, ...]), ...]} for pdf_path, or None when it
+    has no index or the index was written for different PDF contents.
+    """
+    try:
+        index_path = os.path.abspath(name_index_path(pdf_path))
+        st = os.stat(index_path)
+        version, digest, names = _read_name_index(index_path, st.st_mtime_ns, st.st_size)
+        if version != NAME_INDEX_VERSION or digest != _pdf_digest(pdf_path):
+            return None
+        return dict(names)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def _read_name_index(index_path: str, mtime_ns: int, size: int):
+    # Parsed once per version of the index file; callers get their own dict
+    # but share the (read-only) hit lists
+    with open(index_path, 'r', encoding='utf-8') as f:
+        stored = json.load(f)
+    if stored.get('version') != NAME_INDEX_VERSION:
+        return stored.get('version'), None, {}
+    names = {name: [(pi, [fitz.Rect(r) for r in rects]) for pi, rects in hits]
+             for name, hits in stored['names'].items()}
+    return stored['version'], stored.get('sha256'), names
+
+
+def move_name_index(src_pdf_path: str, dst_pdf_path: str):
+    """Move src_pdf_path's index along with the PDF (e.g. after a temp-file
+    save). A missing index is not an error.
+    """
+    src = name_index_path(src_pdf_path)
+    if os.path.exists(src):
+        try:
+            os.replace(src, name_index_path(dst_pdf_path))
+        except OSError as e:
+            logger.debug("NAME_INDEX: could not move %s: %s", src, e)
+
+
+# --- Name locator for PDFs without an index ---
+
+_SCAN_CACHE = OrderedDict()  # PDF SHA-256 -> _scan_pages() result
+_SCAN_CACHE_SIZE = 4
+_HYPHENS = ('-', '\xad')
+# Stripped from both ends of a word, so "Smith," or "Smith*" in a designer's
+# PDF still matches; hyphens are kept for line-break joins
+_PUNCTUATION = '.,;:!?*"\'()[]{}\u2018\u2019\u201c\u201d'
+
+
+def _normalize(word: str) -> str:
+    # search_for() is case-insensitive; soft hyphens inside a word are invisible
+    return word.replace('\xad', '').strip(_PUNCTUATION).casefold()
+
+
+def _scan_pages(doc) -> list:
+    """Per page, its words in reading order as (text, Rect, line_key)."""
+    pages = []
+    for page in doc:
+        pages.append([(text, fitz.Rect(x0, y0, x1, y1), (block, line))
+                      for x0, y0, x1, y1, text, block, line, _wno
+                      in page.get_text('words')])
+    return pages
+
+
+def _page_words(pdf_path: str, doc=None) -> list:
+    digest = _pdf_digest(pdf_path)
+    pages = _SCAN_CACHE.get(digest)
+    if pages is None:
+        if doc is None:
+            with fitz.open(pdf_path) as doc:
+                pages = _scan_pages(doc)
+        else:
+            pages = _scan_pages(doc)
+        _SCAN_CACHE[digest] = pages
+        while len(_SCAN_CACHE) > _SCAN_CACHE_SIZE:
+            _SCAN_CACHE.popitem(last=False)
+    else:
+        _SCAN_CACHE.move_to_end(digest)
+    return pages
+
+
+def _tokens_at(words: list, i: int):
+    """(token, next_index) for the page word(s) starting at words[i].
+
+    A word ending in a hyphen at the end of its line may continue on the
+    next line: try it joined with that line's first word, both without the
+    hyphen (a soft hyphen break) and with it (a hyphenated name).
+    """
+    text, _rect, line = words[i]
+    yield _normalize(text), i + 1
+    if text.endswith(_HYPHENS) and i + 1 < len(words) and words[i + 1][2] != line:
+        following = _normalize(words[i + 1][0])
+        yield _normalize(text[:-1]) + following, i + 2
+        if text.endswith('-'):
+            yield _normalize(text) + following, i + 2
+
+
+def locate_names(pdf_path: str, names, doc=None) -> dict:
+    """{name: [(page_idx, [Rect, ...]), ...]} for each of names found in
+    the PDF at pdf_path, in the name index format.
+
+    Names match whole words, ignoring case, line breaks and punctuation
+    attached to either end of a word (a page word "Smith," matches Smith;
+    its Rect then includes the comma). Unlike search_for() a name is not
+    found inside a longer word. Like search_for(), a match gives one Rect
+    per line it spans: the union of its words on that line. Pass the
+    already-open doc to skip reopening pdf_path on the first scan.
+    """
+    trie = {}
+    for name in names:
+        node = trie
+        for token in name.split():
+            node = node.setdefault(_normalize(token), {})
+        if node is not trie:
+            node.setdefault(None, []).append(name)
+
+    located = {}
+    for page_idx, words in enumerate(_page_words(pdf_path, doc)):
+        page_hits = {}
+        for start in range(len(words)):
+            stack = [(trie, start)]
+            while stack:
+                node, i = stack.pop()
+                for name in node.get(None, ()):
+                    line_rects = {}
+                    for _text, word_rect, line in words[start:i]:
+                        if line in line_rects:
+                            line_rects[line] |= word_rect
+                        else:
+                            line_rects[line] = fitz.Rect(word_rect)
+                    page_hits.setdefault(name, []).extend(line_rects.values())
+                if i < len(words):
+                    for token, nxt in _tokens_at(words, i):
+                        child = node.get(token)
+                        if child is not None:
+                            stack.append((child, nxt))
+        for name, rects in page_hits.items():
+            located.setdefault(name, []).append((page_idx, rects))
+    return located
+
+
+# --- Spatial text index for the word-proximity fallback ---
+
+def _lower(text: str) -> str:
+    # Lowercase without changing the length, so indices still map to chars
+    return ''.join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+class PageTextGrid:
+    """One page's text from a single extraction, bucketed by position.
+
+    Holds each span's origin and text and each line's characters with
+    their boxes. Text is bucketed on a grid of `cell`-point squares, so
+    looking for a word or span near a point only visits nearby cells
+    instead of the whole page.
+    """
+
+    def __init__(self, page, cell: float = 40):
+        self.cell = cell
+        self._lines = []  # (lowercased text, [char Rect, ...]) in page order
+        self._spans = []  # (origin x, origin y, text without soft hyphens)
+        self._line_cells = {}
+        self._span_cells = {}
+        for block in page.get_text('rawdict')['blocks']:
+            if block.get('type') != 0:
+                continue
+            for line in block['lines']:
+                text, rects = [], []
+                for span in line['spans']:
+                    chars = span['chars']
+                    span_text = ''.join(c['c'] for c in chars)
+                    sx, sy = span['origin']
+                    self._add(self._span_cells, len(self._spans), sx, sy, sx, sy)
+                    self._spans.append((sx, sy, span_text.replace('\xad', '')))
+                    text.append(_lower(span_text))
+                    rects.extend(fitz.Rect(c['bbox']) for c in chars)
+                if rects:
+                    x0, y0, x1, y1 = line['bbox']
+                    self._add(self._line_cells, len(self._lines), x0, y0, x1, y1)
+                    self._lines.append((''.join(text), rects))
+
+    def _cells(self, x0, y0, x1, y1):
+        c = self.cell
+        for cx in range(int(x0 // c), int(x1 // c) + 1):
+            for cy in range(int(y0 // c), int(y1 // c) + 1):
+                yield cx, cy
+
+    def _add(self, cells, item, x0, y0, x1, y1):
+        for key in self._cells(x0, y0, x1, y1):
+            cells.setdefault(key, []).append(item)
+
+    def _near(self, cells, x, y, dx, dy):
+        found = set()
+        for key in self._cells(x - dx, y - dy, x + dx, y + dy):
+            found.update(cells.get(key, ()))
+        return sorted(found)
+
+    def search(self, word: str, near=None) -> list:
+        """Rects of word within lines, like page.search_for(word) for a word
+        without spaces. near=(x, y, dx, dy) keeps only hits whose top-left
+        corner is less than dx/dy from (x, y).
+        """
+        needle = _lower(word)
+        if not needle:
+            return []
+        if near is None:
+            lines = range(len(self._lines))
+        else:
+            lines = self._near(self._line_cells, *near)
+        hits = []
+        for li in lines:
+            text, rects = self._lines[li]
+            line_hits = []
+            end = None
+            i = text.find(needle)
+            while i >= 0:
+                rect = fitz.Rect(rects[i])
+                for r in rects[i + 1:i + len(needle)]:
+                    rect |= r
+                if i == end:
+                    line_hits[-1] |= rect  # search_for() joins back-to-back hits
+                else:
+                    line_hits.append(rect)
+                end = i + len(needle)
+                i = text.find(needle, end)
+            hits.extend(r for r in line_hits
+                        if near is None or (abs(r.x0 - near[0]) < near[2]
+                                            and abs(r.y0 - near[1]) < near[3]))
+        return hits
+
+    def spans_near(self, x: float, y: float, dx: float, dy: float) -> list:
+        """Texts of spans whose origin is less than dx/dy from (x, y)."""
+        texts = []
+        for si in self._near(self._span_cells, x, y, dx, dy):
+            sx, sy, text = self._spans[si]
+            if abs(sx - x) < dx and abs(sy - y) < dy:
+                texts.append(text)
+        return texts
@@ -9,7 +9,6 @@ fields (sticker label with name, events, gym).
 import logging
 import os
 import sys
-import sqlite3
 from collections import defaultdict
 import fitz  # PyMuPDF
 
@@ -17,10 +16,13 @@ from python.core.constants import (
     EVENTS as EVENT_ORDER, EVENT_DISPLAY, state_to_abbrev,
     PAGE_W, PAGE_H, BLACK,
 )
-from python.core.layout_engine import precompute_shirt_data, clean_name_for_shirt
+from python.core.db_connection import connect, session_cached
+from python.core.layout_engine import precompute_shirt_data, stored_display_name
+from python.core.models import PrecomputedShirt
+from python.core.name_index import PageTextGrid, load_name_index, locate_names
 from python.core.rendering_utils import draw_star_polygon as _draw_star
 from python.core.pdf_generator import (
-    add_shirt_back_pages, add_shirt_back_pages_from_pdf,
+    add_rendered_back_pages, add_shirt_back_pages_from_pdf, render_shirt_back_pages,
     _search_by_word_proximity,
 )
 from python.core.order_form_idml import get_state_template
@@ -99,7 +101,7 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
                              level_groups: str = None,
                              exclude_levels: str = None,
                              shirt_pdf_path: str = None,
-                             precomputed: dict = None,
+                             precomputed: PrecomputedShirt = None,
                              division_order: list = None):
     """Generate per-athlete order form PDF using the template overlay approach.
 
@@ -118,8 +120,8 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
     # Resolve explicit division order: prefer what's stored in precomputed data
     # (since it was already used to sort shirt backs), fall back to the caller-
     # supplied list, then None (which triggers alphabetical fallback with a warning).
-    if precomputed is not None and 'division_order' in precomputed:
-        _div_order = precomputed['division_order']
+    if precomputed is not None:
+        _div_order = precomputed.division_order
     else:
         _div_order = division_order
     gym_athletes = _get_gym_athletes(db_path, meet_name, explicit_order=_div_order)
@@ -140,6 +142,8 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
     use_pdf_overlay = shirt_pdf_path and os.path.exists(shirt_pdf_path)
 
     shirt_data = None
+    shirt_backs = None
+    shirt_back_positions = None
     if not use_pdf_overlay:
         # Use precomputed data if provided, otherwise compute
         if precomputed is not None:
@@ -150,6 +154,9 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
                                                layout=layout,
                                                level_groups=level_groups,
                                                exclude_levels=exclude_levels)
+        # Every back page is drawn once and stamped for each athlete; only
+        # the athlete's stars are drawn per order form
+        shirt_backs, shirt_back_positions = render_shirt_back_pages(shirt_data, year, state)
 
     # Build state-specific template (logo + abbreviation + dates baked in)
     template_doc = get_state_template(
@@ -180,40 +187,47 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
                         os.path.basename(shirt_pdf_path), len(shirt_doc),
                         shirt_doc[0].rect.width, shirt_doc[0].rect.height)
 
-            # Collect every unique athlete name (cleaned) for the pre-scan
+            # Collect every unique athlete display name for the pre-scan
             all_athlete_names = set()
             for gym in gyms:
                 for athlete_name, _le in gym_athletes[gym]:
-                    all_athlete_names.add(clean_name_for_shirt(athlete_name))
-
-            # Pre-scan: search each page for every athlete name.
-            # First pass: full name search on all pages for all athletes.
-            # Second pass: for athletes with ZERO hits anywhere, try prefix fallback
-            # (handles names hyphenated across line breaks).
-            _no_hits = set()
-            for page_idx in range(len(shirt_doc)):
-                src_page = shirt_doc[page_idx]
-                for name in all_athlete_names:
-                    hits = src_page.search_for(name)
-                    if hits:
-                        name_page_hits.setdefault(name, []).append((page_idx, hits))
-            # Find athletes with zero hits across all pages — likely hyphenated
-            # in the PDF (soft hyphen splits long names across lines).
+                    all_athlete_names.add(athlete_name)
+
+            # A PDF from generate_shirt_pdf() carries a sidecar index of the
+            # names it drew; only names missing from it are searched for.
+            name_index = load_name_index(shirt_pdf_path) or {}
+            for name in all_athlete_names:
+                if name in name_index:
+                    name_page_hits[name] = name_index[name]
+            _to_search = all_athlete_names - set(name_page_hits.keys())
+            if name_index:
+                logger.info("Order form backs: %d names from the name index, %d to search",
+                            len(name_page_hits), len(_to_search))
+
+            # Pre-scan: locate every athlete name not indexed.
+            # First pass: all those names in one scan of the PDF's words
+            # (also finds names broken across lines, hyphenated or not).
+            # Second pass: for athletes with ZERO hits anywhere, try the
+            # word-proximity fallback.
+            name_page_hits.update(locate_names(shirt_pdf_path, _to_search, doc=shirt_doc))
+            # Find athletes with zero hits across all pages — e.g. a name whose
+            # words are not adjacent in the PDF's reading order.
             # Fallback: search for individual words and verify proximity.
             _no_hits = all_athlete_names - set(name_page_hits.keys())
             if _no_hits:
                 logger.info("Order form pre-scan: %d names not found, trying word-proximity fallback", len(_no_hits))
                 for page_idx in range(len(shirt_doc)):
                     src_page = shirt_doc[page_idx]
+                    grid = PageTextGrid(src_page)
                     for name in list(_no_hits):
                         if name in name_page_hits:
                             continue
-                        hits = _search_by_word_proximity(src_page, name)
+                        hits = _search_by_word_proximity(src_page, name, grid=grid)
                         if hits:
                             name_page_hits.setdefault(name, []).append((page_idx, hits))
                             logger.info("  Found '%s' via word proximity on page %d", name, page_idx + 1)
         else:
-            _pg_count = len(shirt_data['page_groups']) if shirt_data else 0
+            _pg_count = len(shirt_data.page_groups) if shirt_data else 0
             logger.info("Order form backs: using code-generated path (%d page groups)", _pg_count)
 
         logger.info("Order forms: %d athletes across %d gyms (expect %d 2-page forms = %d pages)",
@@ -229,12 +243,11 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
             page_gym_athletes = {}  # {page_idx: {gym: [(name, level_events)]}}
             for gym in gyms:
                 for athlete_name, level_events in gym_athletes[gym]:
-                    clean = clean_name_for_shirt(athlete_name)
                     # Find which page this athlete is on
                     athlete_page = 0  # default to first page
-                    if clean in name_page_hits:
+                    if athlete_name in name_page_hits:
                         # Use the first page they appear on
-                        athlete_page = name_page_hits[clean][0][0]
+                        athlete_page = name_page_hits[athlete_name][0][0]
                     page_gym_athletes.setdefault(athlete_page, {}).setdefault(gym, []).append(
                         (athlete_name, level_events))
             # Iterate by page order, then gym alphabetically
@@ -267,7 +280,8 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
                         shirt_doc=shirt_doc, name_page_hits=name_page_hits,
                     )
                 else:
-                    add_shirt_back_pages(doc, shirt_data, athlete_name, year, state)
+                    add_rendered_back_pages(doc, shirt_backs, shirt_back_positions,
+                                            athlete_name, shirt_data.accent_color)
 
                 # Track if back pages were added (front page = 1, so >1 means backs exist)
                 pages_added = len(doc) - pages_before
@@ -303,6 +317,8 @@ def generate_order_forms_pdf(db_path: str, meet_name: str, output_path: str,
     finally:
         if shirt_doc is not None:
             shirt_doc.close()
+        if shirt_backs is not None:
+            shirt_backs.close()
         template_doc.close()
         doc.close()
 
@@ -375,6 +391,7 @@ def _extract_state(meet_name: str) -> str:
     return ''
 
 
+@session_cached
 def _get_gym_athletes(db_path: str, meet_name: str, explicit_order: list = None):
     """Get winners grouped by gym, then by athlete with events per level.
 
@@ -386,14 +403,14 @@ def _get_gym_athletes(db_path: str, meet_name: str, explicit_order: list = None)
     """
     from python.core.division_detector import detect_division_order
 
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
 
         div_order, _warnings = detect_division_order(db_path, meet_name, explicit_order=explicit_order)
 
         cur.execute('''
-            SELECT gym, name, level, division, event
+            SELECT gym, name, level, division, event, display_name
             FROM winners
             WHERE meet_name = ?
             ORDER BY gym, name,
@@ -407,8 +424,8 @@ def _get_gym_athletes(db_path: str, meet_name: str, explicit_order: list = None)
 
         gym_data = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
         athlete_divisions = {}
-        for gym, raw_name, level, division, event in cur.fetchall():
-            name = clean_name_for_shirt(raw_name)
+        for gym, raw_name, level, division, event, display_name in cur.fetchall():
+            name = stored_display_name(raw_name, display_name)
             if not name:
                 continue
             display = EVENT_DISPLAY.get(event, event)
@@ -279,7 +279,7 @@ def get_state_template(state, postmark_date='TBD', online_date='TBD',
             os.close(fd2)
             customize_idml(state, postmark_date, online_date, ship_date,
                            tmp_idml, logo_dir, idml_template, year=year)
-            idml_to_pdf(tmp_idml, tmp_pdf)
+            idml_to_pdf(tmp_idml, tmp_pdf, name_index=False)
             os.unlink(tmp_idml)
             tmp_idml = None
             # Load PDF into memory to avoid Windows file-lock issues
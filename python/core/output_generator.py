@@ -6,9 +6,8 @@ Generates output types from the winners database:
 """
 from __future__ import annotations
 
-import sqlite3
-
 from python.core.constants import EVENTS, EVENT_DISPLAY, EVENT_DISPLAY_SHORT
+from python.core.db_connection import connect
 
 
 def _sort_names_by_division(rows, div_order):
@@ -74,7 +73,7 @@ def generate_order_forms(db_path: str, meet_name: str, output_path: str):
 
     Each gym section lists winners with their events won.
     """
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path, 'read-mostly')
     try:
         cur = conn.cursor()
 
@@ -22,25 +22,30 @@ from python.core.constants import (
     EVENTS as EVENT_KEYS, EVENT_HEADERS, COL_CENTERS,
     PAGE_W, PAGE_H,
     RED, WHITE, BLACK, YELLOW_HL,
-    DEFAULT_SPORT, DEFAULT_TITLE_PREFIX, DEFAULT_COPYRIGHT,
+    DEFAULT_COPYRIGHT,
     FONT_REGULAR, FONT_BOLD,
-    HEADER_LARGE, HEADER_SMALL, LEVEL_DIVIDER_SIZE,
+    LEVEL_DIVIDER_SIZE,
     COPYRIGHT_SIZE,
     XCEL_MAP,
 )
 
 # Import layout/data functions from layout_engine (only what pdf_generator uses)
 from python.core.layout_engine import (
-    precompute_shirt_data, fit_font_size as _fit_font_size,
+    precompute_shirt_data, LayoutMetrics,
     space_text as _space_text,
-    clean_name_for_shirt as _clean_name_for_shirt,
     get_winners_with_gym as _get_winners_with_gym,
     get_all_winner_gyms as _get_all_winner_gyms,
     parse_hex_color as _parse_hex_color,
 )
+from python.core.models import PrecomputedShirt
+from python.core.name_index import (
+    PageTextGrid, load_name_index, locate_names, text_rect, write_name_index,
+)
 
 # Import rendering primitives from rendering_utils
 from python.core.rendering_utils import (
+    PageChrome,
+    text_width as _text_width,
     draw_small_caps as _draw_small_caps,
     measure_small_caps_width as _measure_small_caps_width,
     draw_oval as _draw_oval,
@@ -48,108 +53,87 @@ from python.core.rendering_utils import (
 )
 
 
-def add_shirt_back_pages(doc, precomputed, athlete_name, year, state):
+def add_shirt_back_pages(doc, precomputed, athlete_name, year, state, metrics=None,
+                         chrome=None):
     """Append back-of-shirt page(s) to doc with a red star next to athlete_name.
 
     Only includes page groups where the athlete appears. Each matching page
-    group gets one page appended to doc.
-    """
-    page_groups = precomputed['page_groups']
-    data = precomputed['data']
-    _page_h = precomputed.get('page_h', PAGE_H)
-    lhr = precomputed['lhr']
-    lgap = precomputed['lgap']
-    mfill = precomputed['mfill']
-    mfs = precomputed['mfs']
-    mxfs = precomputed['mxfs']
-    t1l = precomputed['t1l']
-    t1s = precomputed['t1s']
-    t2l = precomputed['t2l']
-    t2s = precomputed['t2s']
-    p_title1_y = precomputed['title1_y']
-    p_title2_y = precomputed['title2_y']
-    p_oval_y = precomputed['oval_y']
-    p_headers_y = precomputed['headers_y']
-    p_names_start = precomputed['names_start_y']
+    group gets one page appended to doc. Pass a LayoutMetrics for
+    precomputed.data as metrics to reuse its font fits across athletes, and
+    a PageChrome as chrome to draw the titles, headers and copyright once
+    for all athletes (the caller closes it after saving doc).
 
-    # Style params
-    s_copyright = precomputed.get('copyright', DEFAULT_COPYRIGHT)
-    s_sport = precomputed.get('sport', DEFAULT_SPORT)
-    s_prefix = precomputed.get('title_prefix', DEFAULT_TITLE_PREFIX)
-    s_hl = precomputed.get('header_large', HEADER_LARGE)
-    s_hs = precomputed.get('header_small', HEADER_SMALL)
-    s_ds = precomputed.get('divider_size', LEVEL_DIVIDER_SIZE)
-    s_accent = precomputed.get('accent_color', RED)
-    s_freg = precomputed.get('font_regular', FONT_REGULAR)
-    s_fbold = precomputed.get('font_bold', FONT_BOLD)
-
-    star_set = {athlete_name}
-
-    for label, group_levels in page_groups:
-        # Check if athlete appears on this page group
-        found = False
-        for level in group_levels:
-            for event in EVENT_KEYS:
-                if athlete_name in data[event].get(level, []):
-                    found = True
-                    break
-            if found:
-                break
-        if not found:
+    For many athletes, render_shirt_back_pages() + add_rendered_back_pages()
+    draw each page once instead of once per athlete.
+    """
+    if metrics is None:
+        metrics = LayoutMetrics(precomputed.data, precomputed.lhr, precomputed.lgap,
+                                precomputed.divider_size, font=precomputed.font_regular)
+    own_chrome = chrome is None
+    if own_chrome:
+        chrome = PageChrome()
+
+    athlete_pages = precomputed.name_pages.get(athlete_name, ())
+
+    for page_idx, (label, group_levels) in enumerate(precomputed.page_groups):
+        # Only page groups where the athlete appears
+        if page_idx not in athlete_pages:
             continue
+        page = doc.new_page(width=PAGE_W, height=precomputed.page_h)
+        _draw_shirt_back(page, precomputed, label, group_levels, year, state,
+                         metrics, chrome, star_names={athlete_name})
 
-        page = doc.new_page(width=PAGE_W, height=_page_h)
+    if own_chrome:
+        chrome.close()
 
-        # Title lines
-        _draw_small_caps(page, PAGE_W / 2, p_title1_y,
-                         f'{year} {s_sport}', t1l, t1s, font=s_fbold)
-        _draw_small_caps(page, PAGE_W / 2, p_title2_y,
-                         f'{s_prefix} {state.upper()}',
-                         t2l, t2s, font=s_fbold)
-
-        # Oval
-        _draw_oval(page, label, p_oval_y, color=s_accent, font=s_fbold)
-
-        # Column headers with underlines
-        for i, header in enumerate(EVENT_HEADERS):
-            _draw_small_caps(page, COL_CENTERS[i], p_headers_y,
-                             header, s_hl, s_hs, font=s_fbold)
-            hw = _measure_small_caps_width(header, s_hl, s_hs, font=s_fbold)
-            line_y = p_headers_y + 3
-            page.draw_line(fitz.Point(COL_CENTERS[i] - hw / 2, line_y),
-                           fitz.Point(COL_CENTERS[i] + hw / 2, line_y),
-                           color=s_accent, width=0.5)
-
-        # Determine best font size
-        font_size = _fit_font_size(group_levels, data, lhr, lgap, mfill, mfs, mxfs,
-                                    names_start_y=p_names_start, divider_size=s_ds,
-                                    page_h=_page_h)
-        line_height = font_size * lhr
 
-        # Draw each level's names with star
-        y = p_names_start
-        for level in group_levels:
-            y += lgap
-            if level in XCEL_MAP:
-                divider_text = XCEL_MAP[level]
-            else:
-                divider_text = f'LEVEL {level}'
-            _draw_level_divider(page, y, divider_text, color=s_accent,
-                                size=s_ds, font=s_fbold)
-            y += s_ds * 1.3
+def render_shirt_back_pages(precomputed, year, state, metrics=None):
+    """Render every back-of-shirt page group once, without stars.
+
+    Order forms show the same back pages for every athlete. Stamping these
+    pages with add_rendered_back_pages() shares one Form XObject per page
+    group across the whole order-form PDF. Only the athlete's stars are
+    drawn per page.
+
+    Returns (backs_doc, name_positions). backs_doc has one page per page
+    group. name_positions maps each name to [(page_idx, [(x, baseline_y,
+    font_size), ...]), ...] in page order, one entry per place the name
+    is drawn. The caller closes backs_doc after saving the documents it
+    was stamped into.
+    """
+    if metrics is None:
+        metrics = LayoutMetrics(precomputed.data, precomputed.lhr, precomputed.lgap,
+                                precomputed.divider_size, font=precomputed.font_regular)
+    backs_doc = fitz.open()
+    chrome = PageChrome()
+    name_positions = {}
+    try:
+        for page_idx, (label, group_levels) in enumerate(precomputed.page_groups):
+            page = backs_doc.new_page(width=PAGE_W, height=precomputed.page_h)
+            positions = {}
+            _draw_shirt_back(page, precomputed, label, group_levels, year, state,
+                             metrics, chrome, name_positions=positions)
+            for name, spots in positions.items():
+                name_positions.setdefault(name, []).append((page_idx, spots))
+    finally:
+        chrome.close()
+    return backs_doc, name_positions
 
-            max_names = 0
-            for col_idx, event in enumerate(EVENT_KEYS):
-                names = data[event].get(level, [])
-                if names:
-                    _draw_names(page, y, col_idx, names, font_size,
-                                line_height, star_names=star_set,
-                                font_regular=s_freg, font_bold=s_fbold,
-                                accent_color=s_accent)
-                    max_names = max(max_names, len(names))
-            y += max_names * line_height + 1
 
-        _draw_copyright(page, text=s_copyright, font=s_freg, page_h=_page_h)
+def add_rendered_back_pages(doc, backs_doc, name_positions, athlete_name, accent_color=None):
+    """Append athlete_name's pages from render_shirt_back_pages() to doc,
+    with a star next to each place their name is printed.
+
+    Stars match add_shirt_back_pages() exactly.
+    """
+    if accent_color is None:
+        accent_color = RED
+    for page_idx, spots in name_positions.get(athlete_name, ()):
+        src = backs_doc[page_idx]
+        page = doc.new_page(width=src.rect.width, height=src.rect.height)
+        page.show_pdf_page(page.rect, backs_doc, page_idx)
+        for name_x, baseline_y, font_size in spots:
+            _draw_name_star(page, name_x, baseline_y, font_size, accent_color)
 
 
 def generate_shirt_pdf(db_path: str, meet_name: str, output_path: str,
@@ -160,8 +144,12 @@ def generate_shirt_pdf(db_path: str, meet_name: str, output_path: str,
                        exclude_levels: str = None,
                        page_h: int = None,
                        page_group_filter: list = None,
-                       precomputed: dict = None):
-    """Generate enhanced back-of-shirt PDF."""
+                       precomputed: PrecomputedShirt = None):
+    """Generate enhanced back-of-shirt PDF.
+
+    Also writes the name-position sidecar index (see name_index.py) so
+    overlays on this PDF need not search it for names.
+    """
     _page_h = page_h or PAGE_H
     # Use precomputed data if provided, otherwise compute
     if precomputed is not None:
@@ -172,45 +160,22 @@ def generate_shirt_pdf(db_path: str, meet_name: str, output_path: str,
                                     level_groups=level_groups,
                                     exclude_levels=exclude_levels,
                                     page_h=_page_h)
-    levels = pre['levels']
-    data = pre['data']
-    page_groups = pre['page_groups']
-    lhr = pre['lhr']
-    lgap = pre['lgap']
-    mfill = pre['mfill']
-    mfs = pre['mfs']
-    mxfs = pre['mxfs']
-    t1l = pre['t1l']
-    t1s = pre['t1s']
-    t2l = pre['t2l']
-    t2s = pre['t2s']
-    p_title1_y = pre['title1_y']
-    p_title2_y = pre['title2_y']
-    p_oval_y = pre['oval_y']
-    p_headers_y = pre['headers_y']
-    p_names_start = pre['names_start_y']
-    # Style params
-    s_copyright = pre['copyright']
-    s_sport = pre['sport']
-    s_prefix = pre['title_prefix']
-    s_hl = pre['header_large']
-    s_hs = pre['header_small']
-    s_ds = pre['divider_size']
-    s_accent = pre['accent_color']
-    s_freg = pre['font_regular']
-    s_fbold = pre['font_bold']
-
-    if not levels:
+    if not pre.levels:
         doc = fitz.open()
         doc.new_page(width=PAGE_W, height=_page_h)
         doc.save(output_path)
         doc.close()
+        write_name_index(output_path, {})
         return
 
     # Generate PDF
     doc = fitz.open()
+    metrics = LayoutMetrics(pre.data, pre.lhr, pre.lgap, pre.divider_size,
+                            font=pre.font_regular)
+    chrome = PageChrome()
+    name_rects = {}  # name -> [(page_idx, [Rect, ...])] for the sidecar index
 
-    for label, group_levels in page_groups:
+    for label, group_levels in pre.page_groups:
         # Filter page groups when generating legal-size subset.
         # Match against both label AND actual levels, because the filter
         # may contain group labels ("XCEL") or individual level codes ("XSA").
@@ -221,69 +186,107 @@ def generate_shirt_pdf(db_path: str, meet_name: str, output_path: str,
             if not label_match and not level_match:
                 continue
         page = doc.new_page(width=PAGE_W, height=_page_h)
-
-        # Title lines (small caps)
-        _draw_small_caps(page, PAGE_W / 2, p_title1_y,
-                         f'{year} {s_sport}', t1l, t1s, font=s_fbold)
-        _draw_small_caps(page, PAGE_W / 2, p_title2_y,
-                         f'{s_prefix} {state.upper()}',
-                         t2l, t2s, font=s_fbold)
-
-        # Oval with group label
-        _draw_oval(page, label, p_oval_y, color=s_accent, font=s_fbold)
-
-        # Column headers (small caps) with underlines
-        for i, header in enumerate(EVENT_HEADERS):
-            _draw_small_caps(page, COL_CENTERS[i], p_headers_y,
-                             header, s_hl, s_hs, font=s_fbold)
-            hw = _measure_small_caps_width(header, s_hl, s_hs, font=s_fbold)
-            line_y = p_headers_y + 3
-            page.draw_line(fitz.Point(COL_CENTERS[i] - hw / 2, line_y),
-                           fitz.Point(COL_CENTERS[i] + hw / 2, line_y),
-                           color=s_accent, width=0.5)
-
-        # Determine best font size for this page's content
-        font_size = _fit_font_size(group_levels, data, lhr, lgap, mfill, mfs, mxfs,
-                                    names_start_y=p_names_start,
-                                    divider_size=s_ds, page_h=_page_h)
-        line_height = font_size * lhr
-
-        # Draw each level's names
-        y = p_names_start
-        for level in group_levels:
-            y += lgap
-
-            # Level divider text
-            if level in XCEL_MAP:
-                divider_text = XCEL_MAP[level]
-            else:
-                divider_text = f'LEVEL {level}'
-            _draw_level_divider(page, y, divider_text, color=s_accent,
-                                size=s_ds, font=s_fbold)
-            y += s_ds * 1.3
-
-            # Names in 5 columns
-            max_names = 0
-            for col_idx, event in enumerate(EVENT_KEYS):
-                names = data[event].get(level, [])
-                if names:
-                    _draw_names(page, y, col_idx, names, font_size, line_height,
-                                font_regular=s_freg, font_bold=s_fbold,
-                                accent_color=s_accent)
-                    max_names = max(max_names, len(names))
-            y += max_names * line_height + 1
-
-        # Copyright footer
-        _draw_copyright(page, text=s_copyright, font=s_freg, page_h=_page_h)
+        positions = {}
+        _draw_shirt_back(page, pre, label, group_levels, year, state,
+                         metrics, chrome, name_positions=positions)
+        for name, spots in positions.items():
+            name_rects.setdefault(name, []).append((page.number, [
+                text_rect(name, x, baseline_y, pre.font_regular, font_size)
+                for x, baseline_y, font_size in spots]))
 
     try:
         doc.save(output_path)
     finally:
         doc.close()
+        chrome.close()
+    write_name_index(output_path, name_rects)
 
 
 # --- Drawing functions (kept here as they are PDF-specific rendering) ---
 
+def _draw_shirt_back(page, pre, label, group_levels, year, state, metrics, chrome,
+                     star_names=None, name_positions=None):
+    """Draw one back-of-shirt page: oval, level dividers and names
+    (starring star_names), then the shared chrome frame.
+
+    name_positions: optional dict, filled as in _draw_names().
+    """
+    _page_h = pre.page_h
+    s_ds = pre.divider_size
+    s_accent = pre.accent_color
+
+    # Oval
+    _draw_oval(page, label, pre.oval_y, color=s_accent, font=pre.font_bold)
+
+    # Determine best font size
+    font_size = metrics.fit_font_size(group_levels, pre.mfill, pre.mfs, pre.mxfs,
+                                      names_start_y=pre.names_start_y, page_h=_page_h)
+    line_height = font_size * pre.lhr
+
+    # Draw each level's names
+    y = pre.names_start_y
+    for level in group_levels:
+        y += pre.lgap
+        if level in XCEL_MAP:
+            divider_text = XCEL_MAP[level]
+        else:
+            divider_text = f'LEVEL {level}'
+        _draw_level_divider(page, y, divider_text, color=s_accent,
+                            size=s_ds, font=pre.font_bold)
+        y += s_ds * 1.3
+
+        max_names = 0
+        for col_idx, event in enumerate(EVENT_KEYS):
+            names = pre.data[event].get(level, [])
+            if names:
+                _draw_names(page, y, col_idx, names, font_size,
+                            line_height, star_names=star_names,
+                            font_regular=pre.font_regular, font_bold=pre.font_bold,
+                            accent_color=s_accent, positions=name_positions)
+                max_names = max(max_names, len(names))
+        y += max_names * line_height + 1
+
+    # Titles, column headers and copyright (one shared frame)
+    chrome.stamp(page, _shirt_chrome_key(pre, year, state, pre.headers_y, _page_h),
+                 lambda frame: _draw_shirt_chrome(frame, pre, year, state,
+                                                  pre.headers_y, _page_h))
+
+
+def _shirt_chrome_key(pre, year, state, headers_y, page_h):
+    """PageChrome key for _draw_shirt_chrome(): every input it draws from."""
+    return (year, state, pre.sport, pre.title_prefix,
+            pre.title1_y, pre.t1l, pre.t1s, pre.title2_y, pre.t2l, pre.t2s,
+            headers_y, pre.header_large, pre.header_small,
+            pre.font_bold, pre.font_regular, pre.accent_color,
+            pre.copyright, page_h)
+
+
+def _draw_shirt_chrome(page, pre, year, state, headers_y, page_h):
+    """Draw the parts of a shirt back shared by every page: both title
+    lines, the underlined column headers and the copyright footer.
+
+    Drawn once per PageChrome frame and stamped onto each page.
+    """
+    _draw_small_caps(page, PAGE_W / 2, pre.title1_y,
+                     f'{year} {pre.sport}', pre.t1l, pre.t1s, font=pre.font_bold)
+    _draw_small_caps(page, PAGE_W / 2, pre.title2_y,
+                     f'{pre.title_prefix} {state.upper()}',
+                     pre.t2l, pre.t2s, font=pre.font_bold)
+
+    # Column headers (small caps) with underlines
+    for i, header in enumerate(EVENT_HEADERS):
+        _draw_small_caps(page, COL_CENTERS[i], headers_y,
+                         header, pre.header_large, pre.header_small, font=pre.font_bold)
+        hw = _measure_small_caps_width(header, pre.header_large, pre.header_small,
+                                       font=pre.font_bold)
+        line_y = headers_y + 3
+        page.draw_line(fitz.Point(COL_CENTERS[i] - hw / 2, line_y),
+                       fitz.Point(COL_CENTERS[i] + hw / 2, line_y),
+                       color=pre.accent_color, width=0.5)
+
+    _draw_copyright(page, text=pre.copyright, font=pre.font_regular, page_h=page_h)
+
+
 def _draw_level_divider(page, y, level_text, color=None, size=None, font=None):
     """Draw lines flanking letter-spaced level text."""
     if color is None:
@@ -293,7 +296,7 @@ def _draw_level_divider(page, y, level_text, color=None, size=None, font=None):
     if font is None:
         font = FONT_BOLD
     spaced = _space_text(level_text)
-    tw = fitz.get_text_length(spaced, fontname=font, fontsize=size)
+    tw = _text_width(spaced, font, size)
 
     text_x = PAGE_W / 2 - tw / 2
     page.insert_text(fitz.Point(text_x, y), spaced,
@@ -315,7 +318,8 @@ def _draw_level_divider(page, y, level_text, color=None, size=None, font=None):
 
 def _draw_names(page, y, col_idx, names, font_size, line_height,
                 highlight_names=None, star_names=None,
-                font_regular=None, font_bold=None, accent_color=None):
+                font_regular=None, font_bold=None, accent_color=None,
+                positions=None):
     """Draw a centered list of names in the given column.
 
     Args:
@@ -323,6 +327,8 @@ def _draw_names(page, y, col_idx, names, font_size, line_height,
             render in bold with a yellow highlight rectangle behind them.
         star_names: Optional set of name strings. Names in this set get
             a large red star drawn just to the left of the name text.
+        positions: Optional dict; (x, baseline y, font_size) of each drawn
+            name is appended under the name, for _draw_name_star() later.
     """
     if font_regular is None:
         font_regular = FONT_REGULAR
@@ -335,28 +341,39 @@ def _draw_names(page, y, col_idx, names, font_size, line_height,
     for name in names:
         is_highlighted = highlight_names and name in highlight_names
         font = font_bold if is_highlighted else font_regular
-        tw = fitz.get_text_length(name, fontname=font, fontsize=font_size)
+        tw = _text_width(name, font, font_size)
         name_x = cx - tw / 2
         # Draw yellow highlight rectangle behind highlighted names
         if is_highlighted:
-            pad_x = 2
-            rect = fitz.Rect(name_x - pad_x,
-                             current_y - font_size * 0.82,
-                             name_x + tw + pad_x,
-                             current_y + font_size * 0.25)
-            page.draw_rect(rect, fill=YELLOW_HL, color=YELLOW_HL, width=0)
+            _draw_name_highlight(page, name_x, current_y, tw, font_size)
         # Draw star polygon to the left of the name
         if star_names and name in star_names:
-            star_r = font_size * 0.65
-            star_cx = name_x - star_r - 3
-            star_cy = current_y - font_size * 0.3
-            _draw_star_polygon(page, star_cx, star_cy, star_r, star_r * 0.4,
-                               color=accent_color)
+            _draw_name_star(page, name_x, current_y, font_size, accent_color)
+        if positions is not None:
+            positions.setdefault(name, []).append((name_x, current_y, font_size))
         page.insert_text(fitz.Point(name_x, current_y), name,
                          fontname=font, fontsize=font_size, color=BLACK)
         current_y += line_height
 
 
+def _draw_name_highlight(page, name_x, baseline_y, width, font_size):
+    """Draw the yellow rectangle behind a name drawn at (name_x, baseline_y)."""
+    pad_x = 2
+    rect = fitz.Rect(name_x - pad_x,
+                     baseline_y - font_size * 0.82,
+                     name_x + width + pad_x,
+                     baseline_y + font_size * 0.25)
+    page.draw_rect(rect, fill=YELLOW_HL, color=YELLOW_HL, width=0)
+
+
+def _draw_name_star(page, name_x, baseline_y, font_size, color):
+    """Draw the red star just left of a name drawn at (name_x, baseline_y)."""
+    star_r = font_size * 0.65
+    star_cx = name_x - star_r - 3
+    star_cy = baseline_y - font_size * 0.3
+    _draw_star_polygon(page, star_cx, star_cy, star_r, star_r * 0.4, color=color)
+
+
 def _draw_copyright(page, text=None, font=None, page_h=None):
     """Draw copyright footer at page bottom."""
     if text is None:
@@ -364,7 +381,7 @@ def _draw_copyright(page, text=None, font=None, page_h=None):
     if font is None:
         font = FONT_REGULAR
     _copyright_y = (page_h or PAGE_H) - 8
-    tw = fitz.get_text_length(text, fontname=font, fontsize=COPYRIGHT_SIZE)
+    tw = _text_width(text, font, COPYRIGHT_SIZE)
     page.insert_text(fitz.Point(PAGE_W / 2 - tw / 2, _copyright_y), text,
                      fontname=font, fontsize=COPYRIGHT_SIZE, color=BLACK)
 
@@ -387,7 +404,7 @@ def _draw_arched_text(page, center_x, center_y, text, font_size, radius,
     # Measure each character width to distribute along the arc
     char_widths = []
     for ch in text:
-        w = fitz.get_text_length(ch, fontname=font, fontsize=font_size)
+        w = _text_width(ch, font, font_size)
         char_widths.append(w)
     total_width = sum(char_widths)
 
@@ -431,8 +448,9 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
                                 name_sort='age',
                                 level_groups=None, exclude_levels=None,
                                 page_h=None,
-                                precomputed: dict = None,
-                                include_levels=None):
+                                precomputed: PrecomputedShirt = None,
+                                include_levels=None,
+                                overlay=True):
     """Generate a gym highlights version of the back-of-shirt PDF.
 
     For each gym (alphabetically), generates the same back-of-shirt pages
@@ -445,6 +463,16 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
         include_levels: Optional list/set of level strings. When provided,
             only these levels are included in the highlights PDF. Used to
             split gym highlights by page size (e.g. letter vs legal).
+        overlay: When True (default), each page group is drawn once without
+            highlights and stamped onto every gym's copy of it, with only
+            that gym's highlighted names and corner gym name drawn on top.
+            The highlight box hides the regular name under it, so pages
+            look the same as with overlay=False, which redraws each page
+            in full per gym. The hidden regular name stays in the text
+            layer, though (the base page is shared, so it can't be
+            redacted per gym): copying or searching text finds each
+            highlighted name twice. Use overlay=False when the PDF's text
+            has to be clean.
     """
     _page_h = page_h or PAGE_H
     # Use precomputed data if provided, otherwise compute
@@ -460,43 +488,23 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
     # When include_levels is specified, filter to only those levels/page groups.
     # This is used to split gym highlights by page size (e.g. letter vs legal).
     if include_levels is not None:
-        incl = set(include_levels)
-        pre = dict(pre)  # shallow copy to avoid mutating caller's dict
-        pre['levels'] = [lv for lv in pre['levels'] if lv in incl]
-        pre['data'] = {
-            event: {lv: names for lv, names in evdata.items() if lv in incl}
-            for event, evdata in pre['data'].items()
-        }
-        pre['page_groups'] = [
-            (label, [lv for lv in lvs if lv in incl])
-            for label, lvs in pre['page_groups']
-            if any(lv in incl for lv in lvs)
-        ]
-
-    levels = pre['levels']
-    data = pre['data']
-    page_groups = pre['page_groups']
-    lhr = pre['lhr']
-    lgap = pre['lgap']
-    mfill = pre['mfill']
-    mfs = pre['mfs']
-    mxfs = pre['mxfs']
-    t1l = pre['t1l']
-    t1s = pre['t1s']
-    t2l = pre['t2l']
-    t2s = pre['t2s']
-    p_title1_y = pre['title1_y']
-    p_title2_y = pre['title2_y']
+        pre = pre.with_levels(include_levels)  # view; the caller's object is untouched
+
+    levels = pre.levels
+    data = pre.data
+    page_groups = pre.page_groups
+    lhr = pre.lhr
+    lgap = pre.lgap
+    mfill = pre.mfill
+    mfs = pre.mfs
+    mxfs = pre.mxfs
+    t2l = pre.t2l
+    p_title2_y = pre.title2_y
     # Style params
-    s_copyright = pre['copyright']
-    s_sport = pre['sport']
-    s_prefix = pre['title_prefix']
-    s_hl = pre['header_large']
-    s_hs = pre['header_small']
-    s_ds = pre['divider_size']
-    s_accent = pre['accent_color']
-    s_freg = pre['font_regular']
-    s_fbold = pre['font_bold']
+    s_ds = pre.divider_size
+    s_accent = pre.accent_color
+    s_freg = pre.font_regular
+    s_fbold = pre.font_bold
 
     if not levels:
         doc = fitz.open()
@@ -523,6 +531,58 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
     gh_oval_y = p_title2_y + round(t2l * 0.8) + 3
     gh_headers_y = gh_oval_y + 24
     gh_names_start = gh_headers_y + 16
+    # One fit per page group and one titles/headers frame, shared by every
+    # gym's copy of the page
+    metrics = LayoutMetrics(data, lhr, lgap, s_ds, font=s_freg)
+    chrome = PageChrome()
+
+    def _draw_page(page, label, group_levels, highlight_names=None, positions=None):
+        # Oval with group label (shifted down)
+        _draw_oval(page, label, gh_oval_y, color=s_accent, font=s_fbold)
+
+        # Determine best font size (using shifted start position)
+        font_size = metrics.fit_font_size(group_levels, mfill, mfs, mxfs,
+                                          names_start_y=gh_names_start, page_h=_page_h)
+        line_height = font_size * lhr
+
+        # Draw each level's names with yellow highlighting
+        y = gh_names_start
+        for level in group_levels:
+            y += lgap
+            if level in XCEL_MAP:
+                divider_text = XCEL_MAP[level]
+            else:
+                divider_text = f'LEVEL {level}'
+            _draw_level_divider(page, y, divider_text, color=s_accent,
+                                size=s_ds, font=s_fbold)
+            y += s_ds * 1.3
+
+            max_names = 0
+            for col_idx, event in enumerate(EVENT_KEYS):
+                names = data[event].get(level, [])
+                if names:
+                    _draw_names(page, y, col_idx, names, font_size,
+                                line_height, highlight_names=highlight_names,
+                                font_regular=s_freg, font_bold=s_fbold,
+                                accent_color=s_accent, positions=positions)
+                    max_names = max(max_names, len(names))
+            y += max_names * line_height + 1
+
+        # Titles, column headers (shifted down) and copyright
+        chrome.stamp(page, _shirt_chrome_key(pre, year, state, gh_headers_y, _page_h),
+                     lambda frame: _draw_shirt_chrome(frame, pre, year, state,
+                                                      gh_headers_y, _page_h))
+
+    # Overlay mode: every page group drawn once, unhighlighted
+    base_doc = None
+    base_positions = []  # per page group: {name: [(x, baseline_y, font_size), ...]}
+    if overlay:
+        base_doc = fitz.open()
+        for label, group_levels in page_groups:
+            positions = {}
+            _draw_page(base_doc.new_page(width=PAGE_W, height=_page_h),
+                       label, group_levels, positions=positions)
+            base_positions.append(positions)
 
     for gym in all_gyms:
         # Build highlight set: all athletes from this gym
@@ -538,7 +598,7 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
             gym_name_small = round(gym_name_large * 0.72)
             gym_w = _measure_small_caps_width(gym_display, gym_name_large, gym_name_small, font=s_fbold)
 
-        for label, group_levels in page_groups:
+        for page_idx, (label, group_levels) in enumerate(page_groups):
             # Only include pages that have at least one highlighted athlete
             page_names = _names_on_page(group_levels)
             if not page_names.intersection(highlight_names):
@@ -546,17 +606,27 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
 
             page = doc.new_page(width=PAGE_W, height=_page_h)
 
-            # Title lines (small caps)
-            _draw_small_caps(page, PAGE_W / 2, p_title1_y,
-                             f'{year} {s_sport}', t1l, t1s, font=s_fbold)
-            _draw_small_caps(page, PAGE_W / 2, p_title2_y,
-                             f'{s_prefix} {state.upper()}',
-                             t2l, t2s, font=s_fbold)
+            if overlay:
+                # Add the bold font to the page before stamping: insert_text()
+                # would otherwise pick up the base page's copy inside its Form
+                # XObject, which the page itself cannot reference
+                page.insert_font(fontname=s_fbold)
+                page.show_pdf_page(page.rect, base_doc, page_idx)
+                for name in sorted(page_names & highlight_names):
+                    for name_x, name_y, font_size in base_positions[page_idx][name]:
+                        # Bold name on a highlight wide enough to cover the
+                        # regular one, centered on the same column
+                        cx = name_x + _text_width(name, s_freg, font_size) / 2
+                        tw = _text_width(name, s_fbold, font_size)
+                        _draw_name_highlight(page, cx - tw / 2, name_y, tw, font_size)
+                        page.insert_text(fitz.Point(cx - tw / 2, name_y), name,
+                                         fontname=s_fbold, fontsize=font_size,
+                                         color=BLACK)
 
             # Gym name in both top corners with large font
             _corner_y = 18
             _margin = 12
-            gym_w_actual = fitz.get_text_length(gym_display, fontname=s_fbold, fontsize=gym_name_large)
+            gym_w_actual = _text_width(gym_display, s_fbold, gym_name_large)
             # Top-left
             page.insert_text(fitz.Point(_margin, _corner_y),
                              gym_display, fontname=s_fbold, fontsize=gym_name_large,
@@ -566,67 +636,33 @@ def generate_gym_highlights_pdf(db_path, meet_name, output_path,
                              gym_display, fontname=s_fbold, fontsize=gym_name_large,
                              color=s_accent)
 
-            # Oval with group label (shifted down)
-            _draw_oval(page, label, gh_oval_y, color=s_accent, font=s_fbold)
-
-            # Column headers with underlines (shifted down)
-            for i, header in enumerate(EVENT_HEADERS):
-                _draw_small_caps(page, COL_CENTERS[i], gh_headers_y,
-                                 header, s_hl, s_hs, font=s_fbold)
-                hw = _measure_small_caps_width(header, s_hl, s_hs, font=s_fbold)
-                line_y = gh_headers_y + 3
-                page.draw_line(fitz.Point(COL_CENTERS[i] - hw / 2, line_y),
-                               fitz.Point(COL_CENTERS[i] + hw / 2, line_y),
-                               color=s_accent, width=0.5)
-
-            # Determine best font size (using shifted start position)
-            font_size = _fit_font_size(group_levels, data, lhr, lgap, mfill, mfs, mxfs,
-                                        names_start_y=gh_names_start, divider_size=s_ds,
-                                        page_h=_page_h)
-            line_height = font_size * lhr
-
-            # Draw each level's names with yellow highlighting
-            y = gh_names_start
-            for level in group_levels:
-                y += lgap
-                if level in XCEL_MAP:
-                    divider_text = XCEL_MAP[level]
-                else:
-                    divider_text = f'LEVEL {level}'
-                _draw_level_divider(page, y, divider_text, color=s_accent,
-                                    size=s_ds, font=s_fbold)
-                y += s_ds * 1.3
-
-                max_names = 0
-                for col_idx, event in enumerate(EVENT_KEYS):
-                    names = data[event].get(level, [])
-                    if names:
-                        _draw_names(page, y, col_idx, names, font_size,
-                                    line_height, highlight_names=highlight_names,
-                                    font_regular=s_freg, font_bold=s_fbold,
-                                    accent_color=s_accent)
-                        max_names = max(max_names, len(names))
-                y += max_names * line_height + 1
-
-            _draw_copyright(page, text=s_copyright, font=s_freg, page_h=_page_h)
+            if not overlay:
+                _draw_page(page, label, group_levels, highlight_names=highlight_names)
 
     doc.save(output_path)
     doc.close()
+    if base_doc is not None:
+        base_doc.close()
+    chrome.close()
 
 
-def _search_by_word_proximity(page, full_name, quads=False):
+def _search_by_word_proximity(page, full_name, quads=False, grid=None):
     """Search for a name that may be hyphenated/split across lines.
 
     Searches for each word individually, verifies proximity, and handles
-    soft-hyphen splits by checking word prefixes.
+    soft-hyphen splits by checking word prefixes. Pass a PageTextGrid for
+    page as grid when searching one page for many names, so its text is
+    extracted once.
     """
     words = full_name.split()
     if not words:
         return []
+    if grid is None:
+        grid = PageTextGrid(page)
 
     anchor_hits = []
     for w in words:
-        hits = page.search_for(w, quads=quads)
+        hits = grid.search(w)
         if hits:
             anchor_hits = hits
             break
@@ -635,24 +671,12 @@ def _search_by_word_proximity(page, full_name, quads=False):
         return []
 
     for anchor in anchor_hits:
-        # Quads have 4 Points (ul, ur, ll, lr); Rects have x0/y0 attributes
-        if quads:
-            # Get bounding rect from the quad
-            ax = anchor.rect.x0 if hasattr(anchor, 'rect') else anchor.ul.x
-            ay = anchor.rect.y0 if hasattr(anchor, 'rect') else anchor.ul.y
-        else:
-            ax = anchor.x0
-            ay = anchor.y0
+        ax = anchor.x0
+        ay = anchor.y0
 
         nearby_text = ""
-        for block in page.get_text("dict")["blocks"]:
-            if block.get("type") != 0:
-                continue
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    sx, sy = span["origin"]
-                    if abs(sx - ax) < 40 and abs(sy - ay) < 20:
-                        nearby_text += span["text"].replace('\xad', '') + " "
+        for span_text in grid.spans_near(ax, ay, 40, 20):
+            nearby_text += span_text + " "
 
         nearby_lower = nearby_text.lower()
         matched = 0
@@ -667,14 +691,10 @@ def _search_by_word_proximity(page, full_name, quads=False):
 
         if matched >= max(len(words) - 1, 2):
             # Build a bounding rect covering ALL matched words, not just the anchor.
-            # Search for each word individually and union into one rectangle.
+            # 100px horizontal keeps within a single column (min spacing ~114pt)
             word_rects = []
             for w in words:
-                word_hits = page.search_for(w)  # Always get Rects for union math
-                for wr in word_hits:
-                    # 100px horizontal keeps within a single column (min spacing ~114pt)
-                    if abs(wr.x0 - ax) < 100 and abs(wr.y0 - ay) < 20:
-                        word_rects.append(wr)
+                word_rects.extend(grid.search(w, near=(ax, ay, 100, 20)))
             if word_rects:
                 # Union all nearby word rects into one bounding rect
                 x0 = min(r.x0 for r in word_rects)
@@ -685,7 +705,7 @@ def _search_by_word_proximity(page, full_name, quads=False):
                 if quads:
                     return [union.quad]  # Convert Rect to Quad for highlight annotations
                 return [union]
-            return [anchor]
+            return [anchor.quad] if quads else [anchor]
 
     return []
 
@@ -744,31 +764,38 @@ def generate_gym_highlights_from_pdf(shirt_pdf_path, db_path, meet_name, output_
         doc.close()
         return
 
-    # Pre-compute text search hits for each name on each source page.
-    # First pass: full name. Second pass: prefix fallback for names with zero hits.
-    page_name_quads = []
-    for pi in range(len(shirt_doc)):
-        src = shirt_doc[pi]
-        hits = {}
-        for name in name_to_gym:
-            quads = src.search_for(name, quads=True)
-            if quads:
-                hits[name] = quads
-        page_name_quads.append(hits)
-
-    # Find names with zero hits across all pages — likely hyphenated.
-    # Fallback: word-proximity search handles any word being split.
+    # Pre-compute hits for each name on each source page. A PDF from
+    # generate_shirt_pdf() carries a sidecar index of the names it drew; only
+    # names missing from it are searched for (excluded names never are).
+    # First pass: full name, all names in one scan of the PDF's words.
+    # Second pass: word-proximity fallback for names with zero hits.
+    name_index = load_name_index(shirt_pdf_path) or {}
+    page_name_quads = [{} for _ in range(len(shirt_doc))]
+    to_search = []
+    for name in name_to_gym:
+        if name in name_index:
+            for pi, rects in name_index[name]:
+                page_name_quads[pi][name] = [r.quad for r in rects]
+        elif name not in exclude_names:
+            to_search.append(name)
+    for name, hits in locate_names(shirt_pdf_path, to_search, doc=shirt_doc).items():
+        for pi, rects in hits:
+            page_name_quads[pi][name] = [r.quad for r in rects]
+
+    # Find names with zero hits across all pages — e.g. words not adjacent
+    # in reading order. Fallback: word-proximity search near each word.
     _found_names = set()
     for hits in page_name_quads:
         _found_names.update(hits.keys())
-    _missing = set(name_to_gym.keys()) - _found_names
+    _missing = set(to_search) - _found_names
     if _missing:
         for pi in range(len(shirt_doc)):
             src = shirt_doc[pi]
+            grid = PageTextGrid(src)
             for name in list(_missing):
                 if name in page_name_quads[pi]:
                     continue
-                quads = _search_by_word_proximity(src, name, quads=True)
+                quads = _search_by_word_proximity(src, name, quads=True, grid=grid)
                 if quads:
                     page_name_quads[pi][name] = quads
 
@@ -805,14 +832,14 @@ def generate_gym_highlights_from_pdf(shirt_pdf_path, db_path, meet_name, output_
             _margin = 12
             gym_tw = fitz.TextWriter(page.rect)
 
-            tw = fitz.get_text_length(gym_display, fontname=_fb, fontsize=gym_fs)
+            tw = _text_width(gym_display, _fb, gym_fs)
             needs_wrap = tw > max_w and len(gym_display.split()) > 1
 
             if not needs_wrap:
                 # Short name — single line, scale down if needed
                 while tw > max_w and gym_fs > 9:
                     gym_fs -= 0.5
-                    tw = fitz.get_text_length(gym_display, fontname=_fb, fontsize=gym_fs)
+                    tw = _text_width(gym_display, _fb, gym_fs)
                 gym_tw.append(fitz.Point(_margin, _corner_y),
                               gym_display, font=gym_font, fontsize=gym_fs)
                 gym_tw.append(fitz.Point(pw - _margin - tw, _corner_y),
@@ -825,8 +852,8 @@ def generate_gym_highlights_from_pdf(shirt_pdf_path, db_path, meet_name, output_
                 # Split at the word boundary giving most balanced line widths
                 best_split, best_diff = 1, float('inf')
                 for s in range(1, len(words)):
-                    w1 = fitz.get_text_length(' '.join(words[:s]), fontname=_fb, fontsize=gym_fs)
-                    w2 = fitz.get_text_length(' '.join(words[s:]), fontname=_fb, fontsize=gym_fs)
+                    w1 = _text_width(' '.join(words[:s]), _fb, gym_fs)
+                    w2 = _text_width(' '.join(words[s:]), _fb, gym_fs)
                     if abs(w1 - w2) < best_diff:
                         best_diff = abs(w1 - w2)
                         best_split = s
@@ -834,10 +861,10 @@ def generate_gym_highlights_from_pdf(shirt_pdf_path, db_path, meet_name, output_
                 line2 = ' '.join(words[best_split:])
                 # Scale down only if a line still exceeds max_w
                 longer = line1 if len(line1) >= len(line2) else line2
-                tw_fit = fitz.get_text_length(longer, fontname=_fb, fontsize=gym_fs)
+                tw_fit = _text_width(longer, _fb, gym_fs)
                 while tw_fit > max_w and gym_fs > 8:
                     gym_fs -= 0.5
-                    tw_fit = fitz.get_text_length(longer, fontname=_fb, fontsize=gym_fs)
+                    tw_fit = _text_width(longer, _fb, gym_fs)
                 line_h = gym_fs + 2
                 # Top-left corner (left-aligned)
                 gym_tw.append(fitz.Point(_margin, _corner_y),
@@ -845,10 +872,10 @@ def generate_gym_highlights_from_pdf(shirt_pdf_path, db_path, meet_name, output_
                 gym_tw.append(fitz.Point(_margin, _corner_y + line_h),
                               line2, font=gym_font, fontsize=gym_fs)
                 # Top-right corner (right-aligned)
-                tw_r1 = fitz.get_text_length(line1, fontname=_fb, fontsize=gym_fs)
+                tw_r1 = _text_width(line1, _fb, gym_fs)
                 gym_tw.append(fitz.Point(pw - _margin - tw_r1, _corner_y),
                               line1, font=gym_font, fontsize=gym_fs)
-                tw_r2 = fitz.get_text_length(line2, fontname=_fb, fontsize=gym_fs)
+                tw_r2 = _text_width(line2, _fb, gym_fs)
                 gym_tw.append(fitz.Point(pw - _margin - tw_r2, _corner_y + line_h),
                               line2, font=gym_font, fontsize=gym_fs)
 
@@ -872,8 +899,11 @@ def add_shirt_back_pages_from_pdf(doc, shirt_pdf_path, athlete_name,
     are supplied by the caller, the function skips opening the file and
     scanning every page.  This turns O(N * P) file-opens and text searches
     into a single pre-scan for the whole batch.
+
+    *athlete_name* is the shirt display name (winners.display_name), i.e.
+    the text exactly as printed on the back of the shirt.
     """
-    search_name = _clean_name_for_shirt(athlete_name)
+    search_name = athlete_name
     owns_doc = shirt_doc is None
     if owns_doc:
         shirt_doc = fitz.open(shirt_pdf_path)
@@ -881,38 +911,29 @@ def add_shirt_back_pages_from_pdf(doc, shirt_pdf_path, athlete_name,
     if name_page_hits is not None:
         # Fast path: use pre-scanned lookup
         page_hits = name_page_hits.get(search_name, [])
-        for pi, hits in page_hits:
-            src = shirt_doc[pi]
-            pw, ph = src.rect.width, src.rect.height
-            page = doc.new_page(width=pw, height=ph)
-            page.show_pdf_page(page.rect, shirt_doc, pi)
-
-            for rect in hits:
-                font_size = rect.height * 0.8
-                star_r = font_size * 0.65
-                star_cx = rect.x0 - star_r - 3
-                star_cy = (rect.y0 + rect.y1) / 2
-                _draw_star_polygon(page, star_cx, star_cy, star_r, star_r * 0.4,
-                                   color=RED)
     else:
-        # Legacy path: scan every page (used when called without pre-scan)
-        for pi in range(len(shirt_doc)):
-            src = shirt_doc[pi]
-            hits = src.search_for(search_name)
-            if not hits:
-                continue
+        # Legacy path (used when called without pre-scan): look the name up
+        # in the PDF's name index, or locate it
+        name_index = load_name_index(shirt_pdf_path) or {}
+        if search_name in name_index:
+            page_hits = name_index[search_name]
+        else:
+            page_hits = locate_names(shirt_pdf_path, [search_name],
+                                     doc=shirt_doc).get(search_name, [])
 
-            pw, ph = src.rect.width, src.rect.height
-            page = doc.new_page(width=pw, height=ph)
-            page.show_pdf_page(page.rect, shirt_doc, pi)
+    for pi, hits in page_hits:
+        src = shirt_doc[pi]
+        pw, ph = src.rect.width, src.rect.height
+        page = doc.new_page(width=pw, height=ph)
+        page.show_pdf_page(page.rect, shirt_doc, pi)
 
-            for rect in hits:
-                font_size = rect.height * 0.8
-                star_r = font_size * 0.65
-                star_cx = rect.x0 - star_r - 3
-                star_cy = (rect.y0 + rect.y1) / 2
-                _draw_star_polygon(page, star_cx, star_cy, star_r, star_r * 0.4,
-                                   color=RED)
+        for rect in hits:
+            font_size = rect.height * 0.8
+            star_r = font_size * 0.65
+            star_cx = rect.x0 - star_r - 3
+            star_cy = (rect.y0 + rect.y1) / 2
+            _draw_star_polygon(page, star_cx, star_cy, star_r, star_r * 0.4,
+                               color=RED)
 
     if owns_doc:
         shirt_doc.close()
@@ -2,8 +2,12 @@
 
 Drawing primitives used by pdf_generator.py and order_form_generator.py.
 Requires PyMuPDF (fitz).
+
+Text is measured through text_width() and the small-caps layout cache, so a
+title, header or label repeated on every page is measured once per process.
 """
 
+import functools
 import math
 import fitz
 
@@ -12,6 +16,30 @@ from python.core.constants import (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def text_width(text: str, font: str, size: float) -> float:
+    """fitz.get_text_length(), memoized on (text, font, size)."""
+    return fitz.get_text_length(text, fontname=font, fontsize=size)
+
+
+@functools.lru_cache(maxsize=None)
+def _small_caps_layout(text: str, large_size: float, small_size: float,
+                       font: str) -> tuple[float, tuple]:
+    """(total width, ((char, size, advance), ...)) for small-caps text.
+
+    Word breaks are (' ', large_size, space width) entries.
+    """
+    glyphs = []
+    for wi, word in enumerate(text.split()):
+        if wi > 0:
+            glyphs.append((' ', large_size, text_width(' ', font, large_size)))
+        for ci, ch in enumerate(word):
+            ch_upper = ch.upper()
+            fs = large_size if ci == 0 else small_size
+            glyphs.append((ch_upper, fs, text_width(ch_upper, font, fs)))
+    return sum(adv for _ch, _fs, adv in glyphs), tuple(glyphs)
+
+
 def draw_small_caps(page, center_x: float, y: float, text: str,
                     large_size: float, small_size: float,
                     color: tuple = None, font: str = None) -> float:
@@ -24,21 +52,13 @@ def draw_small_caps(page, center_x: float, y: float, text: str,
         color = BLACK
     if font is None:
         font = FONT_BOLD
-    total_width = measure_small_caps_width(text, large_size, small_size, font=font)
+    total_width, glyphs = _small_caps_layout(text, large_size, small_size, font)
     x = center_x - total_width / 2
-
-    words = text.split()
-    for wi, word in enumerate(words):
-        if wi > 0:
-            space_w = fitz.get_text_length(' ', fontname=font, fontsize=large_size)
-            x += space_w
-
-        for ci, ch in enumerate(word):
-            ch_upper = ch.upper()
-            fs = large_size if ci == 0 else small_size
-            page.insert_text(fitz.Point(x, y), ch_upper,
+    for ch, fs, advance in glyphs:
+        if ch != ' ':
+            page.insert_text(fitz.Point(x, y), ch,
                              fontname=font, fontsize=fs, color=color)
-            x += fitz.get_text_length(ch_upper, fontname=font, fontsize=fs)
+        x += advance
 
 
 def measure_small_caps_width(text: str, large_size: float,
@@ -46,16 +66,7 @@ def measure_small_caps_width(text: str, large_size: float,
     """Measure total width of small-caps text."""
     if font is None:
         font = FONT_BOLD
-    total = 0
-    words = text.split()
-    for wi, word in enumerate(words):
-        if wi > 0:
-            total += fitz.get_text_length(' ', fontname=font, fontsize=large_size)
-        for ci, ch in enumerate(word):
-            ch_upper = ch.upper()
-            fs = large_size if ci == 0 else small_size
-            total += fitz.get_text_length(ch_upper, fontname=font, fontsize=fs)
-    return total
+    return _small_caps_layout(text, large_size, small_size, font)[0]
 
 
 def draw_oval(page, label: str, y_center: float, color: tuple = None,
@@ -65,7 +76,7 @@ def draw_oval(page, label: str, y_center: float, color: tuple = None,
         color = RED
     if font is None:
         font = FONT_BOLD
-    tw = fitz.get_text_length(label, fontname=font, fontsize=OVAL_LABEL_SIZE)
+    tw = text_width(label, font, OVAL_LABEL_SIZE)
     # Oval spans from Bars column to Floor column (wider than just text)
     text_w = tw + 40
     col_span_w = (COL_CENTERS[3] + 60) - (COL_CENTERS[1] - 60)
@@ -101,3 +112,42 @@ def draw_star_polygon(page, cx: float, cy: float, outer_r: float,
     shape.draw_polyline(points + [points[0]])
     shape.finish(fill=color, color=color)
     shape.commit()
+
+
+class PageChrome:
+    """Page furniture drawn once and stamped onto many pages.
+
+    Each distinct frame (keyed by the caller) is drawn onto a page of its
+    own scratch document, then placed on target pages with show_pdf_page().
+    The key must cover every input the frame is drawn from (titles, sizes,
+    fonts, colors): pages stamped with an equal key share one drawing.
+    PyMuPDF reuses the resulting Form XObject for every later stamp into
+    the same target document, so repeated frames cost one XObject
+    reference per page instead of their full drawing commands. Close it
+    after the target documents are saved.
+
+    Frames get separate documents because show_pdf_page() remembers a
+    source document's objects per target: a page added to a source after
+    it was first stamped cannot be stamped into the same target.
+
+    Stamp a page after drawing its own text: insert_text() also finds fonts
+    inside the page's Form XObjects and would then skip adding a font the
+    frame already uses to the page itself.
+    """
+
+    def __init__(self):
+        self._frames = {}  # key -> one-page scratch document
+
+    def stamp(self, page, key, draw) -> None:
+        """Stamp frame key onto page, calling draw(frame_page) on first use."""
+        key = (key, page.rect.width, page.rect.height)
+        frame_doc = self._frames.get(key)
+        if frame_doc is None:
+            frame_doc = self._frames[key] = fitz.open()
+            draw(frame_doc.new_page(width=page.rect.width, height=page.rect.height))
+        page.show_pdf_page(page.rect, frame_doc, 0)
+
+    def close(self) -> None:
+        for frame_doc in self._frames.values():
+            frame_doc.close()
+        self._frames.clear()
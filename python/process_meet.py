@@ -14,7 +14,6 @@ import json
 import os
 import re
 import shutil
-import sqlite3
 import sys
 import tempfile
 import zipfile
@@ -55,17 +54,22 @@ if not getattr(sys, 'frozen', False):
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from python.core.models import MeetConfig, LayoutParams
-from python.core.db_builder import build_database
+from python.core.db_builder import build_database, upgrade_schema
+from python.core.db_connection import connect, MeetDataSession
+from python.core.meet_archive import archive_meet
 from python.core.output_generator import generate_order_forms
 from python.core.pdf_generator import (
     generate_shirt_pdf, generate_gym_highlights_pdf,
     generate_gym_highlights_from_pdf,
 )
-from python.core.layout_engine import precompute_shirt_data
+from python.core.layout_engine import (
+    precompute_shirt_data, evaluate_layouts, expand_layout_grid, wide_names,
+)
 from python.core.constants import PAGE_H_LEGAL
 from python.core.idml_generator import generate_shirt_idml
 from python.core.idml_parser import idml_to_pdf, _load_metadata as _peek_metadata
 from python.core.meet_summary import generate_meet_summary
+from python.core.name_index import move_name_index
 from python.core.order_form_generator import generate_order_forms_pdf
 from python.core.gym_normalizer import normalize as normalize_gyms, print_gym_report
 from python.adapters.scorecat_adapter import ScoreCatAdapter
@@ -234,6 +238,14 @@ def main():
                         help='Skip parsing/DB build and regenerate specific outputs from existing DB. '
                              'Values: shirt, idml, order_forms, gym_highlights, summary, all. '
                              'E.g. --regenerate shirt  or  --regenerate all')
+    parser.add_argument('--evaluate-layouts', default=None, metavar='CANDIDATES',
+                        help='Score candidate shirt layouts against the existing DB without '
+                             'rendering, print LAYOUT_EVALUATION_JSON and exit. A JSON list of '
+                             'objects (layout fields such as line_spacing, max_fill, min_font_size, '
+                             'max_font_size, max_shirt_pages, plus level_groups / exclude_levels), '
+                             'or a JSON object of field -> list of values to try every combination. '
+                             'Inline JSON or a path to a .json file. Candidates override the '
+                             'saved/CLI layout.')
     parser.add_argument('--page-size', default='letter',
                         choices=['letter', 'legal'],
                         help='Default page size for all page groups: "letter" or "legal".')
@@ -260,6 +272,17 @@ def main():
                         help='Force overwrite of IDML-imported layouts during --regenerate. '
                              'Without this flag, --regenerate will refuse to overwrite a '
                              'back_of_shirt.pdf that was produced by --import-idml.')
+    parser.add_argument('--archive', default=None,
+                        help='Path to the multi-meet archive DB. After the build, this meet\'s '
+                             'results and winners are promoted into it (replacing any earlier copy).')
+    parser.add_argument('--in-memory-build', action='store_true',
+                        help='Build the database in memory and publish it to --db atomically when '
+                             'complete. Faster on slow (WSL/Windows) paths; readers never see a '
+                             'half-built DB.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-ingest corrected data for the meet already in --db: apply only the '
+                             'changed rows and recompute winners for the affected level/division '
+                             'groups. Keeps sticky layout params (shirt_layout.json).')
 
     args = parser.parse_args()
 
@@ -273,7 +296,8 @@ def main():
             parser.error('--meet is required')
 
     # --source and --data are required unless --regenerate, --import-idml, or --import-pdf is used
-    if args.regenerate is None and not args.import_idml and not _has_pdf_import:
+    if (args.regenerate is None and args.evaluate_layouts is None
+            and not args.import_idml and not _has_pdf_import):
         if not args.source:
             parser.error('--source is required unless --regenerate or --import-idml is used')
         if not args.data:
@@ -355,7 +379,7 @@ def main():
         # "2026 Nevada State Championships" — fix this before choosing output dir.
         if os.path.exists(db_path):
             try:
-                _conn = sqlite3.connect(db_path)
+                _conn = connect(db_path, 'read-mostly')
                 _row = _conn.execute(
                     'SELECT meet_name FROM winners WHERE LOWER(meet_name) = LOWER(?) LIMIT 1',
                     (config.meet_name,)
@@ -527,7 +551,7 @@ def main():
         has_meet_data = False
         if os.path.exists(db_path):
             try:
-                conn = sqlite3.connect(db_path)
+                conn = connect(db_path, 'read-mostly')
                 count = conn.execute(
                     'SELECT COUNT(*) FROM winners WHERE meet_name = ?',
                     (config.meet_name,)
@@ -542,6 +566,9 @@ def main():
                 print(f"Warning: Could not query database: {e}")
 
         if has_meet_data:
+            upgrade_schema(db_path)
+            meet_db = MeetDataSession(db_path)
+
             # Load sticky layout params
             _layout_dir = os.environ.get('DATA_DIR') or os.path.dirname(os.path.abspath(db_path))
             layout_json = os.path.join(_layout_dir, 'shirt_layout.json')
@@ -590,14 +617,14 @@ def main():
 
             if _has_legal:
                 _imp_div_list = _parse_division_order(args.division_order)
-                _gh_pre = precompute_shirt_data(db_path, config.meet_name,
+                _gh_pre = precompute_shirt_data(meet_db, config.meet_name,
                                                 layout=import_layout,
                                                 level_groups=args.level_groups,
                                                 exclude_levels=args.exclude_levels,
                                                 division_order=_imp_div_list)
                 _legal_lvs = []
                 _letter_lvs = []
-                for _lbl, _lvs in _gh_pre['page_groups']:
+                for _lbl, _lvs in _gh_pre.page_groups:
                     _filt_upper = {f.upper() for f in _legal_groups}
                     _label_match = any(f.upper() in _lbl.upper() for f in _legal_groups)
                     _level_match = bool({lv.upper() for lv in _lvs} & _filt_upper)
@@ -632,7 +659,7 @@ def main():
                     gh_path = os.path.join(args.output, 'gym_highlights.pdf')
                     tmp = _tmp_path_for(gh_path)
                     generate_gym_highlights_from_pdf(
-                        _letter_only_shirt, db_path, config.meet_name, tmp,
+                        _letter_only_shirt, meet_db, config.meet_name, tmp,
                         exclude_shirt_path=_legal_shirt,
                         font_family=import_layout.font_family,
                         accent_color=import_layout.accent_color)
@@ -647,7 +674,7 @@ def main():
                     # Exclude names from the LETTER-ONLY PDF, not the combined
                     # (combined has all names including legal, which would exclude everything)
                     generate_gym_highlights_from_pdf(
-                        _legal_shirt, db_path, config.meet_name, tmp,
+                        _legal_shirt, meet_db, config.meet_name, tmp,
                         exclude_shirt_path=_letter_only_shirt,
                         font_family=import_layout.font_family,
                         accent_color=import_layout.accent_color)
@@ -662,7 +689,7 @@ def main():
                     gh_legal = os.path.join(args.output, 'gym_highlights_8.5x14.pdf')
                     tmp = _tmp_path_for(gh_legal)
                     generate_gym_highlights_from_pdf(
-                        _legal_shirt, db_path, config.meet_name, tmp,
+                        _legal_shirt, meet_db, config.meet_name, tmp,
                         font_family=import_layout.font_family,
                         accent_color=import_layout.accent_color)
                     actual = _safe_move(tmp, gh_legal)
@@ -676,7 +703,7 @@ def main():
                     gh_path = os.path.join(args.output, 'gym_highlights.pdf')
                     tmp = _tmp_path_for(gh_path)
                     generate_gym_highlights_from_pdf(
-                        _letter_only_shirt, db_path, config.meet_name, tmp,
+                        _letter_only_shirt, meet_db, config.meet_name, tmp,
                         font_family=import_layout.font_family,
                         accent_color=import_layout.accent_color)
                     actual = _safe_move(tmp, gh_path)
@@ -694,7 +721,7 @@ def main():
                 order_path = os.path.join(args.output, 'order_forms.pdf')
                 tmp = _tmp_path_for(order_path)
                 _imp_of_div_list = _parse_division_order(args.division_order)
-                generate_order_forms_pdf(db_path, config.meet_name, tmp,
+                generate_order_forms_pdf(meet_db, config.meet_name, tmp,
                                          year=args.year, state=args.state,
                                          state_abbrev=args.state_abbrev,
                                          postmark_date=args.postmark_date,
@@ -715,7 +742,7 @@ def main():
             # Meet summary
             try:
                 summary_path = os.path.join(args.output, 'meet_summary.txt')
-                generate_meet_summary(db_path, config.meet_name, summary_path,
+                generate_meet_summary(meet_db, config.meet_name, summary_path,
                                       layout=import_layout,
                                       level_groups=args.level_groups,
                                       exclude_levels=args.exclude_levels)
@@ -723,6 +750,7 @@ def main():
             except Exception as e:
                 print(f"ERROR generating meet_summary.txt: {e}")
                 errors.append(('summary', str(e)))
+            meet_db.close()
 
             # Mark layout as imported and persist dates
             saved_layout['_source'] = 'imported'
@@ -761,6 +789,8 @@ def main():
 
     # --regenerate mode: skip parsing/DB build, just regenerate specified outputs
     regen = args.regenerate
+    if regen is None and args.evaluate_layouts is not None:
+        regen = []  # evaluation reads the existing DB, like --regenerate
     if regen is not None:
         # --regenerate with no values means 'all'
         if len(regen) == 0:
@@ -797,16 +827,18 @@ def main():
             if saved_layout.get('_source') != 'imported':
                 regen_set.add('gym_highlights')
 
-        print(f"Regenerating outputs from existing database: {', '.join(regen_set)}")
+        if args.evaluate_layouts is None:
+            print(f"Regenerating outputs from existing database: {', '.join(regen_set)}")
     else:
         regen_set = set()
         do_all = False  # Full pipeline builds DB only — outputs generated via regenerate_output
 
         # Reset sticky params for new meets — prevents leaking from previous meets
-        # (e.g., Nevada's level_groups and page_size_legal applied to Mississippi)
+        # (e.g., Nevada's level_groups and page_size_legal applied to Mississippi).
+        # An incremental re-ingest is the same meet, so its layout stays.
         _layout_dir = os.environ.get('DATA_DIR') or os.path.dirname(os.path.abspath(db_path))
         _layout_json = os.path.join(_layout_dir, 'shirt_layout.json')
-        if os.path.exists(_layout_json):
+        if not args.incremental and os.path.exists(_layout_json):
             os.remove(_layout_json)
             print("Reset sticky params (shirt_layout.json) for new meet")
 
@@ -871,14 +903,21 @@ def main():
 
         # Build database
         print(f"Building database at {db_path}...")
-        build_database(db_path, config, athletes)
+        build_database(db_path, config, athletes, incremental=args.incremental,
+                       in_memory=args.in_memory_build)
+        if args.archive:
+            archive_meet(args.archive, db_path, config)
+
+    # One read connection + result cache shared by every generator this run
+    upgrade_schema(db_path)
+    meet_db = MeetDataSession(db_path)
 
     # Division ordering — agent provides explicit order via --division-order
     _explicit = None
     if args.division_order:
         _explicit = _parse_division_order(args.division_order)
     division_order, div_warnings = detect_division_order(
-        db_path, config.meet_name, explicit_order=_explicit)
+        meet_db, config.meet_name, explicit_order=_explicit)
     print(f"Division order ({len(division_order)} divisions): {list(division_order.keys())}")
     for w in div_warnings:
         print(w)
@@ -954,6 +993,34 @@ def main():
         args.ship_date = saved_layout['ship_date']
         print(f"Restored saved ship date: {args.ship_date}")
 
+    # --evaluate-layouts: score candidate layouts without rendering, then exit
+    if args.evaluate_layouts is not None:
+        _spec = args.evaluate_layouts
+        if os.path.exists(_spec):
+            with open(_spec, 'r', encoding='utf-8') as f:
+                _spec = f.read()
+        try:
+            _candidates = json.loads(_spec)
+            if isinstance(_candidates, dict):
+                _candidates = expand_layout_grid(_candidates)
+            _reports = evaluate_layouts(meet_db, config.meet_name, _candidates,
+                                        base_layout=layout,
+                                        level_groups=args.level_groups,
+                                        exclude_levels=args.exclude_levels,
+                                        division_order=_parse_division_order(args.division_order))
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            print(f"Error: invalid --evaluate-layouts candidates: {e}")
+            sys.exit(1)
+        print(f"Evaluated {len(_reports)} candidate layout(s):")
+        for i, rep in enumerate(_reports[:20], start=1):
+            _sizes = ', '.join(f"{pg['name_size']}pt" for pg in rep['page_list'])
+            print(f"  #{i} {json.dumps(rep['candidate'])}: {rep['pages']} page(s) [{_sizes}]"
+                  + (f" -- {len(rep['warnings'])} warning(s)" if rep['warnings'] else ""))
+        if len(_reports) > 20:
+            print(f"  ... and {len(_reports) - 20} more")
+        print(f"LAYOUT_EVALUATION_JSON: {json.dumps(_reports)}")
+        sys.exit(0)
+
     # Require division_order for shirt/all outputs — alphabetical fallback is always wrong
     if (do_all or 'shirt' in regen_set) and not args.division_order:
         print("DIVISION_ORDER_REQUIRED: Cannot generate shirt outputs without division_order. "
@@ -969,7 +1036,7 @@ def main():
     if 'order_txt' in regen_set:
         try:
             orders_path = os.path.join(args.output, 'order_forms_by_gym.txt')
-            generate_order_forms(db_path, config.meet_name, orders_path)
+            generate_order_forms(meet_db, config.meet_name, orders_path)
             print(f"Generated {orders_path}")
         except Exception as e:
             print(f"ERROR generating order_forms_by_gym.txt: {e}")
@@ -984,14 +1051,14 @@ def main():
     pre = None
     if do_all or 'shirt' in regen_set:
         _div_list = _parse_division_order(args.division_order)
-        pre = precompute_shirt_data(db_path, config.meet_name,
+        pre = precompute_shirt_data(meet_db, config.meet_name,
                                     layout=layout,
                                     level_groups=args.level_groups,
                                     exclude_levels=args.exclude_levels,
                                     division_order=_div_list)
 
-        _flagged = pre.get('flagged_names', [])
-        _modified = pre.get('modified_names', [])
+        _flagged = pre.flagged_names
+        _modified = pre.modified_names
         if _modified:
             print(f"NAME_CLEANUP: {len(_modified)} name(s) were auto-cleaned:")
             for raw, cleaned, event, level in _modified[:20]:
@@ -1020,6 +1087,22 @@ def main():
             if _suspicious_items:
                 print(f"SUSPICIOUS_NAMES_JSON: {_json.dumps(_suspicious_items)}")
 
+        # Names that overlap the next column even at the minimum name size
+        _wide = wide_names(pre)
+        if _wide:
+            print(f"NAME_TOO_WIDE: {len(_wide)} name(s) are wider than their column "
+                  f"at the minimum name size:")
+            for name, event, level, width, limit in _wide[:20]:
+                print(f"  L{level} {event}: \"{name}\" {width}pt (column holds {limit:.0f}pt)")
+            if len(_wide) > 20:
+                print(f"  ... and {len(_wide) - 20} more")
+
+        # Pages vs. largest name size, to pick a --max-shirt-pages budget
+        if len(pre.page_frontier) > 1:
+            print("PAGE_FRONTIER: " + ", ".join(
+                f"{pages} page{'s' if pages > 1 else ''}: " + (f"{size}pt" if size else "-")
+                for pages, size in pre.page_frontier))
+
     # Guard against --regenerate destroying designer-edited IDML imports
     if (do_all or 'shirt' in regen_set) and args.regenerate is not None:
         if saved_layout.get('_source') == 'imported' and not args.force:
@@ -1034,13 +1117,14 @@ def main():
         try:
             pdf_path = os.path.join(args.output, 'back_of_shirt.pdf')
             tmp = _tmp_path_for(pdf_path)
-            generate_shirt_pdf(db_path, config.meet_name, tmp,
+            generate_shirt_pdf(meet_db, config.meet_name, tmp,
                                year=args.year, state=args.state,
                                layout=layout,
                                level_groups=args.level_groups,
                                exclude_levels=args.exclude_levels,
                                precomputed=pre)
             actual = _safe_move(tmp, pdf_path)
+            move_name_index(tmp, actual)
             print(f"Generated {actual}")
             # Save effective layout params so future runs reuse them
             # Note: to_sticky_dict() excludes sentinel keys (_source, _import_path,
@@ -1078,7 +1162,7 @@ def main():
             try:
                 legal_pdf = os.path.join(args.output, 'back_of_shirt_8.5x14.pdf')
                 tmp = _tmp_path_for(legal_pdf)
-                generate_shirt_pdf(db_path, config.meet_name, tmp,
+                generate_shirt_pdf(meet_db, config.meet_name, tmp,
                                    year=args.year, state=args.state,
                                    layout=layout,
                                    level_groups=args.level_groups,
@@ -1086,6 +1170,7 @@ def main():
                                    page_h=PAGE_H_LEGAL,
                                    page_group_filter=_filter)
                 actual = _safe_move(tmp, legal_pdf)
+                move_name_index(tmp, actual)
                 print(f"Generated {actual} (8.5x14)")
             except Exception as e:
                 print(f"ERROR generating back_of_shirt_8.5x14.pdf: {e}")
@@ -1094,7 +1179,7 @@ def main():
     if do_all or 'idml' in regen_set:
         try:
             idml_path = os.path.join(args.output, 'back_of_shirt.idml')
-            generate_shirt_idml(db_path, config.meet_name, idml_path,
+            generate_shirt_idml(meet_db, config.meet_name, idml_path,
                                 year=args.year, state=args.state,
                                 layout=layout,
                                 level_groups=args.level_groups,
@@ -1110,7 +1195,7 @@ def main():
             _filter = _legal_groups if any(_legal_groups) else None
             try:
                 legal_idml = os.path.join(args.output, 'back_of_shirt_8.5x14.idml')
-                generate_shirt_idml(db_path, config.meet_name, legal_idml,
+                generate_shirt_idml(meet_db, config.meet_name, legal_idml,
                                     year=args.year, state=args.state,
                                     layout=layout,
                                     level_groups=args.level_groups,
@@ -1130,7 +1215,7 @@ def main():
             _shirt_path = existing_shirt_pdf if os.path.exists(existing_shirt_pdf) else None
             tmp = _tmp_path_for(order_pdf_path)
             _of_div_list = _parse_division_order(args.division_order)
-            generate_order_forms_pdf(db_path, config.meet_name, tmp,
+            generate_order_forms_pdf(meet_db, config.meet_name, tmp,
                                      year=args.year, state=args.state,
                                      state_abbrev=args.state_abbrev,
                                      postmark_date=args.postmark_date,
@@ -1164,7 +1249,7 @@ def main():
                     gh_path = os.path.join(args.output, 'gym_highlights.pdf')
                     tmp = _tmp_path_for(gh_path)
                     generate_gym_highlights_from_pdf(
-                        letter_shirt, db_path, config.meet_name, tmp,
+                        letter_shirt, meet_db, config.meet_name, tmp,
                         exclude_shirt_path=legal_shirt,
                         font_family=layout.font_family,
                         accent_color=layout.accent_color)
@@ -1177,7 +1262,7 @@ def main():
                     gh_legal_path = os.path.join(args.output, 'gym_highlights_8.5x14.pdf')
                     tmp = _tmp_path_for(gh_legal_path)
                     generate_gym_highlights_from_pdf(
-                        legal_shirt, db_path, config.meet_name, tmp,
+                        legal_shirt, meet_db, config.meet_name, tmp,
                         exclude_shirt_path=letter_shirt,
                         font_family=layout.font_family,
                         accent_color=layout.accent_color)
@@ -1192,7 +1277,7 @@ def main():
                     gh_path = os.path.join(args.output, 'gym_highlights.pdf')
                     tmp = _tmp_path_for(gh_path)
                     generate_gym_highlights_from_pdf(
-                        letter_shirt, db_path, config.meet_name, tmp,
+                        letter_shirt, meet_db, config.meet_name, tmp,
                         font_family=layout.font_family,
                         accent_color=layout.accent_color)
                     actual = _safe_move(tmp, gh_path)
@@ -1207,14 +1292,14 @@ def main():
             if _has_legal:
                 _gh_div_list = _parse_division_order(args.division_order)
                 _gh_pre = pre if pre is not None else precompute_shirt_data(
-                    db_path, config.meet_name, layout=layout,
+                    meet_db, config.meet_name, layout=layout,
                     level_groups=args.level_groups,
                     exclude_levels=args.exclude_levels,
                     division_order=_gh_div_list)
                 _legal_filter = _legal_groups if any(_legal_groups) else None
                 _legal_lvs = []
                 _letter_lvs = []
-                for _lbl, _lvs in _gh_pre['page_groups']:
+                for _lbl, _lvs in _gh_pre.page_groups:
                     if _legal_filter is not None:
                         _filt_upper = {f.upper() for f in _legal_filter}
                         _label_match = any(f.upper() in _lbl.upper() for f in _legal_filter)
@@ -1232,7 +1317,7 @@ def main():
                 try:
                     gh_legal_path = os.path.join(args.output, 'gym_highlights_8.5x14.pdf')
                     tmp = _tmp_path_for(gh_legal_path)
-                    generate_gym_highlights_pdf(db_path, config.meet_name, tmp,
+                    generate_gym_highlights_pdf(meet_db, config.meet_name, tmp,
                                                 year=args.year, state=args.state,
                                                 layout=layout,
                                                 level_groups=args.level_groups,
@@ -1248,7 +1333,7 @@ def main():
             try:
                 gym_highlights_path = os.path.join(args.output, 'gym_highlights.pdf')
                 tmp = _tmp_path_for(gym_highlights_path)
-                generate_gym_highlights_pdf(db_path, config.meet_name, tmp,
+                generate_gym_highlights_pdf(meet_db, config.meet_name, tmp,
                                             year=args.year, state=args.state,
                                             layout=layout,
                                             level_groups=args.level_groups,
@@ -1264,7 +1349,7 @@ def main():
     if do_all or 'summary' in regen_set:
         try:
             summary_path = os.path.join(args.output, 'meet_summary.txt')
-            generate_meet_summary(db_path, config.meet_name, summary_path,
+            generate_meet_summary(meet_db, config.meet_name, summary_path,
                                   layout=layout,
                                   level_groups=args.level_groups,
                                   exclude_levels=args.exclude_levels,
@@ -1274,6 +1359,8 @@ def main():
             print(f"ERROR generating meet_summary.txt: {e}")
             errors.append(('summary', str(e)))
 
+    meet_db.close()
+
     # Clean up any leftover temp files in the output directory
     for tmp_file in glob.glob(os.path.join(args.output, 'tmp*.pdf')):
         try:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark the shirt page packer against the original greedy + balance pass.
+
+Usage:
+    python scripts/bench_bin_pack.py [--meets 2000] [--seed 1]
+
+Generates random meets (level lists with realistic winner counts per event),
+packs each with layout_engine.bin_pack_levels (exact linear partition) and
+with the original two-pass packer kept below as the baseline, and reports
+page counts, the tallest page (which sets the smallest font size), the
+spread between tallest and shortest page, and time per packing.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python.core.constants import (
+    EVENTS, LINE_HEIGHT_RATIO, LEVEL_GAP, DEFAULT_NAME_SIZE, MAX_PAGE_FILL, PAGE_H,
+)
+from python.core.layout_engine import bin_pack_levels, compute_layout, level_height
+
+LEVELS = ['10', '9', '8', '7', '6', '5', '4', '3', '2', '1']
+
+
+def legacy_bin_pack_levels(levels, data, available_height,
+                           line_height_ratio=LINE_HEIGHT_RATIO, level_gap=LEVEL_GAP,
+                           max_font_size=DEFAULT_NAME_SIZE, divider_size=None):
+    """The original greedy pass + 85%-of-target balancing pass (baseline)."""
+    line_height = max_font_size * line_height_ratio
+    heights = [level_height(lv, data, line_height, level_gap, divider_size=divider_size)
+               for lv in levels]
+    total = sum(heights)
+    if total <= available_height:
+        return [levels]
+    greedy_pages, current, current_h = [], [], 0
+    for lv, h in zip(levels, heights):
+        if current and current_h + h > available_height:
+            greedy_pages.append(current)
+            current, current_h = [lv], h
+        else:
+            current.append(lv)
+            current_h += h
+    if current:
+        greedy_pages.append(current)
+    num_pages = len(greedy_pages)
+    if num_pages <= 1:
+        return greedy_pages
+    target = total / num_pages
+    balanced, current, current_h, remaining_pages = [], [], 0, num_pages
+    for i, (lv, h) in enumerate(zip(levels, heights)):
+        if current and remaining_pages > 1:
+            over_target = current_h >= target * 0.85
+            would_overflow = current_h + h > available_height
+            enough_left = len(levels) - i >= remaining_pages
+            if (over_target and enough_left) or would_overflow:
+                balanced.append(current)
+                current, current_h = [], 0
+                remaining_pages -= 1
+        current.append(lv)
+        current_h += h
+    if current:
+        balanced.append(current)
+    return balanced if len(balanced) == num_pages else greedy_pages
+
+
+def synthetic_meet(rng):
+    """Random level subset with 1-40 winners per event per level."""
+    levels = [lv for lv in LEVELS if rng.random() < 0.8] or ['5']
+    scale = rng.choice([4, 10, 25, 40])
+    data = {ev: {lv: ['x'] * rng.randint(1, scale) for lv in levels} for ev in EVENTS}
+    return levels, data
+
+
+def page_heights(pages, data):
+    line_height = DEFAULT_NAME_SIZE * LINE_HEIGHT_RATIO
+    return [sum(level_height(lv, data, line_height, LEVEL_GAP) for lv in page) for page in pages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--meets', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    available = (PAGE_H - 18 - compute_layout()[4]) * MAX_PAGE_FILL
+    meets = [synthetic_meet(rng) for _ in range(args.meets)]
+
+    stats = {}
+    for label, packer in (('legacy', legacy_bin_pack_levels), ('exact', bin_pack_levels)):
+        start = time.perf_counter()
+        results = [packer(levels, data, available) for levels, data in meets]
+        elapsed = time.perf_counter() - start
+        stats[label] = (results, elapsed)
+
+    fewer, shorter, taller, multi = 0, 0, 0, 0
+    spreads = {'legacy': 0.0, 'exact': 0.0}
+    for (levels, data), old, new in zip(meets, stats['legacy'][0], stats['exact'][0]):
+        assert [lv for page in new for lv in page] == levels
+        if len(new) < len(old):
+            fewer += 1
+        if len(new) > len(old):
+            raise SystemExit('exact packer used more pages than the baseline')
+        if len(new) < 2:
+            continue
+        multi += 1
+        old_h, new_h = page_heights(old, data), page_heights(new, data)
+        if max(new_h) < max(old_h) - 1e-9:
+            shorter += 1
+        elif max(new_h) > max(old_h) + 1e-9:
+            taller += 1
+        spreads['legacy'] += max(old_h) - min(old_h)
+        spreads['exact'] += max(new_h) - min(new_h)
+
+    print(f'{args.meets} synthetic meets, {multi} needing more than one page')
+    print(f'  fewer pages than baseline:        {fewer}')
+    print(f'  shorter tallest page (bigger font): {shorter}')
+    print(f'  taller tallest page:               {taller}')
+    for label in ('legacy', 'exact'):
+        _, elapsed = stats[label]
+        print(f'  {label:>6}: {elapsed / args.meets * 1e6:7.1f} us/packing, '
+              f'mean tallest-shortest spread {spreads[label] / max(multi, 1):6.1f} pt')
+
+
+if __name__ == '__main__':
+    main()
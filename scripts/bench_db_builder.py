@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Benchmark the database builder on synthetic meets.
+
+Usage:
+    python scripts/bench_db_builder.py [--athletes 10000] [--repeat 3]
+
+Generates a synthetic meet (sessions x levels x divisions with realistic
+scores, ties and solo-session athletes), builds it with build_database
+(reporting how much of the build is row staging done before the write lock)
+and again in memory with an atomic publish,
+then times winner determination: the set-based engine against the original
+per-group loop (two SELECTs per session+level+division x event), and checks
+that both produce identical winners. Finally re-ingests the meet with 1% of
+scores corrected, incrementally and as a full rebuild, and compares each
+pragma profile in db_connection.PRAGMA_PROFILES against plain connections.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python.core import db_connection
+from python.core.constants import EVENTS
+from python.core.db_builder import (
+    build_database, _build_winners_score_based, _find_solo_sessions, _stage_result_rows,
+)
+from python.core.layout_engine import get_winners_by_event_and_level
+from python.core.models import MeetConfig
+
+CONFIG = MeetConfig(state='Benchmark', meet_name='2026 Benchmark State Championships',
+                    association='USAG', source_type='generic')
+
+LEVELS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'XB', 'XS', 'XG', 'XP', 'XD', 'XSA']
+DIVISIONS = ['Ch A', 'Ch B', 'Ch C', 'Jr A', 'Jr B', 'Jr C', 'Sr A', 'Sr B', 'Sr C']
+
+
+def synthetic_athletes(n: int, seed: int = 1) -> list[dict]:
+    """Generate n athletes spread over 45 sessions, with ties and solo groups."""
+    rng = random.Random(seed)
+    athletes = []
+    for i in range(n):
+        level = rng.choice(LEVELS)
+        division = rng.choice(DIVISIONS)
+        # Each level competes in three sessions, like a real state meet schedule
+        session = str(LEVELS.index(level) * 3 + rng.randint(1, 3))
+        # Scores on a 0.025 grid so ties occur naturally
+        events = {ev: round(rng.randint(300, 400) * 0.025, 3) for ev in EVENTS[:4]}
+        if rng.random() < 0.02:
+            events[rng.choice(EVENTS[:4])] = None  # scratched event
+        athletes.append({
+            'name': f'Athlete {i:05d}', 'gym': f'Gym {rng.randint(1, 120)}',
+            'session': session, 'level': level, 'division': division,
+            **events,
+            'aa': round(sum(v for v in events.values() if v), 3),
+            'rank': '', 'num': str(i),
+        })
+    # A few out-of-session accommodation athletes (solo in their own session)
+    for j in range(10):
+        athletes.append({
+            'name': f'Solo {j}', 'gym': 'Gym 1', 'session': '99',
+            'level': LEVELS[j], 'division': DIVISIONS[j % len(DIVISIONS)],
+            'vault': 9.0, 'bars': 9.0, 'beam': 9.0, 'floor': 9.0, 'aa': 36.0,
+            'rank': '', 'num': '',
+        })
+    return athletes
+
+
+def legacy_winners(conn: sqlite3.Connection, config: MeetConfig):
+    """The original per-group loop, kept here only as the timing baseline."""
+    cur = conn.cursor()
+    cur.execute('DELETE FROM winners WHERE meet_name = ?', (config.meet_name,))
+    solo_sessions = _find_solo_sessions(cur, config.meet_name)
+    cur.execute('''SELECT DISTINCT COALESCE(session,'') as session,
+                   COALESCE(level,'') as level,
+                   COALESCE(division,'') as division
+                   FROM results WHERE meet_name = ?
+                   ORDER BY level, division, session''', (config.meet_name,))
+    for session, level, division in cur.fetchall():
+        if (session, level, division) in solo_sessions:
+            continue
+        for event in EVENTS:
+            cur.execute(f'''SELECT MAX({event}) FROM results
+                           WHERE meet_name = ? AND session = ? AND level = ? AND division = ?
+                             AND {event} IS NOT NULL AND {event} > 0''',
+                        (config.meet_name, session, level, division))
+            max_score = cur.fetchone()[0]
+            if max_score is None:
+                continue
+            cur.execute(f'''SELECT name, gym FROM results
+                           WHERE meet_name = ? AND session = ? AND level = ? AND division = ?
+                             AND {event} = ?''',
+                        (config.meet_name, session, level, division, max_score))
+            winners = cur.fetchall()
+            is_tie = 1 if len(winners) > 1 else 0
+            for name, gym in winners:
+                cur.execute('''INSERT OR REPLACE INTO winners
+                    (state, meet_name, association, name, gym, session, level, division,
+                     event, score, is_tie)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (config.state, config.meet_name, config.association,
+                     name, gym or '', session, level, division, event, max_score, is_tie))
+
+
+def _winner_set(conn):
+    return sorted(conn.execute(
+        'SELECT name, gym, session, level, division, event, score, is_tie FROM winners'
+    ).fetchall())
+
+
+def _time(fn, conn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(conn, CONFIG)
+        best = min(best, time.perf_counter() - start)
+    conn.commit()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--athletes', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    athletes = synthetic_athletes(args.athletes)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        start = time.perf_counter()
+        _stage_result_rows(CONFIG, athletes)
+        t_stage = time.perf_counter() - start
+        start = time.perf_counter()
+        build_database(db_path, CONFIG, athletes)
+        t_build = time.perf_counter() - start
+        print(f'build_database: {len(athletes)} athletes in {t_build:.3f}s '
+              f'({t_stage * 1000:.1f} ms staging outside the write lock)')
+        start = time.perf_counter()
+        build_database(os.path.join(tmp, 'mem.db'), CONFIG, athletes, in_memory=True)
+        print(f'build_database(in_memory=True): {time.perf_counter() - start:.3f}s')
+
+        conn = sqlite3.connect(db_path)
+        try:
+            groups = conn.execute('SELECT COUNT(*) FROM (SELECT DISTINCT session, level, division '
+                                  'FROM results)').fetchone()[0]
+            t_legacy = _time(legacy_winners, conn, args.repeat)
+            legacy = _winner_set(conn)
+            t_set = _time(_build_winners_score_based, conn, args.repeat)
+            current = _winner_set(conn)
+        finally:
+            conn.close()
+
+    print(f'{groups} session/level/division groups, {len(current)} winner rows')
+    print(f'  per-group loop:   {t_legacy * 1000:8.1f} ms')
+    print(f'  set-based engine: {t_set * 1000:8.1f} ms  ({t_legacy / t_set:.1f}x)')
+    if legacy != current:
+        print('MISMATCH: set-based winners differ from the per-group loop')
+        sys.exit(1)
+    print('Winners identical.')
+
+    # Re-ingest with 1% of athletes' vault scores corrected
+    rng = random.Random(2)
+    corrected = [dict(a) for a in athletes]
+    for a in rng.sample(corrected, max(1, len(corrected) // 100)):
+        a['vault'] = round(rng.randint(300, 400) * 0.025, 3)
+    with tempfile.TemporaryDirectory() as tmp:
+        inc_path, full_path = os.path.join(tmp, 'inc.db'), os.path.join(tmp, 'full.db')
+        build_database(inc_path, CONFIG, athletes)
+        start = time.perf_counter()
+        build_database(inc_path, CONFIG, corrected, incremental=True)
+        t_inc = time.perf_counter() - start
+        start = time.perf_counter()
+        build_database(full_path, CONFIG, corrected)
+        t_full = time.perf_counter() - start
+        winner_sets = []
+        for path in (inc_path, full_path):
+            conn = sqlite3.connect(path)
+            winner_sets.append(_winner_set(conn))
+            conn.close()
+        same = winner_sets[0] == winner_sets[1]
+    print(f're-ingest with 1% corrected: incremental {t_inc * 1000:.1f} ms, '
+          f'full rebuild {t_full * 1000:.1f} ms')
+    if not same:
+        print('MISMATCH: incremental winners differ from a full rebuild')
+        sys.exit(1)
+
+
+    # Pragma profiles vs plain connections: build with bulk-build, read with read-mostly
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'profiles.db')
+        timings = {}
+        for label, tuned in (('default', False), ('tuned', True)):
+            saved = dict(db_connection.PRAGMA_PROFILES)
+            if not tuned:
+                for name in ('bulk-build', 'read-mostly'):
+                    db_connection.PRAGMA_PROFILES[name] = []
+            try:
+                start = time.perf_counter()
+                build_database(db_path, CONFIG, athletes)
+                t_build = time.perf_counter() - start
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    get_winners_by_event_and_level(db_path, CONFIG.meet_name)
+                t_read = (time.perf_counter() - start) / args.repeat
+            finally:
+                db_connection.PRAGMA_PROFILES.update(saved)
+            timings[label] = (t_build, t_read)
+    for label, (t_build, t_read) in timings.items():
+        print(f'{label:>8} pragmas: build {t_build * 1000:7.1f} ms, '
+              f'winners read {t_read * 1000:6.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
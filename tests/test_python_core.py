@@ -4,6 +4,7 @@ Verifies that the refactored adapters, db_builder, and output_generator
 produce results matching the prototype code.
 """
 
+import json
 import os
 import sys
 import sqlite3
@@ -14,8 +15,21 @@ import pytest
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from python.core.models import MeetConfig
-from python.core.db_builder import build_database
+from python.core.constants import (
+    EVENTS, LEVEL_DIVIDER_SIZE, LEVEL_GAP, LINE_HEIGHT_RATIO, MAX_PAGE_FILL, PAGE_H,
+)
+from python.core.models import LayoutParams, MeetConfig, PrecomputedShirt
+from python.core.db_builder import (
+    build_database, clean_athlete_name, read_group_stats, upgrade_schema,
+)
+from python.core.db_connection import PRAGMA_PROFILES, connect, MeetDataSession
+from python.core.font_metrics import font_metrics
+from python.core.layout_engine import (
+    LayoutMetrics, bin_pack_levels, column_width_limits, evaluate_layouts, expand_layout_grid,
+    fit_font_size, get_winners_by_event_and_level, layout_report, partition_heights,
+    precompute_shirt_data, precompute_cache_path, shirt_page_frontier,
+)
+from python.core.meet_archive import archive_meet, query_gym_winners
 from python.core.output_generator import generate_order_forms
 from python.adapters.scorecat_adapter import ScoreCatAdapter
 from python.adapters.html_adapter import HtmlAdapter
@@ -250,3 +264,1013 @@ class TestUtahOutputs:
         with open(expected_path) as f:
             expected = f.read()
         assert actual == expected, "Order forms content does not match expected"
+
+
+# ─── Winner determination (synthetic) ───────────────────────────────
+
+SYN_CONFIG = MeetConfig(
+    state='Testland',
+    meet_name='2026 Testland State Championships',
+    association='USAG',
+    source_type='generic',
+)
+
+
+def _athlete(name, session, level, division, vault=None, bars=None, beam=None,
+             floor=None, aa=None, gym='Gym A'):
+    return {'name': name, 'gym': gym, 'session': session, 'level': level,
+            'division': division, 'vault': vault, 'bars': bars, 'beam': beam,
+            'floor': floor, 'aa': aa, 'rank': '', 'num': ''}
+
+
+class TestWinnerDetermination:
+    """Ties, zero scores and solo-session exclusion in the set-based engine."""
+
+    @pytest.fixture
+    def winners(self, tmp_path):
+        athletes = [
+            # Session 1, Level 5, Jr A: tie on vault, zero bars never wins
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 0, 9.0, 9.1, 36.0),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.5, 0, 8.9, 9.3, 35.9),
+            # Session 2, Level 5, Jr A: out-of-session solo (Jr A competes in session 1)
+            _athlete('Cara Cole', '2', '5', 'Jr A', 9.9, 9.9, 9.9, 9.9, 39.6),
+            # Session 2, Level 6, Sr B: sole competitor at the meet, kept
+            _athlete('Dana Dunn', '2', '6', 'Sr B', 8.0, 8.0, 8.0, 8.0, 32.0),
+        ]
+        db_path = str(tmp_path / 'syn.db')
+        build_database(db_path, SYN_CONFIG, athletes)
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute('SELECT name, session, level, event, score, is_tie '
+                            'FROM winners ORDER BY id').fetchall()
+        conn.close()
+        return rows
+
+    def test_tie_marks_both(self, winners):
+        vault = [r for r in winners if r[2] == '5' and r[3] == 'vault']
+        assert sorted(r[0] for r in vault) == ['Amy Adams', 'Beth Brown']
+        assert all(r[5] == 1 for r in vault)
+
+    def test_zero_score_never_wins(self, winners):
+        assert not [r for r in winners if r[2] == '5' and r[3] == 'bars']
+
+    def test_out_of_session_solo_excluded(self, winners):
+        assert 'Cara Cole' not in {r[0] for r in winners}
+
+    def test_sole_competitor_kept(self, winners):
+        dana = [r for r in winners if r[0] == 'Dana Dunn']
+        assert [r[3] for r in dana] == ['vault', 'bars', 'beam', 'floor', 'aa']
+        assert all(r[5] == 0 for r in dana)
+
+    def test_group_stats_flags(self, tmp_path):
+        db_path = str(tmp_path / 'stats.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 0, 9.0, 9.1, 36.0),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 0, 8.9, 9.3, 35.9),
+            _athlete('Cara Cole', '2', '5', 'Jr A', 9.9, 9.9, 9.9, 9.9, 39.6),
+            _athlete('Dana Dunn', '2', '6', 'Sr B', 8.0, 8.0, 8.0, 8.0, 32.0),
+        ])
+        conn = sqlite3.connect(db_path)
+        stats = {(g['session'], g['level']): g
+                 for g in read_group_stats(conn.cursor(), SYN_CONFIG.meet_name)}
+        conn.close()
+        assert stats[('1', '5')]['athletes'] == 2 and stats[('1', '5')]['max_bars'] is None
+        assert stats[('1', '5')]['max_vault'] == 9.5
+        assert stats[('2', '5')]['is_excluded'] == 1
+        assert stats[('2', '6')]['is_solo'] == 1 and stats[('2', '6')]['is_excluded'] == 0
+        assert stats[('2', '6')]['solo_name'] == 'Dana Dunn'
+
+    def test_upgrade_fills_group_stats(self, tmp_path):
+        db_path = str(tmp_path / 'old.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Dana Dunn', '2', '6', 'Sr B', 8.0, 8.0, 8.0, 8.0, 32.0),
+        ])
+        # A database built before group_stats existed
+        conn = sqlite3.connect(db_path)
+        conn.execute('DROP TABLE group_stats')
+        conn.commit()
+        before = [g['solo_name'] for g in read_group_stats(conn.cursor(), SYN_CONFIG.meet_name)
+                  if g['is_solo'] and not g['is_excluded']]
+        conn.close()
+        upgrade_schema(db_path)
+        conn = sqlite3.connect(db_path)
+        after = [g['solo_name'] for g in read_group_stats(conn.cursor(), SYN_CONFIG.meet_name)
+                 if g['is_solo'] and not g['is_excluded']]
+        conn.close()
+        assert before == after == ['Amy Adams', 'Dana Dunn']
+
+    def test_group_stats_follow_rewritten_results(self, tmp_path):
+        from python.core.db_builder import _select_event_winners
+        from python.core.meet_summary import generate_meet_summary
+
+        db_path = str(tmp_path / 'central.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+            _athlete('Dana Dunn', '2', '6', 'Sr B', 8.0, 8.0, 8.0, 8.0, 32.0),
+        ])
+        staging = str(tmp_path / 'staging.db')
+        build_database(staging, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+            _athlete('Dana Dunn', '2', '6', 'Sr B', 8.0, 8.0, 8.0, 8.0, 32.0),
+            _athlete('Erin Ely', '2', '6', 'Sr B', 9.0, 7.0, 7.0, 7.0, 30.0),
+        ])
+
+        def summary():
+            out = str(tmp_path / 'summary.txt')
+            generate_meet_summary(db_path, SYN_CONFIG.meet_name, out)
+            with open(out, encoding='utf-8') as f:
+                return f.read()
+
+        def level6_vault():
+            conn = sqlite3.connect(db_path)
+            rows = _select_event_winners(conn.cursor(), SYN_CONFIG.meet_name)
+            conn.close()
+            return [r[0] for r in rows if r[3] == '6' and r[5] == 'vault']
+
+        assert 'Dana Dunn' in summary()
+        assert level6_vault() == ['Dana Dunn']
+
+        # The app's finalize step replaces the meet's results in place
+        conn = sqlite3.connect(db_path)
+        conn.execute('ATTACH DATABASE ? AS staging', (staging,))
+        conn.execute('DELETE FROM results WHERE meet_name = ?', (SYN_CONFIG.meet_name,))
+        columns = [r[1] for r in conn.execute('PRAGMA table_info(results)') if r[1] != 'id']
+        conn.execute(f'INSERT INTO results ({", ".join(columns)}) '
+                     f'SELECT {", ".join(columns)} FROM staging.results')
+        conn.commit()
+        conn.close()
+
+        assert 'Dana Dunn' not in summary()
+        assert 'Solo-session groups:  None' in summary()
+        upgrade_schema(db_path)
+        assert level6_vault() == ['Erin Ely']
+        assert 'Solo-session groups:  None' in summary()
+
+    def test_incremental_matches_full_rebuild(self, tmp_path):
+        base = [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+            _athlete('Cara Cole', '2', '5', 'Jr A', 9.9, 9.9, 9.9, 9.9, 39.6),
+            _athlete('Dana Dunn', '2', '6', 'Sr B', 8.0, 8.0, 8.0, 8.0, 32.0),
+            _athlete('Erin Ely', '2', '6', 'Sr B', 8.5, 7.0, 8.0, 8.1, 31.6),
+        ]
+        # Session 1 Jr A is withdrawn (Cara is no longer out-of-session),
+        # Erin's bars are corrected, and a late entry arrives as "JR A"
+        changed = [
+            base[2], base[3],
+            _athlete('Erin Ely', '2', '6', 'Sr B', 8.5, 8.2, 8.0, 8.1, 32.8),
+            _athlete('Faye Fox', '3', '7', 'JR A', 9.0, 9.0, 9.0, 9.0, 36.0),
+            _athlete('Gina Gray', '3', '7', 'Jr A', 9.1, 8.0, 8.0, 8.0, 33.1),
+        ]
+
+        def winner_set(db_path):
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute('SELECT name, session, level, division, event, score, is_tie '
+                                'FROM winners').fetchall()
+            conn.close()
+            return sorted(rows)
+
+        inc_path = str(tmp_path / 'inc.db')
+        build_database(inc_path, SYN_CONFIG, base)
+        build_database(inc_path, SYN_CONFIG, changed, incremental=True)
+        full_path = str(tmp_path / 'full.db')
+        build_database(full_path, SYN_CONFIG, changed)
+
+        assert winner_set(inc_path) == winner_set(full_path)
+        assert ('Cara Cole', '2', '5', 'Jr A', 'vault', 9.9, 0) in winner_set(inc_path)
+
+    def test_shirt_order_from_sort_key(self, tmp_path):
+        db_path = str(tmp_path / 'order.db')
+        build_database(db_path, SYN_CONFIG, [
+            # Vault tie in session 1 is broken by AA; session 2 before 10
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 8.5, 36.0),
+            _athlete('Zoe Zee', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.5, 37.0),
+            _athlete('Beth Brown', '10', '5', 'Jr A', 9.6, 9.0, 9.0, 9.0, 36.6),
+            _athlete('Bea Bell', '10', '5', 'Jr A', 9.1, 9.0, 9.0, 9.0, 36.1),
+            _athlete('Cara Cole', '2', '5', 'Jr A', 9.0, 9.0, 9.0, 9.0, 36.0),
+            _athlete('Cat Cruz', '2', '5', 'Jr A', 8.0, 9.0, 9.0, 9.0, 35.0),
+        ])
+        expected = ['Zoe Zee', 'Amy Adams', 'Cara Cole', 'Beth Brown']
+        _levels, data, _flagged, _modified = get_winners_by_event_and_level(
+            db_path, SYN_CONFIG.meet_name)
+        assert data['vault']['5'] == expected
+
+        # Databases without stored keys get them back from upgrade_schema
+        conn = sqlite3.connect(db_path)
+        conn.execute('UPDATE winners SET sort_key = NULL')
+        conn.commit()
+        conn.close()
+        upgrade_schema(db_path)
+        conn = sqlite3.connect(db_path)
+        assert conn.execute('SELECT COUNT(*) FROM winners WHERE sort_key IS NULL').fetchone()[0] == 0
+        conn.close()
+        _levels, data, _flagged, _modified = get_winners_by_event_and_level(
+            db_path, SYN_CONFIG.meet_name)
+        assert data['vault']['5'] == expected
+
+    def test_shirt_order_with_huge_numeric_session(self, tmp_path):
+        db_path = str(tmp_path / 'huge.db')
+        huge = str(1 << 70)
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', huge, '5', 'Jr A', 9.5, 9.0, 9.0, 9.0, 36.5),
+            _athlete('Abby Ames', huge, '5', 'Jr A', 9.0, 9.0, 9.0, 9.0, 36.0),
+            _athlete('Beth Brown', '2', '5', 'Jr A', 9.6, 9.0, 9.0, 9.0, 36.6),
+            _athlete('Bea Bell', '2', '5', 'Jr A', 9.1, 9.0, 9.0, 9.0, 36.1),
+            _athlete('Cara Cole', 'B', '5', 'Jr A', 9.0, 9.0, 9.0, 9.0, 36.0),
+            _athlete('Cat Cruz', 'B', '5', 'Jr A', 8.0, 9.0, 9.0, 9.0, 35.0),
+        ])
+        _levels, data, _flagged, _modified = get_winners_by_event_and_level(
+            db_path, SYN_CONFIG.meet_name)
+        assert data['vault']['5'] == ['Beth Brown', 'Amy Adams', 'Cara Cole']
+
+    def test_display_name_stored_and_reset_on_rename(self, tmp_path):
+        db_path = str(tmp_path / 'display.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy \u201cMandy\u201d Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+        ])
+        conn = sqlite3.connect(db_path)
+        rows = dict(((n, e), (d, s)) for n, e, d, s in conn.execute(
+            'SELECT name, event, display_name, suspicious_name FROM winners'))
+        assert rows[('Amy \u201cMandy\u201d Adams', 'vault')] == ('Amy Adams', 0)
+        assert rows[('Beth', 'bars')] == ('Beth', 1)
+
+        # A rename in place clears the stored display name; readers re-clean it
+        conn.execute("UPDATE winners SET name = 'Beth Brown' WHERE name = 'Beth'")
+        conn.commit()
+        assert conn.execute("SELECT DISTINCT display_name FROM winners "
+                            "WHERE name = 'Beth Brown'").fetchall() == [(None,)]
+        conn.close()
+        _levels, data, _flagged, _modified = get_winners_by_event_and_level(
+            db_path, SYN_CONFIG.meet_name)
+        assert data['bars']['5'] == ['Beth Brown']
+
+    def test_renamed_duplicate_merges(self, tmp_path):
+        db_path = str(tmp_path / 'merge.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Amy Adms', '1', '5', 'Jr A', 9.5, 8.0, 9.0, 9.0, 35.5, gym='Gym B'),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+        ])
+        # The same athlete listed under two gyms, one row's name fixed in place
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE winners SET name = 'Amy Adams' WHERE name = 'Amy Adms'")
+        conn.commit()
+        conn.close()
+        for name_sort in ('age', 'alpha'):
+            _levels, data, flagged, _modified = get_winners_by_event_and_level(
+                db_path, SYN_CONFIG.meet_name, name_sort=name_sort)
+            assert data['vault']['5'] == ['Amy Adams']
+            assert flagged == []
+
+
+class TestMeetArchive:
+    """Promoting staging DBs into the multi-meet archive."""
+
+    def test_promote_two_meets_and_repromote(self, tmp_path):
+        other = MeetConfig(state='Testland', meet_name='2025 Testland State Championships',
+                           association='USAG', source_type='generic', year='2025')
+        archive = str(tmp_path / 'archive.db')
+        for config in (SYN_CONFIG, other):
+            staging = str(tmp_path / f'{config.year or "x"}.db')
+            build_database(staging, config, [
+                _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+                _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8, gym='Gym B'),
+            ])
+            archive_meet(archive, staging, config)
+        # Promoting the same meet again replaces rather than duplicates
+        archive_meet(archive, staging, other)
+
+        rows = query_gym_winners(archive, 'Gym A')
+        assert {r[0] for r in rows} == {SYN_CONFIG.meet_name, other.meet_name}
+        assert len(rows) == 2 * 2  # vault + beam per meet
+        assert {r[0] for r in query_gym_winners(archive, 'Gym A', year='2025')} == {other.meet_name}
+        conn = sqlite3.connect(archive)
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('SELECT COUNT(*) FROM results').fetchone()[0] == 4
+        conn.close()
+
+
+class TestStagedResults:
+    """Rows staged before the write lock match the old per-row insert loop."""
+
+    ATHLETES = [
+        _athlete('Amy Adams VT', '1', '5', 'Jr A', 9.5, 9.0, 'abc', 9.1, 36.6),
+        _athlete('Cher', '1', '5', 'Jr A', 9.5, 9.0, 9.0, float('nan'), 36.6),
+        _athlete('Jo Lee (Gym X)', '1', '5', 'Jr A', 9.5, '9.0', 9.0, 9.1, ''),
+        _athlete('Kim Park XYZ', '1', '5', 'Jr A', 9.5, 9.0, 'Infinity', 9.1, None),
+        _athlete('Ann Vault Lee', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+        _athlete('Tia Lo 1', '1', '5', 'Jr A', 9.5, 'n/a', 9.0, 9.1, 36.6),
+        _athlete('Liz Ng  ', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+    ]
+
+    def test_rows_match_per_row_cleaning(self, capsys):
+        from python.core.db_builder import _stage_result_rows, _to_float
+        from python.core.layout_engine import clean_name_for_shirt, flag_suspicious_name
+
+        expected, cleaned = [], 0
+        for a in self.ATHLETES:
+            name = clean_athlete_name(a['name'])
+            cleaned += name != a['name']
+            scores = [_to_float(a[ev]) for ev in ('vault', 'bars', 'beam', 'floor', 'aa')]
+            display = clean_name_for_shirt(name)
+            expected.append((name, scores, display, flag_suspicious_name(display)))
+        old_out = capsys.readouterr().out
+
+        rows, names_cleaned = _stage_result_rows(SYN_CONFIG, self.ATHLETES)
+        assert capsys.readouterr().out == old_out
+        assert old_out.count('SCORE_TYPE_WARNING') == 4
+        assert names_cleaned == cleaned == 2
+        assert [(r[3], list(r[9:14]), r[16], r[18]) for r in rows] == expected
+        assert [r[17] for r in rows] == [1 if e[3] else 0 for e in expected]
+        assert [r[16] for r in rows] == ['Amy Adams', 'Cher', 'Jo Lee', 'Kim Park XYZ',
+                                         'Ann Vault Lee', 'Tia Lo 1', 'Liz Ng']
+
+    def test_flagged_names_match_per_row_cleaning(self, tmp_path, capsys):
+        db_path = str(tmp_path / 'staged.db')
+        build_database(db_path, SYN_CONFIG, self.ATHLETES)
+        out = capsys.readouterr().out
+        assert out.count('SCORE_TYPE_WARNING') == 4
+        assert 'stripped event code suffixes from 2 athlete names' in out
+        stored = get_winners_by_event_and_level(db_path, SYN_CONFIG.meet_name)
+
+        # NULL display names make the reader clean and flag each row itself
+        conn = sqlite3.connect(db_path)
+        conn.execute('UPDATE winners SET display_name = NULL, suspicious_name = NULL, '
+                     'suspicious_reason = NULL')
+        conn.commit()
+        conn.close()
+        per_row = get_winners_by_event_and_level(db_path, SYN_CONFIG.meet_name)
+        assert stored == per_row
+        _, _, flagged, modified = stored
+        assert {f[0] for f in flagged} == {'Cher', 'Kim Park XYZ', 'Ann Vault Lee', 'Tia Lo 1'}
+        assert modified == []  # parentheticals are stripped at build time
+
+
+class TestInMemoryBuild:
+    """In-memory build published over an existing on-disk DB."""
+
+    def test_in_memory_matches_on_disk(self, tmp_path):
+        athletes = [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.5, 9.2, 8.9, 9.3, 36.9),
+        ]
+        disk_path = str(tmp_path / 'disk.db')
+        mem_path = str(tmp_path / 'mem.db')
+        build_database(disk_path, SYN_CONFIG, athletes)
+        build_database(mem_path, SYN_CONFIG, athletes[:1])  # stale DB to be replaced
+        build_database(mem_path, SYN_CONFIG, athletes, in_memory=True)
+
+        def dump(path):
+            conn = sqlite3.connect(path)
+            rows = [conn.execute(f'SELECT * FROM {t} ORDER BY id').fetchall()
+                    for t in ('results', 'winners')]
+            conn.close()
+            return rows
+
+        assert dump(mem_path) == dump(disk_path)
+        assert sorted(os.listdir(tmp_path)) == ['disk.db', 'mem.db']  # no temp files left
+
+
+class TestConnectProfiles:
+    """connect() applies the named profile's pragmas."""
+
+    # PRAGMA reads return numbers for these settings
+    SYMBOLIC = {'synchronous': {'OFF': 0, 'NORMAL': 1, 'FULL': 2},
+                'temp_store': {'DEFAULT': 0, 'FILE': 1, 'MEMORY': 2},
+                'query_only': {'OFF': 0, 'ON': 1}}
+
+    def test_unknown_profile(self, tmp_path):
+        with pytest.raises(ValueError, match='read-only'):
+            connect(str(tmp_path / 'x.db'), 'read-only')
+        assert not os.path.exists(tmp_path / 'x.db')
+
+    @pytest.mark.parametrize('profile', sorted(PRAGMA_PROFILES))
+    def test_pragmas_applied(self, profile, tmp_path):
+        db_path = str(tmp_path / 'p.db')
+        sqlite3.connect(db_path).close()
+        conn = connect(db_path, profile)
+        try:
+            for name, value in PRAGMA_PROFILES[profile]:
+                actual = conn.execute(f'PRAGMA {name}').fetchone()[0]
+                expected = self.SYMBOLIC.get(name, {}).get(value, value)
+                if isinstance(expected, str):
+                    actual, expected = actual.upper(), expected.upper()
+                assert actual == expected, name
+        finally:
+            conn.close()
+
+    def test_profile_settings(self, tmp_path):
+        db_path = str(tmp_path / 'p.db')
+        sqlite3.connect(db_path).close()
+
+        def read(profile):
+            conn = connect(db_path, profile)
+            try:
+                return [conn.execute(f'PRAGMA {name}').fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'cache_size', 'query_only')]
+            finally:
+                conn.close()
+
+        journal, sync, _, _ = read('default')  # SQLite's build defaults
+        assert read('bulk-build') == ['memory', 0, -64000, 0]
+        assert read('read-mostly') == [journal, sync, -32000, 1]
+        assert read('archive') == ['wal', 1, -64000, 0]
+        conn = connect(db_path, 'read-mostly')
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute('CREATE TABLE t (x)')
+        conn.close()
+
+
+class TestMeetDataSession:
+    """One shared connection and cached result sets per generation run."""
+
+    def test_session_matches_path_and_shares_connection(self, ia_db, tmp_path):
+        db_path, _ = ia_db
+        expected = get_winners_by_event_and_level(db_path, IA_CONFIG.meet_name)
+        with MeetDataSession(db_path) as session:
+            conn = connect(session, 'read-mostly')
+            conn.close()  # helpers' close() must not close the shared connection
+            assert connect(session, 'read-mostly') is conn
+            assert conn.execute('SELECT 1').fetchone() == (1,)
+            first = get_winners_by_event_and_level(session, IA_CONFIG.meet_name)
+            first[0].clear()  # callers get a copy, not the cached object
+            assert get_winners_by_event_and_level(session, IA_CONFIG.meet_name) == expected
+            orders_path = str(tmp_path / 'orders.txt')
+            generate_order_forms(session, IA_CONFIG.meet_name, orders_path)
+            assert os.path.getsize(orders_path) > 0
+
+
+class TestPrecomputeCache:
+    """precompute_shirt_data results persisted next to the DB across runs."""
+
+    def test_reused_until_db_changes(self, tmp_path):
+        db_path = str(tmp_path / 'cache.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+        ])
+        fresh = precompute_shirt_data(db_path, SYN_CONFIG.meet_name, use_cache=False)
+        assert precompute_shirt_data(db_path, SYN_CONFIG.meet_name) == fresh
+        assert os.path.exists(precompute_cache_path(db_path))
+        # Served from the file, tuples included
+        assert precompute_shirt_data(db_path, SYN_CONFIG.meet_name) == fresh
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE winners SET name = 'Amy Allen' WHERE name = 'Amy Adams'")
+        conn.commit()
+        conn.close()
+        pre = precompute_shirt_data(db_path, SYN_CONFIG.meet_name)
+        assert pre.data['vault']['5'] == ('Amy Allen',)
+
+
+class TestPrecomputedShirt:
+    """Frozen precompute result: page index, level views, compact form."""
+
+    def test_views_and_round_trip(self, tmp_path):
+        db_path = str(tmp_path / 'pre.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+            _athlete('Beth Brown', '1', 'XG', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8),
+        ])
+        pre = precompute_shirt_data(db_path, SYN_CONFIG.meet_name, use_cache=False)
+        assert [lvs for _label, lvs in pre.page_groups] == [('XG',), ('5',)]
+        assert pre.name_pages['Amy Adams'] == (1,)
+        with pytest.raises(AttributeError):
+            pre.levels = ()
+
+        view = pre.with_levels(['5'])
+        assert view.page_groups == (('LEVEL 5', ('5',)),)
+        assert view.name_pages == {'Amy Adams': (0,)}
+        assert view.data is not pre.data and view.data['vault']['5'] is pre.data['vault']['5']
+
+        assert PrecomputedShirt.from_dict(json.loads(json.dumps(pre.to_dict()))) == pre
+
+
+    def test_nonstandard_level_order(self, tmp_path):
+        db_path = str(tmp_path / 'levels.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', 'Open', 'Jr A', 9.5, None, None, None, None),
+            _athlete('Beth Brown', '1', 'HOPES', 'Jr A', None, 9.2, None, None, None),
+            _athlete('Cara Cole', '1', 'Elite', 'Jr A', None, None, None, 9.1, None),
+            _athlete('Dana Dunn', '1', '7', 'Jr A', 9.0, 9.0, 9.0, 9.0, 36.0),
+            _athlete('Erin Ely', '1', 'Bronze', 'Jr A', 9.0, 9.0, 9.0, 9.0, 36.0),
+            _athlete('Faye Fox', '1', 'Aspire', 'Jr A', None, None, 9.3, 9.3, None),
+        ])
+        # Page order of levels that are neither numeric nor Xcel follows the
+        # order SQLite lists the meet's distinct levels in
+        conn = sqlite3.connect(db_path)
+        listed = [lv for (lv,) in conn.execute('SELECT DISTINCT level FROM winners '
+                                               'WHERE meet_name = ?', (SYN_CONFIG.meet_name,))]
+        conn.close()
+        other = {'Open', 'HOPES', 'Elite', 'Aspire'}
+        pre = precompute_shirt_data(db_path, SYN_CONFIG.meet_name, use_cache=False)
+        on_pages = [lv for _label, lvs in pre.page_groups for lv in lvs if lv in other]
+        assert on_pages == [lv for lv in listed if lv in other]
+        assert sorted(on_pages) == sorted(other)
+
+
+class TestShirtChrome:
+    """Shared title/header frames are only reused for identical chrome."""
+
+    def test_year_or_state_change_redraws_frame(self, tmp_path):
+        fitz = pytest.importorskip('fitz')
+        from python.core.pdf_generator import add_shirt_back_pages
+        from python.core.rendering_utils import PageChrome
+
+        db_path = str(tmp_path / 'chrome.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6),
+        ])
+        pre = precompute_shirt_data(db_path, SYN_CONFIG.meet_name, use_cache=False)
+        doc = fitz.open()
+        chrome = PageChrome()
+        for year, state in (('2025', 'Iowa'), ('2026', 'Iowa'), ('2026', 'Utah')):
+            add_shirt_back_pages(doc, pre, 'Amy Adams', year, state, chrome=chrome)
+        texts = [' '.join(page.get_text().split()) for page in doc]
+        doc.close()
+        chrome.close()
+        assert ['2025' in t for t in texts] == [True, False, False]
+        assert ['IOWA' in t.upper() for t in texts] == [True, True, False]
+        assert 'UTAH' in texts[2].upper()
+
+
+def _greedy_split(heights, capacity):
+    """The pre-DP packer: start a new page when the next item won't fit."""
+    pages, start, total = [], 0, 0.0
+    for i, h in enumerate(heights):
+        if i > start and total + h > capacity:
+            pages.append((start, i))
+            start, total = i, 0.0
+        total += h
+    pages.append((start, len(heights)))
+    return pages
+
+
+class TestPartitionHeights:
+    """Exact contiguous page split: fewest pages, shortest tallest page."""
+
+    CASES = [
+        ([100, 200, 150, 80, 300, 50, 120], 400),
+        ([390, 20, 20, 20, 370, 10], 400),
+        ([100] * 9, 300),
+        ([50, 650, 60, 70], 400),         # single item taller than a page
+        ([250, 10, 10, 10, 10, 10, 250], 300),
+        ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 20),
+    ]
+
+    @pytest.mark.parametrize('heights, capacity', CASES)
+    def test_split(self, heights, capacity):
+        pages = partition_heights(heights, capacity)
+        greedy = _greedy_split(heights, capacity)
+        # Contiguous, in order, covering every item
+        assert pages[0][0] == 0 and pages[-1][1] == len(heights)
+        assert all(a[1] == b[0] and a[0] < a[1] for a, b in zip(pages, pages[1:]))
+        assert len(pages) == len(greedy)
+        page_h = [sum(heights[a:b]) for a, b in pages]
+        for (a, b), h in zip(pages, page_h):
+            assert h <= capacity or b - a == 1  # only a lone oversize item overflows
+        assert max(page_h) <= max(sum(heights[a:b]) for a, b in greedy)
+
+    def test_oversize_item_gets_own_page(self):
+        assert partition_heights([50, 650, 60], 400) == [(0, 1), (1, 2), (2, 3)]
+        assert partition_heights([], 400) == []
+
+
+class TestShirtPageFrontier:
+    """Largest name size per page budget, solved without a size sweep."""
+
+    def test_frontier_matches_packing(self):
+        levels = ['10', '9', '8', '7', '6', '5', '4', '3']
+        counts = [30, 12, 25, 8, 40, 18, 22, 35]
+        data = {ev: {lv: ['x'] * n for lv, n in zip(levels, counts)} for ev in EVENTS}
+        available = 600.0
+        sizes = shirt_page_frontier([levels], data, available, max_pages=4)
+        assert sizes == sorted(sizes)  # more pages never shrink the names
+        for pages, size in enumerate(sizes, start=1):
+            if size is None or size == float('inf'):
+                continue
+            assert len(bin_pack_levels(levels, data, available, max_font_size=size - 1e-6)) <= pages
+            assert len(bin_pack_levels(levels, data, available, max_font_size=size + 1e-3)) > pages
+
+
+class TestColumnWidths:
+    """Name sizes capped so the longest name fits its column."""
+
+    LONG = 'Maximiliana Wolfeschlegelstein'
+
+    def test_text_widths(self):
+        times = font_metrics('Times-Roman')
+        # AFM widths; accented letters are measured as drawn
+        assert times.text_widths(['AV', 'Zo\u00eb M\u00fcller', ''], 10) == pytest.approx([14.44, 45.27, 0])
+        assert font_metrics('helv').text_width('Ii', 1000) == pytest.approx(500)
+        with pytest.raises(ValueError):
+            font_metrics('Courier')
+
+    def test_fit_caps_long_names(self):
+        levels = ['10', '9']
+        data = {ev: {lv: [f'Gymnast {i}' for i in range(5)] for lv in levels} for ev in EVENTS}
+        data['floor']['9'] = data['floor']['9'] + [self.LONG]
+        assert fit_font_size(levels, data) == 9
+        size = fit_font_size(levels, data, font='Times-Roman')
+        limit = column_width_limits()[EVENTS.index('floor')]
+        width = font_metrics('Times-Roman').text_width(self.LONG, 1)
+        assert width * size <= limit < width * (size + 0.1)
+        assert fit_font_size(['10'], data, font='Times-Roman') == 9
+
+        metrics = LayoutMetrics(data, font='Times-Roman')
+        assert metrics.overflowing_names(levels, size) == []
+        assert [n[:3] for n in metrics.overflowing_names(levels, 9)] == [(self.LONG, 'floor', '9')]
+
+        # Packed at its capped size, level 9 is shorter and shares a page
+        caps = {lv: metrics.size_cap([lv]) for lv in levels}
+        available = sum(fixed + rows * 9 * 1.15 for fixed, rows in
+                        (metrics.group_metrics([lv]) for lv in levels)) - 1
+        assert len(bin_pack_levels(levels, data, available)) == 2
+        assert bin_pack_levels(levels, data, available, size_caps=caps) == [levels]
+
+
+def _step_up_fit(fits, min_name_size, max_font_size):
+    """The pre-LayoutMetrics search: step up from min at 1.0, 0.5, 0.2, 0.1pt."""
+    if fits(max_font_size):
+        return max_font_size
+    if not fits(min_name_size):
+        return min_name_size
+    best = min_name_size
+    for step in [1.0, 0.5, 0.2, 0.1]:
+        candidate = best + step
+        while candidate <= max_font_size + 0.001:
+            if fits(candidate):
+                best = candidate
+                candidate += step
+            else:
+                break
+    return round(best, 1)
+
+
+class TestFitFontSize:
+    """Closed-form fit against the old step-up search."""
+
+    NAMES = ['Al Li', 'Gymnast Number', 'Annabelle Montgomery-Hughes',
+             TestColumnWidths.LONG + ' Jr']
+
+    @pytest.mark.parametrize('font', [None, 'Times-Roman', 'helv'])
+    @pytest.mark.parametrize('min_size, max_size', [(6.5, 9), (5, 12), (7.3, 8.1), (6, 6)])
+    def test_matches_step_up_search(self, font, min_size, max_size):
+        levels = ['10', '9', '8']
+        limits = column_width_limits()
+        widths = font_metrics(font).text_widths(self.NAMES) if font else None
+        # Row totals from well under to well over a page at every size
+        for counts in ([n // 3, n // 3 + 1, n - 2 * (n // 3) - 1] for n in range(6, 130, 4)):
+            for longest in range(len(self.NAMES)):
+                data = {ev: {lv: [self.NAMES[(i + j) % (longest + 1)] for j in range(n)]
+                             for i, (lv, n) in enumerate(zip(levels, counts))}
+                        for ev in EVENTS}
+                available = (PAGE_H - 18 - 121) * MAX_PAGE_FILL
+
+                def fits(size):
+                    lh = size * LINE_HEIGHT_RATIO
+                    height = sum(LEVEL_GAP + LEVEL_DIVIDER_SIZE * 1.3 +
+                                 max(len(data[ev][lv]) for ev in EVENTS) * lh + 1
+                                 for lv in levels)
+                    if height > available:
+                        return False
+                    return widths is None or all(
+                        widths[self.NAMES.index(name)] * size <= limit
+                        for limit, ev in zip(limits, EVENTS)
+                        for lv in levels for name in data[ev][lv])
+
+                old = _step_up_fit(fits, min_size, max_size)
+                new = fit_font_size(levels, data, min_name_size=min_size,
+                                    max_font_size=max_size, font=font)
+                assert new in (old, round(old - 0.1, 1)), (counts, longest, old, new)
+                assert LayoutMetrics(data, font=font).fit_font_size(
+                    levels, min_name_size=min_size, max_font_size=max_size) == new
+
+
+class TestEvaluateLayouts:
+    """Candidate layouts scored from one winners fetch, without rendering."""
+
+    def test_matches_precompute(self, tmp_path):
+        db_path = str(tmp_path / 'eval.db')
+        build_database(db_path, SYN_CONFIG, [
+            _athlete(f'Gymnast {i}', '1', level, 'Jr A', 9.0 + i / 100, 9.0, 9.0, 9.0, 36.0 + i / 100)
+            for level in ('10', '9', '8') for i in range(30)
+        ])
+        candidates = expand_layout_grid({'max_font_size': [9, 12], 'max_fill': [0.5, 0.9]})
+        candidates.append({'level_groups': '10;9,8'})
+        reports = evaluate_layouts(db_path, SYN_CONFIG.meet_name, candidates)
+        assert len(reports) == 5
+        for cand, report in zip(candidates, reports):
+            assert report['candidate'] == cand
+            fields = {k: v for k, v in cand.items() if k != 'level_groups'}
+            pre = precompute_shirt_data(db_path, SYN_CONFIG.meet_name, layout=LayoutParams(**fields),
+                                        level_groups=cand.get('level_groups'), use_cache=False)
+            assert report['page_list'] == layout_report(pre)['page_list']
+            assert report['pages'] == len(pre.page_groups)
+        assert [p['levels'] for p in reports[-1]['page_list']] == [['10'], ['9', '8']]
+        with pytest.raises(ValueError):
+            evaluate_layouts(db_path, SYN_CONFIG.meet_name, [{'page_size': 'legal'}])
+
+
+# ─── Name cleaning regression corpus ────────────────────────────────
+# One entry per known suffix format (see _CLEANUP_PATTERNS), plus names
+# that must survive untouched.
+
+NAME_CORPUS = [
+    # 1. Parenthetical, optional * prefix
+    ('Kelly*(V,BB,FX)', 'Kelly'),
+    ('Name (VT)', 'Name'),
+    # 2. ** / * followed by codes
+    ('Addie Wolff **V/BB/FX', 'Addie Wolff'),
+    ('Jane Doe ** BB, FX', 'Jane Doe'),
+    # 3. Lone ** / *
+    ('Sara Lin **', 'Sara Lin'),
+    ('Sara Lin*', 'Sara Lin'),
+    # 4. Dash-prefixed codes
+    ('Holder- BB, FX', 'Holder'),
+    ('Mia Cruz - VT, FX', 'Mia Cruz'),
+    # 5. IES prefix
+    ('Ava Hart IES VT,BB', 'Ava Hart'),
+    # 6. Space-separated codes, any separator, trailing separators
+    ('Jane Smith VT,BB,FX', 'Jane Smith'),
+    ('Jane Smith VT BB', 'Jane Smith'),
+    ('Raygan Jones  BB', 'Raygan Jones'),
+    ('Bella Estrada VT,', 'Bella Estrada'),
+    ('Emma Stone V/', 'Emma Stone'),
+    ('Lily Chen Beam, Floor', 'Lily Chen'),
+    ('Ruby Fox UB/BB', 'Ruby Fox'),
+    ('Ivy Park AA', 'Ivy Park'),
+    # 7. Attached uppercase codes
+    ('PrevendarVT,BB,FX', 'Prevendar'),
+    # Clean names, including lowercase code lookalikes
+    ('Ella Webb', 'Ella Webb'),
+    ('Abby Robb', 'Abby Robb'),
+    ('Vivian Bell', 'Vivian Bell'),
+    ("Mary-Kate O'Neil", "Mary-Kate O'Neil"),
+    ('', ''),
+]
+
+
+class TestNameCleaning:
+    @pytest.mark.parametrize('raw, expected', NAME_CORPUS)
+    def test_corpus(self, raw, expected):
+        assert clean_athlete_name(raw) == expected
+
+
+# ─── PDF outputs (need PyMuPDF) ─────────────────────────────────────
+
+SHIRT_ATHLETES = [
+    _athlete('Amy Adams', '1', '5', 'Jr A', 9.5, 9.0, 9.0, 9.1, 36.6, gym='Gym A'),
+    _athlete('Beth Brown', '1', '5', 'Jr A', 9.4, 9.2, 8.9, 9.3, 36.8, gym='Gym B'),
+    _athlete('Cara Cole', '1', '5', 'Sr A', 9.1, 9.3, 9.4, 8.8, 36.6, gym='Gym A'),
+    _athlete('Dana Dunn', '1', '5', 'Sr A', 9.0, 9.0, 9.0, 9.0, 36.0, gym='Gym B'),
+    _athlete('Erin Ely', '2', '6', 'Jr A', 8.5, 8.7, 8.0, 8.1, 33.3, gym='Gym A'),
+    _athlete('Faye Fox', '2', '6', 'Jr A', 8.6, 8.2, 8.4, 8.0, 33.2, gym='Gym C'),
+    _athlete('Gina Gray', '2', 'XG', 'Jr A', 9.2, 9.0, 9.1, 9.0, 36.3, gym='Gym C'),
+    _athlete('Hope Hill', '2', 'XG', 'Jr A', 9.1, 9.1, 9.0, 9.2, 36.4, gym='Gym A'),
+]
+
+
+@pytest.fixture(scope='module')
+def shirt_db(tmp_path_factory):
+    """Small synthetic meet spread over two shirt pages."""
+    pytest.importorskip('fitz')
+    db_path = str(tmp_path_factory.mktemp('shirt') / 'shirt.db')
+    build_database(db_path, SYN_CONFIG, SHIRT_ATHLETES)
+    return db_path
+
+
+class TestNameIndex:
+    """Sidecar index of name positions written next to shirt PDFs."""
+
+    def test_round_trip_matches_search(self, shirt_db, tmp_path):
+        import fitz
+        from python.core.name_index import load_name_index
+        from python.core.pdf_generator import generate_shirt_pdf
+
+        pdf_path = str(tmp_path / 'shirt.pdf')
+        generate_shirt_pdf(shirt_db, SYN_CONFIG.meet_name, pdf_path, state='Testland')
+        index = load_name_index(pdf_path)
+        assert set(index) == {a['name'] for a in SHIRT_ATHLETES}
+        with fitz.open(pdf_path) as doc:
+            for name, hits in index.items():
+                found = [(pi, doc[pi].search_for(name)) for pi in range(len(doc))]
+                found = [(pi, rects) for pi, rects in found if rects]
+                assert [pi for pi, _ in hits] == [pi for pi, _ in found]
+                for (_, rects), (_, expected) in zip(hits, found):
+                    assert len(rects) == len(expected)
+                    for r, e in zip(rects, expected):
+                        assert tuple(r) == pytest.approx(tuple(e), abs=0.01)
+
+    def test_text_rect_matches_search(self):
+        fitz = pytest.importorskip('fitz')
+        from python.core.name_index import text_rect
+
+        doc = fitz.open()
+        page = doc.new_page()
+        for font, size in (('Times-Roman', 11), ('Times-Bold', 14.3), ('Helvetica', 9)):
+            page.insert_text((60, 80 + 40 * size), 'Zoë Müller', fontname=font, fontsize=size)
+            rect = text_rect('Zoë Müller', 60, 80 + 40 * size, font, size)
+            hits = [r for r in page.search_for('Zoë Müller') if abs(r.y1 - rect.y1) < 1]
+            assert len(hits) == 1
+            assert tuple(rect) == pytest.approx(tuple(hits[0]), abs=0.01)
+        doc.close()
+
+    def test_stale_after_resave(self, shirt_db, tmp_path):
+        import fitz
+        from python.core.name_index import load_name_index
+        from python.core.pdf_generator import generate_shirt_pdf
+
+        pdf_path = str(tmp_path / 'shirt.pdf')
+        generate_shirt_pdf(shirt_db, SYN_CONFIG.meet_name, pdf_path, state='Testland')
+        assert load_name_index(pdf_path) is not None
+        # A designer's re-save no longer matches the recorded digest
+        with fitz.open(pdf_path) as doc:
+            doc.set_metadata({'title': 'edited'})
+            doc.save(str(tmp_path / 'edited.pdf'))
+        os.replace(str(tmp_path / 'edited.pdf'), pdf_path)
+        assert load_name_index(pdf_path) is None
+
+    def test_index_follows_safe_move(self, shirt_db, tmp_path):
+        from python.core.name_index import load_name_index, move_name_index, name_index_path
+        from python.core.pdf_generator import generate_shirt_pdf
+        from python.process_meet import _safe_move
+
+        tmp_pdf = str(tmp_path / 'shirt_tmp.pdf')
+        final_pdf = str(tmp_path / 'shirt.pdf')
+        generate_shirt_pdf(shirt_db, SYN_CONFIG.meet_name, tmp_pdf, state='Testland')
+        actual = _safe_move(tmp_pdf, final_pdf)
+        move_name_index(tmp_pdf, actual)
+        assert not os.path.exists(name_index_path(tmp_pdf))
+        assert load_name_index(actual) is not None
+
+
+class TestLocateNames:
+    """One word scan finds every name, across line breaks and hyphens."""
+
+    @pytest.fixture
+    def names_pdf(self, tmp_path):
+        fitz = pytest.importorskip('fitz')
+        doc = fitz.open()
+        page = doc.new_page()
+        for y, text in ((100, 'Mary-'), (115, 'Kate Olsen'),      # hyphenated name
+                        (160, 'Alexan\xad'), (175, 'dra Smith,'),  # soft hyphen break
+                        (220, 'JOHN DOE'), (260, 'Ann Lee*'), (300, 'Bo Leeds')):
+            page.insert_text((72, y), text, fontname='Times-Roman', fontsize=12)
+        page = doc.new_page()
+        page.insert_text((72, 100), 'Ann Lee', fontname='Times-Roman', fontsize=12)
+        page.insert_text((300, 400), 'Ann Lee', fontname='Times-Roman', fontsize=12)
+        path = str(tmp_path / 'names.pdf')
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_line_breaks_case_and_punctuation(self, names_pdf):
+        import fitz
+        from python.core.name_index import locate_names
+
+        found = locate_names(names_pdf, ['Mary-Kate Olsen', 'Alexandra Smith',
+                                         'John Doe', 'Ann Lee', 'Bo Lee'])
+        assert 'Bo Lee' not in found  # whole words only: not inside "Leeds"
+        with fitz.open(names_pdf) as doc:
+            page = doc[0]
+            # One Rect per line the name spans
+            (pi, rects), = found['Mary-Kate Olsen']
+            assert pi == 0 and len(rects) == 2
+            assert tuple(rects[0]) == pytest.approx(tuple(page.search_for('Mary-')[0]), abs=0.01)
+            assert tuple(rects[1]) == pytest.approx(tuple(page.search_for('Kate Olsen')[0]), abs=0.01)
+            (pi, rects), = found['Alexandra Smith']
+            assert pi == 0 and len(rects) == 2
+            assert rects[1].y0 > rects[0].y0 + 10  # next line
+            (pi, rects), = found['John Doe']
+            assert tuple(rects[0]) == pytest.approx(tuple(page.search_for('John Doe')[0]), abs=0.01)
+
+    def test_multiple_occurrences(self, names_pdf):
+        from python.core.name_index import locate_names
+
+        hits = locate_names(names_pdf, ['Ann Lee'])['Ann Lee']
+        assert [(pi, len(rects)) for pi, rects in hits] == [(0, 1), (1, 2)]
+
+
+class TestPageTextGrid:
+    """Spatial text index agrees with page.search_for and the span scan."""
+
+    WORDS = ['Lilly', 'll', 'l', 'an', 'Annan', 'ANNA', 'Zoë', 'zoë', 'Ångström',
+             'ström', 'Müller-Weiß', 'weiß', 'Lanpher', 'x']
+
+    @pytest.fixture
+    def page(self):
+        fitz = pytest.importorskip('fitz')
+        doc = fitz.open()
+        page = doc.new_page()
+        lines = ['Lilly Lanpher', 'Zoë Ångström', 'Anna Annan', 'Müller-Weiß Lilly',
+                 'Illa Llewellyn', 'ANNAN annan']
+        # Origins on, just before and just after the 40pt grid lines
+        for i, text in enumerate(lines * 3):
+            x = 39 + 40 * (i % 5) + (i % 3) * 0.5
+            y = 79.5 + 21 * i
+            page.insert_text((x, y), text, fontname='Times-Roman', fontsize=10 + i % 4)
+        yield page
+        doc.close()
+
+    def test_search_matches_search_for(self, page):
+        from python.core.name_index import PageTextGrid
+
+        grid = PageTextGrid(page)
+        for word in self.WORDS:
+            expected = page.search_for(word)
+            got = grid.search(word)
+            assert len(got) == len(expected), word
+            for r, e in zip(got, expected):
+                assert tuple(r) == pytest.approx(tuple(e), abs=0.01), word
+
+    def test_near_filters_across_cells(self, page):
+        from python.core.name_index import PageTextGrid
+
+        grid = PageTextGrid(page)
+        for word in ('Lilly', 'an', 'ström'):
+            for x, y in ((40, 80), (79.9, 101), (120, 247), (200.5, 330)):
+                expected = [r for r in page.search_for(word)
+                            if abs(r.x0 - x) < 100 and abs(r.y0 - y) < 20]
+                got = grid.search(word, near=(x, y, 100, 20))
+                assert [tuple(r) for r in got] == pytest.approx(
+                    [tuple(r) for r in expected], abs=0.01), (word, x, y)
+
+    def test_spans_near_matches_span_scan(self, page):
+        from python.core.name_index import PageTextGrid
+
+        grid = PageTextGrid(page)
+        spans = [span for block in page.get_text('dict')['blocks'] if block.get('type') == 0
+                 for line in block['lines'] for span in line['spans']]
+        for x, y in ((40, 80), (79.9, 101), (120, 247), (200.5, 330), (0, 0)):
+            expected = [s['text'].replace('\xad', '') for s in spans
+                        if abs(s['origin'][0] - x) < 40 and abs(s['origin'][1] - y) < 20]
+            assert grid.spans_near(x, y, 40, 20) == expected
+
+
+class TestRenderedBackPages:
+    """Order-form backs drawn once and stamped match per-athlete drawing."""
+
+    @staticmethod
+    def _stars(page):
+        return sorted(tuple(round(v, 2) for v in d['rect']) for d in page.get_drawings()
+                      if d.get('fill') and len(d['items']) == 10)
+
+    def test_stamped_backs_match_per_athlete(self, shirt_db):
+        import fitz
+        from python.core.pdf_generator import (
+            add_rendered_back_pages, add_shirt_back_pages, render_shirt_back_pages,
+        )
+
+        pre = precompute_shirt_data(shirt_db, SYN_CONFIG.meet_name, use_cache=False)
+        backs, positions = render_shirt_back_pages(pre, '2026', 'Testland')
+        try:
+            for athlete in ('Amy Adams', 'Hope Hill'):
+                drawn, stamped = fitz.open(), fitz.open()
+                add_shirt_back_pages(drawn, pre, athlete, '2026', 'Testland')
+                add_rendered_back_pages(stamped, backs, positions, athlete)
+                assert len(stamped) == len(drawn) >= 1
+                for old, new in zip(drawn, stamped):
+                    assert sorted(new.get_text().split()) == sorted(old.get_text().split())
+                    assert self._stars(new) == self._stars(old)
+                    assert self._stars(new)
+                drawn.close()
+                stamped.close()
+        finally:
+            backs.close()
+
+
+class TestGymHighlightsOverlay:
+    """Overlay gym highlights match the per-gym full render."""
+
+    @staticmethod
+    def _bold_names(page):
+        return sorted(span['text'] for block in page.get_text('dict')['blocks']
+                      for line in block.get('lines', ()) for span in line['spans']
+                      if span['flags'] & 16 and span['size'] < 30
+                      and span['text'] in {a['name'] for a in SHIRT_ATHLETES})
+
+    def test_matches_full_render(self, shirt_db, tmp_path):
+        import fitz
+        from python.core.pdf_generator import generate_gym_highlights_pdf
+
+        paths = {}
+        for overlay in (True, False):
+            paths[overlay] = str(tmp_path / f'highlights_{overlay}.pdf')
+            generate_gym_highlights_pdf(shirt_db, SYN_CONFIG.meet_name, paths[overlay],
+                                        state='Testland', overlay=overlay)
+        with fitz.open(paths[True]) as new, fitz.open(paths[False]) as old:
+            # Gym A on both pages, Gym B on one, Gym C on both
+            assert len(new) == len(old) == 5
+            for new_page, old_page in zip(new, old):
+                highlighted = self._bold_names(old_page)
+                assert highlighted and self._bold_names(new_page) == highlighted
+                old_words = old_page.get_text().split()
+                new_words = new_page.get_text().split()
+                assert set(new_words) == set(old_words)
+                # Documented trade-off: the hidden regular copy is still text
+                for name in highlighted:
+                    assert new_page.get_text().count(name) == 2 * old_page.get_text().count(name)